@@ -0,0 +1,22 @@
+#version 410
+
+// Variants: define LIT for diffuse lighting, otherwise flat red
+
+in vec3 frag_normal;
+in vec3 frag_position;
+
+uniform vec3 color;
+uniform float alpha;
+uniform vec3 light_dir;
+
+out vec4 frag_color;
+
+void main() {
+#ifdef LIT
+    float light = max(dot(normalize(frag_normal), normalize(-light_dir)), 0.3);
+    vec3 final_color = color * light;
+    frag_color = vec4(final_color, alpha);
+#else
+    frag_color = vec4(1.0, 0.0, 0.0, 1.0);
+#endif
+}
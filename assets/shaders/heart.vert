@@ -0,0 +1,31 @@
+#version 410
+
+// Heart model with systolic morph target (see HeartRenderer.load_model)
+
+in vec3 in_position;
+in vec3 in_normal;
+in vec3 in_systole;
+
+layout(std140) uniform Camera {
+    mat4 view;
+    mat4 projection;
+};
+
+uniform mat4 model;
+uniform float beat_scale;
+uniform float beat_amplitude;
+
+out vec3 frag_normal;
+out vec3 frag_position;
+
+void main() {
+    // Blend towards the systolic morph target (beat_scale 1.0 = rest,
+    // 1.0 + beat_amplitude = peak contraction)
+    float systole = clamp((beat_scale - 1.0) / beat_amplitude, -1.0, 1.0);
+    vec3 morphed_position = in_position + in_systole * systole;
+    vec4 world_pos = model * vec4(morphed_position, 1.0);
+    frag_position = world_pos.xyz;
+    frag_normal = mat3(model) * in_normal;
+    vec4 view_pos = view * world_pos;
+    gl_Position = projection * view_pos;
+}
@@ -0,0 +1,13 @@
+#version 410
+
+in vec3 frag_normal;
+in vec3 frag_color_in;
+
+uniform vec3 light_dir;
+
+out vec4 frag_color;
+
+void main() {
+    float light = max(dot(normalize(frag_normal), normalize(-light_dir)), 0.3);
+    frag_color = vec4(frag_color_in * light, 1.0);
+}
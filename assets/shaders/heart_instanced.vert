@@ -0,0 +1,31 @@
+#version 410
+
+// Instanced heart: transform, beat scale and color come from the
+// instance buffer so many hearts draw in a single call
+
+in vec3 in_position;
+in vec3 in_normal;
+in vec3 in_systole;
+
+in mat4 in_model;
+in float in_beat_scale;
+in vec3 in_color;
+
+layout(std140) uniform Camera {
+    mat4 view;
+    mat4 projection;
+};
+
+uniform float beat_amplitude;
+
+out vec3 frag_normal;
+out vec3 frag_color_in;
+
+void main() {
+    float systole = clamp((in_beat_scale - 1.0) / beat_amplitude, -1.0, 1.0);
+    vec3 morphed_position = in_position + in_systole * systole;
+    vec4 world_pos = in_model * vec4(morphed_position, 1.0);
+    frag_normal = mat3(in_model) * in_normal;
+    frag_color_in = in_color;
+    gl_Position = projection * view * world_pos;
+}
@@ -0,0 +1,143 @@
+"""
+Benchmark of the UI-thread side of the BLE event loop bridge.
+
+Drives BLESessionManager on an AsyncBridge with simulated straps the way the UI does: the first Connect tap starts
+the loop thread, commands are submitted and answered through futures, and
+closing the window shuts everything down. Reports how long the calling
+thread is blocked by each step (the old BLEThread slept 0.2-0.3 s per
+Connect tap and waited up to 2 s, then 1 s more, on exit):
+
+    python -m src.benchmarks.async_bridge_benchmark --straps 8 --disconnect-delay 0.01
+    python -m src.benchmarks.async_bridge_benchmark --straps 8 --stuck
+    python -m src.benchmarks.async_bridge_benchmark --straps 4 --disconnect-delay 0.025
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict
+from ..heartrate.session_manager import BLESessionManager
+from ..heartrate.simulated_ble import SimulatedClient, SimulatedStrap
+from ..utils.async_bridge import AsyncBridge
+from ..utils.config import Config
+from ..utils.latency_histogram import LatencyHistogram
+
+LEGACY_CONNECT_BLOCK = 0.2  # Old connect_to_device slept this long when the loop was not running yet
+LEGACY_STOP_WAIT = 2.0  # Old shutdown waited this long for the QThread before terminate()
+
+
+class SlowDisconnectClient(SimulatedClient):
+    """Fake client whose GATT round trips take time, or whose disconnect never finishes unless cancelled."""
+    
+    def __init__(self, strap: SimulatedStrap, disconnect_delay: float, **kwargs):
+        """
+        Initialize fake client.
+        
+        Args:
+            strap: Simulated strap
+            disconnect_delay: Seconds a disconnect or stop_notify takes (inf: disconnect hangs until cancelled)
+        """
+        super().__init__(strap, **kwargs)
+        self.disconnect_delay = disconnect_delay
+        self.released = False  # The disconnect reached the strap
+    
+    async def stop_notify(self, uuid: str):
+        """Stop notifying after the delay."""
+        if self.disconnect_delay != float('inf'):
+            await asyncio.sleep(self.disconnect_delay)
+        await super().stop_notify(uuid)
+    
+    async def disconnect(self):
+        """Disconnect after the delay."""
+        if self.disconnect_delay == float('inf'):
+            await asyncio.Event().wait()
+        await asyncio.sleep(self.disconnect_delay)
+        await super().disconnect()
+        self.released = True
+
+
+def run_benchmark(straps: int, disconnect_delay: float, stuck: bool, commands: int) -> Dict[str, object]:
+    """Start the loop, connect the straps, time commands and shut down."""
+    fakes: Dict[str, SimulatedStrap] = {}
+    clients = []
+    
+    def factory(address, **kwargs) -> SlowDisconnectClient:
+        if address not in fakes:
+            index = len(fakes)
+            fakes[address] = SimulatedStrap(address, connect_delay=0.05 + 0.02 * index, seed=index)
+        delay = float('inf') if stuck and len(fakes) == 1 else disconnect_delay
+        clients.append(SlowDisconnectClient(fakes[address], delay, **kwargs))
+        return clients[-1]
+    
+    manager = BLESessionManager(client_factory=factory, max_sessions=straps)
+    bridge = AsyncBridge(name="ble")
+    addresses = [f"A0:00:00:00:00:{index:02X}" for index in range(straps)]
+    
+    # First Connect tap: the loop thread does not exist yet
+    started = time.perf_counter()
+    ready = bridge.start()
+    futures = [bridge.submit(manager.connect(addresses[0]))]
+    first_tap = time.perf_counter() - started
+    ready.result()
+    ready_time = time.perf_counter() - started
+    
+    tap = LatencyHistogram(min_latency=1e-7, max_latency=1.0)
+    for address in addresses[1:]:
+        started = time.perf_counter()
+        futures.append(bridge.submit(manager.connect(address)))
+        tap.record(time.perf_counter() - started)
+    connected = sum(1 for future in futures if future.result(timeout=10.0))
+    
+    # Round trip of a command through the loop and back through its future
+    round_trip = LatencyHistogram(min_latency=1e-6, max_latency=1.0)
+    for _ in range(commands):
+        started = time.perf_counter()
+        bridge.submit(asyncio.sleep(0)).result()
+        round_trip.record(time.perf_counter() - started)
+    
+    # Supervisors and notification tasks are still running, as on exit
+    time.sleep(0.5)
+    started = time.perf_counter()
+    finished = bridge.stop(
+        lambda: manager.disconnect_all(link_only=True), Config.BLE_SHUTDOWN_BUDGET, Config.BLE_SHUTDOWN_TIMEOUT
+    )
+    stop_time = time.perf_counter() - started
+    return {
+        'connected': connected,
+        'released': sum(1 for client in clients if client.released),
+        'first_tap': first_tap,
+        'ready': ready_time,
+        'tap': tap,
+        'round_trip': round_trip,
+        'stop': stop_time,
+        'finished': finished,
+        'loop_closed': bridge.loop.is_closed(),
+    }
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description="Async bridge benchmark")
+    parser.add_argument('--straps', type=int, default=8, help="Simulated straps to connect")
+    parser.add_argument('--disconnect-delay', type=float, default=0.01, help="Seconds one disconnect takes")
+    parser.add_argument('--stuck', action='store_true', help="One strap's disconnect never finishes")
+    parser.add_argument('--commands', type=int, default=2000, help="Round trips to time")
+    args = parser.parse_args()
+    
+    results = run_benchmark(args.straps, args.disconnect_delay, args.stuck, args.commands)
+    tap = results['tap'].summary()
+    round_trip = results['round_trip'].summary()
+    print(f"{results['connected']}/{args.straps} straps connected")
+    print(f"  First Connect tap (starts the loop): {results['first_tap'] * 1000:.2f} ms blocked "
+          f"(previously {LEGACY_CONNECT_BLOCK * 1000:.0f}-{(LEGACY_CONNECT_BLOCK + 0.1) * 1000:.0f} ms); "
+          f"loop ready after {results['ready'] * 1000:.2f} ms")
+    print(f"  Later taps: p50 {tap['p50']:.3f} ms, max {tap['max']:.3f} ms blocked")
+    print(f"  Command round trip: p50 {round_trip['p50']:.3f} ms, p99 {round_trip['p99']:.3f} ms")
+    print(f"  Shutdown: {results['stop'] * 1000:.1f} ms, thread finished: {results['finished']}, "
+          f"loop closed: {results['loop_closed']} "
+          f"(previously up to {LEGACY_STOP_WAIT * 1000:.0f} ms, then terminate())")
+    print(f"  Straps disconnected before the budget ran out: {results['released']}/{results['connected']}")
+
+
+if __name__ == '__main__':
+    main()
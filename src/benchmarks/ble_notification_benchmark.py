@@ -0,0 +1,123 @@
+"""
+Throughput and latency of the heart rate notification path, end to end.
+
+Simulated straps (src/heartrate/simulated_ble.py) notify spec-encoded Heart
+Rate Measurements to PolarH10 clients in a BLESessionManager on an
+AsyncBridge loop thread, as in the app. A UI thread drains the sessions
+once per 60 Hz frame and applies the first strap's samples to an
+AnimationController, like MainWindow. Each rate runs for --duration
+seconds; 1 Hz is the H10's own rate, higher rates find the headroom:
+
+    python -m src.benchmarks.ble_notification_benchmark --rates 1,100,1000 --straps 4
+    python -m src.benchmarks.ble_notification_benchmark --rates 1 --duration 60 --jitter 0.05 --dropout 0.05
+    python -m src.benchmarks.ble_notification_benchmark --rates 1 --rr-trace session_rr.txt
+"""
+
+import argparse
+import time
+from typing import Dict
+from ..heartrate.animation_controller import AnimationController
+from ..heartrate.session_manager import BLESessionManager
+from ..heartrate.simulated_ble import SimulatedBLE, load_rr_trace
+from ..utils import clock
+from ..utils.async_bridge import AsyncBridge
+from ..utils.latency_histogram import LatencyHistogram
+
+FRAME_INTERVAL = 1.0 / 60.0  # The UI drains once per displayed frame
+
+
+def run_rate(rate: float, straps: int, duration: float, jitter: float, dropout: float,
+             uint16: bool, rr_trace) -> Dict[str, object]:
+    """Stream at one notification rate and measure the path to the UI thread."""
+    simulation = SimulatedBLE.create(straps, rate=rate, jitter=jitter, dropout=dropout,
+                                     uint16=uint16, rr_trace=rr_trace)
+    manager = BLESessionManager(client_factory=simulation.client_factory, max_sessions=straps)
+    bridge = AsyncBridge(name="ble")
+    addresses = list(simulation.straps)
+    connected = sum(bridge.submit(manager.connect(address)).result(timeout=30.0) for address in addresses)
+    primary = addresses[0]
+    animation = AnimationController()
+    
+    latency = LatencyHistogram(min_latency=1e-6, max_latency=10.0)
+    frame_cost = LatencyHistogram(min_latency=1e-6, max_latency=1.0)
+    received = beats = 0
+    # Samples buffered while the other straps connected would count as late
+    while any(manager.drain().values()):
+        pass
+    sent_before = {address: (strap.sent, strap.lost, strap.beats_sent) for address, strap in simulation.straps.items()}
+    dropped_before = manager.dropped()
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        drained = manager.drain()
+        now = clock.now()
+        parser = manager.get(primary).parser
+        for address, samples in drained.items():
+            received += len(samples)
+            for sample in samples:
+                beats += len(sample.rr_intervals)
+                latency.record(now - sample.timestamp)
+                if address != primary:
+                    continue
+                animation.update_bpm(parser.get_bpm(), sample.timestamp)
+                if sample.rr_intervals:
+                    animation.add_rr_intervals(sample.timestamp, sample.rr_intervals)
+        animation.get_beat_scale(now)
+        frame_cost.record(time.perf_counter() - started)
+        time.sleep(max(0.0, FRAME_INTERVAL - (time.perf_counter() - started)))
+    
+    sent = sum(strap.sent - sent_before[address][0] for address, strap in simulation.straps.items())
+    lost = sum(strap.lost - sent_before[address][1] for address, strap in simulation.straps.items())
+    beats_sent = sum(strap.beats_sent - sent_before[address][2] for address, strap in simulation.straps.items())
+    dropped = manager.dropped() - dropped_before
+    hrv = manager.get(primary).parser.get_hrv()
+    bridge.stop(manager.disconnect_all, budget=0.5, timeout=1.0)
+    return {
+        'connected': connected,
+        'sent': sent,
+        'lost': lost,
+        'received': received,
+        'beats_sent': beats_sent,
+        'beats': beats,
+        'dropped': dropped,
+        'latency_ms': latency.summary(),
+        'frame_ms': frame_cost.summary(),
+        'hrv': hrv,
+    }
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description="Heart rate notification path benchmark")
+    parser.add_argument('--rates', default="1,100,1000", help="Comma-separated notifications per second per strap")
+    parser.add_argument('--straps', type=int, default=4, help="Simulated straps")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per rate")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Mean extra notification delay in seconds")
+    parser.add_argument('--dropout', type=float, default=0.0, help="Probability that a notification is lost")
+    parser.add_argument('--uint16', action='store_true', help="Send heart rates as uint16")
+    parser.add_argument('--rr-trace', default=None, help="Recorded RR intervals (one per line, ms or s)")
+    args = parser.parse_args()
+    
+    rr_trace = load_rr_trace(args.rr_trace) if args.rr_trace else None
+    for rate in (float(value) for value in args.rates.split(',')):
+        results = run_rate(rate, args.straps, args.duration, args.jitter, args.dropout, args.uint16, rr_trace)
+        latency = results['latency_ms']
+        frame = results['frame_ms']
+        print(f"{rate:g} Hz x {results['connected']}/{args.straps} straps, {args.duration:.0f} s")
+        print(
+            f"  Notifications: {results['sent'] / args.duration:.1f}/s sent, "
+            f"{results['received'] / args.duration:.1f}/s reached the UI, "
+            f"{results['lost']} lost on air, {results['dropped']} dropped (ring buffers full)"
+        )
+        print(f"  RR intervals: {results['beats_sent']} sent, {results['beats']} reached the UI")
+        print(f"  Notify -> UI: p50 {latency['p50']:.2f} ms, p99 {latency['p99']:.2f} ms, max {latency['max']:.2f} ms")
+        print(f"  UI work per frame: p50 {frame['p50']:.3f} ms, p99 {frame['p99']:.3f} ms")
+        window = min(results['hrv'])
+        hrv = results['hrv'][window]
+        if hrv['beats'] > 1:
+            print(f"  Primary strap HRV ({window:.0f} s window): {hrv['beats']} beats, mean HR {hrv['mean_hr']:.1f}, "
+                  f"SDNN {hrv['sdnn']:.1f} ms, RMSSD {hrv['rmssd']:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+Device discovery benchmark against a simulated radio environment.
+
+Runs DeviceScanner live on an event loop with a fake scanner that delivers
+advertisements from Polar H10s, other heart rate straps and unrelated
+devices, with devices appearing and leaving during the run. Reports the
+cost of the detection callback, how often the UI is updated and how long
+it takes to see a device appear or leave. The same arrivals are replayed
+through the previous discover()-polling loop (2 s scan, 3 s sleep, full
+list per cycle, devices never removed) for comparison:
+
+    python -m src.benchmarks.ble_scan_benchmark --duration 30 --background 40
+"""
+
+import argparse
+import asyncio
+import heapq
+import time
+import numpy as np
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Sequence
+from ..heartrate.device_scanner import DeviceScanner, DeviceTableDiff
+from ..utils import clock
+from ..utils.config import Config
+
+POLL_SCAN_TIME = 2.0  # The polling loop's discover() timeout
+POLL_SLEEP_TIME = 3.0  # And its sleep between scans
+OTHER_SERVICE_UUID = "0000fe9f-0000-1000-8000-00805f9b34fb"
+
+
+def make_devices(duration: float, polar: int, straps: int, background: int, seed: int) -> List[dict]:
+    """
+    Create the simulated advertisers.
+    
+    Polar H10s and other straps advertise the Heart Rate Service; background
+    devices (phones, headphones, beacons) do not. Half of the Polar H10s
+    appear or leave during the run.
+    """
+    rng = np.random.default_rng(seed)
+    devices = []
+    kinds = [('Polar H10', Config.POLAR_H10_SERVICE_UUID, polar),
+             ('TICKR', Config.POLAR_H10_SERVICE_UUID, straps),
+             ('Phone', OTHER_SERVICE_UUID, background)]
+    for name, service, count in kinds:
+        for index in range(count):
+            appear, leave = 0.0, duration + 1.0
+            if name == 'Polar H10' and index % 2:
+                if index % 4 == 1:
+                    appear = float(rng.uniform(0.1, 0.5) * duration)
+                else:
+                    leave = float(rng.uniform(0.2, 0.4) * duration)
+            devices.append({
+                'address': f"{len(devices):02X}:00:00:00:00:00",
+                'name': f"{name} {index:04d}",
+                'service': service,
+                'interval': float(rng.uniform(0.1, 0.5)),  # Advertising interval in seconds
+                'rssi': float(rng.uniform(-90, -50)),
+                'appear': appear,
+                'leave': leave,
+            })
+    return devices
+
+
+class FakeScanner:
+    """
+    In-process stand-in for BleakScanner.
+    
+    Delivers advertisements in real time and, like the OS, drops those not
+    listing one of the requested services before the detection callback.
+    """
+    
+    def __init__(self, devices: Sequence[dict], detection_callback: Callable, service_uuids: Optional[Sequence[str]] = None):
+        """
+        Initialize fake scanner.
+        
+        Args:
+            devices: Advertisers from make_devices()
+            detection_callback: Called with (device, advertisement_data) per advertisement
+            service_uuids: Services to filter on (None: all)
+        """
+        self.devices = devices
+        self.detection_callback = detection_callback
+        self.service_uuids = set(service_uuids) if service_uuids else None
+        self.task: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.callback_time = 0.0
+    
+    async def start(self):
+        """Start delivering advertisements."""
+        self.task = asyncio.get_running_loop().create_task(self._advertise())
+    
+    async def stop(self):
+        """Stop delivering advertisements."""
+        if self.task is not None:
+            self.task.cancel()
+    
+    async def _advertise(self):
+        """Deliver advertisements in time order."""
+        rng = np.random.default_rng(1)
+        start = clock.now()
+        queue = [(device['appear'] + rng.uniform(0, device['interval']), index)
+                 for index, device in enumerate(self.devices)]
+        heapq.heapify(queue)
+        while queue:
+            due, index = heapq.heappop(queue)
+            device = self.devices[index]
+            await asyncio.sleep(max(0.0, start + due - clock.now()))
+            if due < device['leave']:
+                heapq.heappush(queue, (due + device['interval'] * rng.uniform(0.9, 1.1), index))
+            else:
+                continue
+            if self.service_uuids is not None and device['service'] not in self.service_uuids:
+                continue
+            # Passive scans report the name only in some advertisements
+            name = device['name'] if rng.random() < 0.7 else None
+            rssi = int(round(device['rssi'] + rng.normal(0.0, 3.0)))
+            started = time.perf_counter()
+            self.detection_callback(
+                SimpleNamespace(address=device['address'], name=name),
+                SimpleNamespace(local_name=name, rssi=rssi)
+            )
+            self.callback_time += time.perf_counter() - started
+            self.delivered += 1
+
+
+async def run_scanner(devices: List[dict], duration: float) -> Dict[str, object]:
+    """Run DeviceScanner against the fake radio and record every diff."""
+    fakes = []
+    
+    def factory(**kwargs) -> FakeScanner:
+        fakes.append(FakeScanner(devices, **kwargs))
+        return fakes[-1]
+    
+    start = clock.now()
+    diffs = []
+    seen: Dict[str, float] = {}
+    gone: Dict[str, float] = {}
+    
+    def on_changes(diff: DeviceTableDiff):
+        now = clock.now() - start
+        diffs.append(diff)
+        for device in diff.added:
+            seen.setdefault(device.address, now)
+        for address in diff.removed:
+            gone.setdefault(address, now)
+    
+    scanner = DeviceScanner(on_changes, scanner_factory=factory)
+    await scanner.start()
+    await asyncio.sleep(duration)
+    await scanner.stop()
+    fake = fakes[0]
+    return {
+        'delivered': fake.delivered,
+        'callback_us': fake.callback_time / max(1, fake.delivered) * 1e6,
+        'diffs': diffs,
+        'seen': seen,
+        'gone': gone,
+    }
+
+
+def polling_latency(devices: List[dict], duration: float) -> Dict[str, object]:
+    """
+    Replay the discover()-polling loop on the same devices.
+    
+    A device is reported at the end of the first scan window in which it
+    advertised. The polling loop never removed devices.
+    """
+    cycle = POLL_SCAN_TIME + POLL_SLEEP_TIME
+    windows = np.arange(0.0, duration, cycle)
+    seen = {}
+    for device in devices:
+        for window in windows:
+            if device['appear'] < window + POLL_SCAN_TIME and device['leave'] > window:
+                seen[device['address']] = window + POLL_SCAN_TIME
+                break
+    # Every scan returns all advertisers in range, which are then filtered by name
+    processed = sum(
+        sum(1 for device in devices if device['appear'] < window + POLL_SCAN_TIME and device['leave'] > window)
+        for window in windows
+    )
+    return {'seen': seen, 'gone': {}, 'emits': len(windows), 'processed': processed}
+
+
+def latencies(devices: List[dict], seen: Dict[str, float], gone: Dict[str, float]) -> Dict[str, List[float]]:
+    """Appear-to-reported and leave-to-removed delays of the Polar H10s."""
+    appear, leave = [], []
+    for device in devices:
+        if not device['name'].startswith('Polar H10'):
+            continue
+        if device['address'] in seen:
+            appear.append(seen[device['address']] - device['appear'])
+        if device['address'] in gone:
+            leave.append(gone[device['address']] - device['leave'])
+    return {'appear': appear, 'leave': leave}
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description="BLE discovery benchmark")
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds to scan")
+    parser.add_argument('--polar', type=int, default=8, help="Polar H10s nearby")
+    parser.add_argument('--straps', type=int, default=4, help="Other heart rate straps nearby")
+    parser.add_argument('--background', type=int, default=40, help="Unrelated BLE devices nearby")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    devices = make_devices(args.duration, args.polar, args.straps, args.background, args.seed)
+    results = asyncio.run(run_scanner(devices, args.duration))
+    polling = polling_latency(devices, args.duration)
+    
+    diffs = results['diffs']
+    entries = sum(len(diff.added) + len(diff.updated) + len(diff.removed) for diff in diffs)
+    print(f"{len(devices)} advertisers, {args.polar} Polar H10s, {args.duration:.0f} s")
+    print(
+        f"  Scanner: {results['delivered']} advertisements after the service filter, "
+        f"{results['callback_us']:.1f} µs per callback"
+    )
+    print(f"  UI updates: {len(diffs)} diffs with {entries} entries "
+          f"(polling: {polling['emits']} full lists, {polling['processed']} devices filtered in Python)")
+    
+    for label, found in (("Callback scanner", latencies(devices, results['seen'], results['gone'])),
+                         ("discover() polling", latencies(devices, polling['seen'], polling['gone']))):
+        appear = np.array(found['appear'])
+        leave = np.array(found['leave'])
+        print(f"  {label}:")
+        if len(appear):
+            print(f"    appear -> shown: mean {appear.mean():.2f} s, max {appear.max():.2f} s")
+        if len(leave):
+            print(f"    leave -> removed: mean {leave.mean():.2f} s, max {leave.max():.2f} s")
+        else:
+            print("    leave -> removed: never")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Load test of concurrent strap sessions against simulated heart rate straps.
+
+Connects several simulated straps through BLESessionManager on one event loop
+and drains them from a second thread at the display frame rate, like the
+UI does. Straps notify faster than a real H10 (1 Hz) to find the headroom,
+and one strap can be made to flood the link to check that the others are
+not starved. With --drop-every, links drop at random and the strap stays
+out of reach for up to --outage seconds, to measure how quickly the
+connection supervisors restore the data:
+
+    python -m src.benchmarks.ble_session_benchmark --straps 8 --rate 20 --duration 10
+    python -m src.benchmarks.ble_session_benchmark --straps 8 --hog-rate 2000
+    python -m src.benchmarks.ble_session_benchmark --rate 1 --duration 60 --drop-every 10 --outage 2
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+import numpy as np
+from typing import Dict, List
+from ..heartrate.session_manager import BLESessionManager
+from ..heartrate.simulated_ble import SimulatedClient, SimulatedStrap
+from ..utils import clock
+from ..utils.latency_histogram import LatencyHistogram
+
+DRAIN_INTERVAL = 1.0 / 60.0  # The UI drains once per displayed frame
+
+
+def consume(manager: BLESessionManager, stop: threading.Event, latency: Dict[str, LatencyHistogram],
+            received: Dict[str, List[float]], drain_time: LatencyHistogram):
+    """Drain the sessions once per frame interval until stopped (consumer thread)."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        drained = manager.drain()
+        now = clock.now()
+        for address, samples in drained.items():
+            received.setdefault(address, []).extend(sample.timestamp for sample in samples)
+            histogram = latency.setdefault(address, LatencyHistogram(min_latency=1e-5, max_latency=10.0))
+            for sample in samples:
+                histogram.record(now - sample.timestamp)
+        drain_time.record(time.perf_counter() - started)
+        time.sleep(max(0.0, DRAIN_INTERVAL - (time.perf_counter() - started)))
+
+
+async def drop_links(straps: Dict[str, SimulatedStrap], drop_every: float, outage: float, seed: int):
+    """Drop random straps' links, on average every drop_every seconds per strap."""
+    rng = np.random.default_rng(seed)
+    addresses = list(straps)
+    while True:
+        await asyncio.sleep(rng.exponential(drop_every / len(addresses)))
+        strap = straps[addresses[rng.integers(len(addresses))]]
+        if strap.client is not None and strap.client.is_connected:
+            strap.client.drop(rng.uniform(0.0, outage))
+
+
+async def run_benchmark(straps: int, rate: float, hog_rate: float, duration: float,
+                        drop_every: float = 0.0, outage: float = 0.0) -> Dict[str, object]:
+    """Connect the straps, stream for duration seconds and collect statistics."""
+    fakes: Dict[str, SimulatedStrap] = {}
+    
+    def factory(address, **kwargs) -> SimulatedClient:
+        if address not in fakes:
+            index = len(fakes)
+            strap_rate = hog_rate if hog_rate and index == 0 else rate
+            fakes[address] = SimulatedStrap(address, rate=strap_rate, connect_delay=0.05 + 0.02 * index, seed=index)
+        return SimulatedClient(fakes[address], **kwargs)
+    
+    # Time to recover as seen through the status callback
+    lost_at: Dict[str, float] = {}
+    recovery = LatencyHistogram(min_latency=0.01, max_latency=600.0)
+    
+    def on_status(address: str, connected: bool, reason: str):
+        if not connected:
+            lost_at[address] = clock.now()
+        elif address in lost_at:
+            recovery.record(clock.now() - lost_at.pop(address))
+    
+    manager = BLESessionManager(client_factory=factory, max_sessions=straps, on_status=on_status)
+    addresses = [f"A0:00:00:00:00:{index:02X}" for index in range(straps)]
+    
+    stop = threading.Event()
+    latency: Dict[str, LatencyHistogram] = {}
+    received: Dict[str, List[float]] = {}
+    drain_time = LatencyHistogram(min_latency=1e-6, max_latency=1.0)
+    consumer = threading.Thread(target=consume, args=(manager, stop, latency, received, drain_time))
+    consumer.start()
+    
+    # Connections are requested together, as several users tapping at once
+    started = time.perf_counter()
+    connected = await asyncio.gather(*(manager.connect(address) for address in addresses))
+    connect_time = time.perf_counter() - started
+    # Rates are measured once every strap streams
+    sent_before = {address: strap.sent for address, strap in fakes.items()}
+    stream_start = clock.now()
+    dropper = None
+    if drop_every:
+        dropper = asyncio.get_running_loop().create_task(drop_links(fakes, drop_every, outage, 1))
+    
+    # Probe how late the event loop runs a 5 ms timer while the straps stream
+    loop_lag = LatencyHistogram(min_latency=1e-5, max_latency=1.0)
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        requested = time.perf_counter()
+        await asyncio.sleep(0.005)
+        loop_lag.record(max(0.0, time.perf_counter() - requested - 0.005))
+    
+    if dropper is not None:
+        dropper.cancel()
+    stream_end = clock.now()
+    sent = {address: strap.sent - sent_before[address] for address, strap in fakes.items()}
+    dropped = manager.dropped()
+    supervisors = [session.supervisor for session in manager.sessions]
+    await manager.disconnect_all()
+    await asyncio.sleep(2 * DRAIN_INTERVAL)
+    stop.set()
+    consumer.join()
+    
+    # Longest silence per strap while streaming
+    received_counts, max_gaps = {}, {}
+    for address in addresses:
+        times = np.array([t for t in received.get(address, []) if stream_start <= t <= stream_end])
+        received_counts[address] = len(times)
+        max_gaps[address] = float(np.max(np.diff(np.concatenate(([stream_start], times, [stream_end])))))
+    return {
+        'connected': sum(connected),
+        'connect_seconds': connect_time,
+        'sent': sent,
+        'received': received_counts,
+        'max_gap': max_gaps,
+        'dropped': dropped,
+        'latency': latency,
+        'drain_ms': drain_time.summary(),
+        'loop_lag_ms': loop_lag.summary(),
+        'link_losses': sum(supervisor.link_losses for supervisor in supervisors),
+        'attempts': sum(supervisor.attempts for supervisor in supervisors),
+        'recovery_ms': recovery.summary(),
+    }
+
+
+def main():
+    """Run the load test and print the results."""
+    parser = argparse.ArgumentParser(description="Concurrent strap session load test")
+    parser.add_argument('--straps', type=int, default=8, help="Simulated straps")
+    parser.add_argument('--rate', type=float, default=20.0, help="Notifications per second per strap (H10: 1)")
+    parser.add_argument('--hog-rate', type=float, default=0.0, help="Notification rate of the first strap (0: same as others)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to stream")
+    parser.add_argument('--drop-every', type=float, default=0.0, help="Mean seconds between link drops per strap (0: none)")
+    parser.add_argument('--outage', type=float, default=2.0, help="Maximum seconds a dropped strap stays out of reach")
+    args = parser.parse_args()
+    
+    results = asyncio.run(run_benchmark(
+        args.straps, args.rate, args.hog_rate, args.duration, args.drop_every, args.outage
+    ))
+    print(f"Connected {results['connected']}/{args.straps} straps in {results['connect_seconds']:.2f} s (serialized)")
+    lag = results['loop_lag_ms']
+    print(f"  Event loop lag: p50 {lag['p50']:.2f} ms, p99 {lag['p99']:.2f} ms, max {lag['max']:.2f} ms")
+    drain = results['drain_ms']
+    print(f"  Drain + parse per frame: p50 {drain['p50']:.3f} ms, p99 {drain['p99']:.3f} ms")
+    print(f"  Dropped (ring buffers full): {results['dropped']}")
+    if args.drop_every:
+        recovery = results['recovery_ms']
+        print(
+            f"  Link losses: {results['link_losses']}, reconnection attempts: {results['attempts']}, "
+            f"time to recover p50 {recovery['p50'] / 1000:.2f} s, max {recovery['max'] / 1000:.2f} s"
+        )
+    for address, sent in results['sent'].items():
+        received = results['received'][address]
+        histogram = results['latency'].get(address)
+        summary = histogram.summary() if histogram is not None else {'p50': float('nan'), 'p99': float('nan')}
+        print(
+            f"  {address}: {sent / args.duration:7.1f}/s sent, {received / args.duration:7.1f}/s received, "
+            f"notify-to-drain p50 {summary['p50']:.1f} ms, p99 {summary['p99']:.1f} ms, "
+            f"longest gap {results['max_gap'][address]:.2f} s"
+        )
+
+
+if __name__ == '__main__':
+    main()
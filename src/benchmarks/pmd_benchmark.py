@@ -0,0 +1,211 @@
+"""
+PMD streaming benchmark against a local fake Polar H10.
+
+Streams synthetic ECG (130 Hz) and delta-compressed accelerometer data
+(200 Hz) through PolarH10's PMD path with a fake BLE client, runs the
+R-peak detector in the frame callback and reports its cost, event loop
+lag and detection accuracy. --speed replays faster than real time to find
+the headroom:
+
+    python -m src.benchmarks.pmd_benchmark --duration 60 --speed 20
+"""
+
+import argparse
+import asyncio
+import time
+import numpy as np
+from typing import Callable, Dict, Tuple
+from ..heartrate.pmd import (
+    PMD_ACC, PMD_CONTROL_RESPONSE, PMD_ECG, PMD_OP_START, PMD_OP_STOP, PMDFrame, encode_pmd_frame
+)
+from ..heartrate.polar_h10 import PolarH10
+from ..heartrate.rpeak_detector import RPeakDetector
+from ..utils.config import Config
+from ..utils.latency_histogram import LatencyHistogram
+
+ECG_FRAME_SAMPLES = 73  # What an H10 sends per ECG notification
+ACC_FRAME_SAMPLES = 36
+SENSOR_EPOCH = 7.0e8  # Sensor timestamps are seconds since 2000; any large value works
+
+
+def synthesize_ecg(duration: float, sample_rate: float, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate a lead-I-like ECG with baseline wander and noise.
+    
+    Returns:
+        (samples in µV as int32, true R-peak times in seconds)
+    """
+    rng = np.random.default_rng(seed)
+    rr = 0.8 + 0.06 * rng.standard_normal(int(duration / 0.6))
+    beats = np.cumsum(rr)
+    beats = beats[beats < duration - 0.5]
+    t = np.arange(0.0, duration, 1.0 / sample_rate)
+    
+    ecg = 300.0 * np.sin(2.0 * np.pi * 0.3 * t) + 30.0 * rng.standard_normal(len(t))
+    for beat in beats:
+        near = np.abs(t - beat) < 0.35
+        dt = t[near] - beat
+        ecg[near] += (
+            1200.0 * np.exp(-0.5 * (dt / 0.012) ** 2)  # R
+            - 200.0 * np.exp(-0.5 * ((dt + 0.03) / 0.01) ** 2)  # Q
+            + 80.0 * np.exp(-0.5 * ((dt + 0.18) / 0.02) ** 2)  # P
+            + 150.0 * np.exp(-0.5 * ((dt - 0.25) / 0.04) ** 2)  # T
+        )
+    return ecg.astype(np.int32), beats
+
+
+class FakePMDClient:
+    """
+    In-process stand-in for BleakClient that behaves like an H10's PMD service.
+    
+    Start requests are acknowledged on the control point and then frames of
+    synthetic data are notified at the stream's sample rate (times speed).
+    """
+    
+    def __init__(self, address: str, ecg: np.ndarray, speed: float = 1.0):
+        """
+        Initialize fake client.
+        
+        Args:
+            address: Device address (ignored)
+            ecg: ECG samples to stream
+            speed: Replay speed relative to real time
+        """
+        self.address = address
+        self.ecg = ecg
+        self.speed = speed
+        self.is_connected = False
+        self.handlers: Dict[str, Callable] = {}
+        self.tasks: Dict[int, asyncio.Task] = {}
+    
+    async def connect(self):
+        """Connect."""
+        self.is_connected = True
+    
+    async def disconnect(self):
+        """Disconnect and stop streaming."""
+        for task in self.tasks.values():
+            task.cancel()
+        self.is_connected = False
+    
+    async def start_notify(self, uuid: str, handler: Callable):
+        """Register a notification handler."""
+        self.handlers[uuid] = handler
+    
+    async def stop_notify(self, uuid: str):
+        """Remove a notification handler."""
+        self.handlers.pop(uuid, None)
+    
+    async def write_gatt_char(self, uuid: str, data: bytes, response: bool = False):
+        """Handle a control point request."""
+        operation, measurement_type = data[0], data[1]
+        if operation == PMD_OP_START:
+            generator = self._stream_ecg() if measurement_type == PMD_ECG else self._stream_acc()
+            self.tasks[measurement_type] = asyncio.get_running_loop().create_task(generator)
+        elif operation == PMD_OP_STOP and measurement_type in self.tasks:
+            self.tasks.pop(measurement_type).cancel()
+        reply = bytes([PMD_CONTROL_RESPONSE, operation, measurement_type, 0, 0])
+        asyncio.get_running_loop().call_soon(self.handlers[Config.POLAR_PMD_CONTROL_UUID], uuid, bytearray(reply))
+    
+    async def _notify_frames(self, measurement_type: int, samples: np.ndarray, sample_rate: float,
+                             frame_samples: int, compressed_width: int = 0):
+        """Send samples as frames, paced against the start time so scheduling jitter does not accumulate."""
+        start = time.perf_counter()
+        handler = self.handlers[Config.POLAR_PMD_DATA_UUID]
+        for index in range(frame_samples, len(samples) + 1, frame_samples):
+            due = start + index / sample_rate / self.speed
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            timestamp = SENSOR_EPOCH + (index - 1) / sample_rate
+            frame = encode_pmd_frame(measurement_type, timestamp, samples[index - frame_samples:index], compressed_width)
+            handler(Config.POLAR_PMD_DATA_UUID, bytearray(frame))
+    
+    async def _stream_ecg(self):
+        """Stream the ECG."""
+        await self._notify_frames(PMD_ECG, self.ecg, Config.POLAR_ECG_SAMPLE_RATE, ECG_FRAME_SAMPLES)
+    
+    async def _stream_acc(self):
+        """Stream a slow random walk on three axes as delta-compressed frames."""
+        duration = len(self.ecg) / Config.POLAR_ECG_SAMPLE_RATE
+        rng = np.random.default_rng(1)
+        count = int(duration * Config.POLAR_ACC_SAMPLE_RATE)
+        acc = np.cumsum(rng.integers(-40, 41, size=(count, 3)), axis=0) + np.array([0, 0, 1000])
+        await self._notify_frames(PMD_ACC, acc, Config.POLAR_ACC_SAMPLE_RATE, ACC_FRAME_SAMPLES, compressed_width=8)
+
+
+async def run_benchmark(duration: float, speed: float, seed: int) -> Dict[str, object]:
+    """Stream for the given sensor duration and collect statistics."""
+    ecg, beats = synthesize_ecg(duration, Config.POLAR_ECG_SAMPLE_RATE, seed)
+    h10 = PolarH10(client_factory=lambda address, **kwargs: FakePMDClient(address, ecg, speed))
+    if not await h10.connect("00:00:00:00:00:00"):
+        raise RuntimeError("Fake connection failed")
+    
+    detector = RPeakDetector(Config.POLAR_ECG_SAMPLE_RATE)
+    handler_time = LatencyHistogram(min_latency=1e-6, max_latency=0.1)
+    loop_lag = LatencyHistogram(min_latency=1e-5, max_latency=1.0)
+    peaks = []
+    counts = {'ecg_samples': 0, 'acc_samples': 0}
+    
+    def on_ecg(frame: PMDFrame):
+        started = time.perf_counter()
+        peaks.extend(detector.process(frame.samples[:, 0], frame.sample_times - SENSOR_EPOCH))
+        counts['ecg_samples'] += len(frame.samples)
+        handler_time.record(time.perf_counter() - started)
+    
+    def on_acc(frame: PMDFrame):
+        counts['acc_samples'] += len(frame.samples)
+    
+    await h10.start_ecg_stream(on_ecg)
+    await h10.start_acc_stream(on_acc)
+    
+    # Probe how late the event loop runs a 5 ms timer while frames stream in
+    wall_duration = duration / speed
+    deadline = time.perf_counter() + wall_duration + 0.5
+    while time.perf_counter() < deadline:
+        requested = time.perf_counter()
+        await asyncio.sleep(0.005)
+        loop_lag.record(max(0.0, time.perf_counter() - requested - 0.005))
+    await h10.disconnect()
+    
+    # Score after the learning period and before the stream's last frame
+    first, last = RPeakDetector.LEARNING_PERIOD + 0.5, len(ecg) / Config.POLAR_ECG_SAMPLE_RATE - 1.0
+    peaks = np.array(peaks)
+    peaks = peaks[(peaks > first - 0.05) & (peaks < last + 0.05)]
+    scored = beats[(beats > first) & (beats < last)]
+    errors = np.min(np.abs(peaks[None, :] - scored[:, None]), axis=1) if len(peaks) else np.full(len(scored), np.inf)
+    matched = errors < 0.05
+    return {
+        'ecg_samples': counts['ecg_samples'],
+        'acc_samples': counts['acc_samples'],
+        'wall_seconds': wall_duration,
+        'handler_ms': handler_time.summary(),
+        'loop_lag_ms': loop_lag.summary(),
+        'sensitivity': float(np.mean(matched)) if len(scored) else 0.0,
+        'false_peaks': max(0, len(peaks) - int(np.sum(matched))),
+        'timing_error_ms': float(np.mean(errors[matched]) * 1000.0) if np.any(matched) else float('nan'),
+    }
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description="PMD streaming benchmark")
+    parser.add_argument('--duration', type=float, default=60.0, help="Sensor seconds to stream")
+    parser.add_argument('--speed', type=float, default=10.0, help="Replay speed relative to real time")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    results = asyncio.run(run_benchmark(args.duration, args.speed, args.seed))
+    wall = results['wall_seconds']
+    print(f"Streamed {args.duration:.0f} s of sensor data in {wall:.1f} s ({args.speed:.0f}x real time)")
+    print(f"  ECG: {results['ecg_samples'] / wall:.0f} samples/s, ACC: {results['acc_samples'] / wall:.0f} samples/s")
+    handler = results['handler_ms']
+    print(f"  R-peak detection per ECG frame: p50 {handler['p50']:.3f} ms, p99 {handler['p99']:.3f} ms")
+    lag = results['loop_lag_ms']
+    print(f"  Event loop lag: p50 {lag['p50']:.2f} ms, p99 {lag['p99']:.2f} ms, max {lag['max']:.2f} ms")
+    print(
+        f"  R peaks: sensitivity {results['sensitivity'] * 100:.1f}%, {results['false_peaks']} false, "
+        f"timing error {results['timing_error_ms']:.1f} ms"
+    )
+
+
+if __name__ == '__main__':
+    main()
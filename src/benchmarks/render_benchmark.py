@@ -0,0 +1,130 @@
+"""
+Headless rendering benchmark for HeartRenderer and OverlayEngine.
+
+Runs without a display or GPU (falls back to llvmpipe), so it can run on the
+Linux build box:
+
+    python -m src.benchmarks.render_benchmark --frames 300 --resolutions 1280x720,1920x1080
+"""
+
+import argparse
+import logging
+import math
+import time
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Tuple
+from ..utils.config import Config
+from ..rendering.headless import create_headless_context, is_software_renderer
+
+
+def parse_resolutions(text: str) -> List[Tuple[int, int]]:
+    """Parse '1280x720,1920x1080' into [(1280, 720), (1920, 1080)]."""
+    resolutions = []
+    for item in text.split(','):
+        width, height = item.lower().strip().split('x')
+        resolutions.append((int(width), int(height)))
+    return resolutions
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize timings in seconds as milliseconds."""
+    ms = np.array(samples) * 1000.0
+    return {
+        'mean': float(np.mean(ms)),
+        'p50': float(np.percentile(ms, 50)),
+        'p95': float(np.percentile(ms, 95)),
+        'max': float(np.max(ms)),
+    }
+
+
+def benchmark_model(ctx, model_path: Path, width: int, height: int, frames: int) -> Dict[str, Dict[str, float]]:
+    """
+    Render frames of one model at one resolution.
+    
+    Per frame this measures the video upload (frame into a texture), the heart
+    draw into the overlay framebuffer (synchronized with ctx.finish()) and the
+    framebuffer readback.
+    
+    Returns:
+        Timing summaries keyed by 'upload', 'draw' and 'readback'
+    """
+    from ..rendering.overlay_engine import OverlayEngine
+    
+    engine = OverlayEngine(ctx, width, height)
+    if not engine.load_heart_model(model_path):
+        raise RuntimeError(f"Could not load {model_path}")
+    
+    transform = np.eye(4, dtype=np.float32)
+    transform[:3, :3] *= 0.5
+    transform[2, 3] = -1.0
+    engine.set_heart_transform(np.ascontiguousarray(transform.T))
+    
+    video_frame = np.random.randint(0, 255, (height, width, 3), dtype=np.uint8)
+    video_texture = ctx.texture((width, height), 3)
+    
+    timings = {'upload': [], 'draw': [], 'readback': []}
+    for i in range(frames):
+        start = time.perf_counter()
+        video_texture.write(video_frame)
+        ctx.finish()
+        uploaded = time.perf_counter()
+        
+        fbo = engine.get_framebuffer()
+        fbo.use()
+        fbo.clear(0.0, 0.0, 0.0, 0.0)
+        engine.set_heart_beat_scale(1.0 + Config.HEART_BEAT_SCALE_AMPLITUDE * 0.5 * (1.0 + math.sin(i * 0.2)))
+        engine.heart_renderer.render()
+        ctx.finish()
+        drawn = time.perf_counter()
+        
+        pixels = np.frombuffer(fbo.read(viewport=(0, 0, width, height), components=4), dtype=np.uint8)
+        read = time.perf_counter()
+        
+        timings['upload'].append(uploaded - start)
+        timings['draw'].append(drawn - uploaded)
+        timings['readback'].append(read - drawn)
+    
+    assert pixels.size == width * height * 4
+    video_texture.release()
+    return {name: summarize(samples) for name, samples in timings.items()}
+
+
+def main():
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description="Headless heart rendering benchmark")
+    parser.add_argument('--frames', type=int, default=120, help="Frames per model and resolution")
+    parser.add_argument('--resolutions', type=str, default="1280x720,1920x1080")
+    parser.add_argument('--backend', type=str, default=None, help="Force moderngl backend (e.g. egl)")
+    parser.add_argument('--model', type=Path, action='append', default=None,
+                        help="OBJ model to render (repeatable, default: low and high poly hearts)")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING, format='%(name)s - %(levelname)s - %(message)s')
+    
+    # The impostor bake is a separate workload; keep it out of these timings
+    Config.HEART_IMPOSTOR_ENABLED = False
+    
+    models = args.model or [Config.HEART_LOW_POLY, Config.HEART_HIGH_POLY]
+    ctx = create_headless_context(backend=args.backend)
+    software = " (software)" if is_software_renderer(ctx) else ""
+    print(f"Renderer: {ctx.info['GL_RENDERER']}{software}, GL {ctx.version_code}")
+    print(f"{'model':<32} {'resolution':>10} {'stage':>9} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8}  (ms)")
+    
+    for model_path in models:
+        if not model_path.exists():
+            print(f"{model_path.name:<32} skipped, file not found")
+            continue
+        for width, height in parse_resolutions(args.resolutions):
+            results = benchmark_model(ctx, model_path, width, height, args.frames)
+            for stage, stats in results.items():
+                print(
+                    f"{model_path.name[:32]:<32} {f'{width}x{height}':>10} {stage:>9} "
+                    f"{stats['mean']:8.3f} {stats['p50']:8.3f} {stats['p95']:8.3f} {stats['max']:8.3f}"
+                )
+    
+    ctx.release()
+
+
+if __name__ == "__main__":
+    main()
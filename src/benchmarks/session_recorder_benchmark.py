@@ -0,0 +1,132 @@
+"""
+Cost of recording a session, and of reading it back.
+
+Feeds a SessionRecorder what MainWindow does, in real time: a 1080p frame,
+its pose landmarks and chest transform every camera frame, and a heart
+rate notification per strap each second. The record_* calls (the only
+work on the UI thread) are timed, and dropped records counted. The file is
+then opened with SessionReader and random frames and landmarks are read:
+
+    python -m src.benchmarks.session_recorder_benchmark --duration 10
+    python -m src.benchmarks.session_recorder_benchmark --format raw --scale 1.0
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from types import SimpleNamespace
+from ..utils.latency_histogram import LatencyHistogram
+from ..utils.session_recorder import FRAME_KINDS, HEART_RATE, LANDMARKS, SessionReader, SessionRecorder
+
+WIDTH, HEIGHT = 1920, 1080
+
+
+def make_frames(count: int, seed: int) -> list:
+    """Noisy gradient frames (JPEG has real work to do, unlike on flat images)."""
+    rng = np.random.default_rng(seed)
+    base = np.add.outer(np.arange(HEIGHT) // 5, np.arange(WIDTH) // 9).astype(np.uint8)
+    return [
+        np.clip(base[:, :, None] + rng.integers(0, 24, (HEIGHT, WIDTH, 3)), 0, 255).astype(np.uint8)
+        for _ in range(count)
+    ]
+
+
+def run_benchmark(path: str, duration: float, fps: float, straps: int, frame_format, scale: float,
+                  reads: int, seed: int) -> dict:
+    """Record for duration seconds of real time, then read the file back."""
+    rng = np.random.default_rng(seed)
+    frames = make_frames(8, seed)
+    landmarks = SimpleNamespace(landmark=[
+        SimpleNamespace(x=rng.random(), y=rng.random(), z=rng.random(), visibility=0.9) for _ in range(33)
+    ])
+    recorder = SessionRecorder(path, frame_format=frame_format, frame_scale=scale)
+    call_cost = LatencyHistogram(min_latency=1e-7, max_latency=1.0)
+    
+    recorder.start({'benchmark': True})
+    started = time.perf_counter()
+    frame_count = 0
+    next_beat = 0.0
+    while True:
+        t = time.perf_counter() - started
+        if t >= duration:
+            break
+        call_started = time.perf_counter()
+        recorder.record_frame(frames[frame_count % len(frames)], t)
+        recorder.record_landmarks(landmarks, t)
+        recorder.record_chest(t, (960.0 + frame_count % 7, 600.0), (5.0, -2.0))
+        if t >= next_beat:
+            for strap in range(straps):
+                recorder.record_heart_rate(f"strap-{strap}", t, 72, (0.82, 0.84))
+            next_beat += 1.0
+        call_cost.record(time.perf_counter() - call_started)
+        frame_count += 1
+        time.sleep(max(0.0, frame_count / fps - (time.perf_counter() - started)))
+    stop_started = time.perf_counter()
+    finished = recorder.stop()
+    stop_time = time.perf_counter() - stop_started
+    
+    reader = SessionReader(path)
+    frame_records = reader.select(FRAME_KINDS)
+    landmark_records = reader.select(LANDMARKS)
+    frame_read = LatencyHistogram(min_latency=1e-7, max_latency=1.0)
+    landmark_read = LatencyHistogram(min_latency=1e-7, max_latency=1.0)
+    for i in rng.integers(0, len(frame_records), reads) if len(frame_records) else ():
+        read_started = time.perf_counter()
+        reader.payload(frame_records[i])
+        frame_read.record(time.perf_counter() - read_started)
+    for i in rng.integers(0, len(landmark_records), reads) if len(landmark_records) else ():
+        read_started = time.perf_counter()
+        reader.payload(landmark_records[i])
+        landmark_read.record(time.perf_counter() - read_started)
+    results = {
+        'frames': frame_count,
+        'finished': finished,
+        'stop_s': stop_time,
+        'call_ms': call_cost.summary(),
+        'dropped': recorder.dropped(),
+        'bytes': os.path.getsize(path),
+        'records': len(reader),
+        'recorded_frames': len(frame_records),
+        'heart_rate': len(reader.select(HEART_RATE)),
+        'frame_read_ms': frame_read.summary(),
+        'landmark_read_ms': landmark_read.summary(),
+    }
+    reader.close()
+    return results
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description="Session recorder benchmark")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds recorded")
+    parser.add_argument('--fps', type=float, default=30.0, help="Camera frame rate")
+    parser.add_argument('--straps', type=int, default=2, help="Heart rate sources")
+    parser.add_argument('--format', default="jpeg", choices=("jpeg", "raw", "none"), help="Frame format")
+    parser.add_argument('--scale', type=float, default=0.5, help="Frame downscale factor")
+    parser.add_argument('--reads', type=int, default=200, help="Random reads of each kind")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    frame_format = None if args.format == "none" else args.format
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.hrsession")
+        results = run_benchmark(path, args.duration, args.fps, args.straps, frame_format, args.scale,
+                                args.reads, args.seed)
+    call = results['call_ms']
+    print(f"{results['frames']} frames of {WIDTH}x{HEIGHT} at {args.fps:g} fps, "
+          f"{args.format} x{args.scale:g}, {args.duration:g} s")
+    print(f"  UI thread per frame (record_*): p50 {call['p50']:.3f} ms, p99 {call['p99']:.3f} ms, "
+          f"max {call['max']:.3f} ms")
+    print(f"  Dropped: {results['dropped']}; {results['recorded_frames']} frames and "
+          f"{results['heart_rate']} heart rate samples on disk")
+    print(f"  File: {results['bytes'] / 1e6:.1f} MB ({results['bytes'] / 1e6 / args.duration:.2f} MB/s), "
+          f"{results['records']} records; stop() took {results['stop_s'] * 1e3:.0f} ms"
+          f"{'' if results['finished'] else ' (writer still busy)'}")
+    print(f"  Random reads: frame p50 {results['frame_read_ms']['p50']:.3f} ms, "
+          f"landmarks p50 {results['landmark_read_ms']['p50'] * 1e3:.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Cost of keeping streaming history in a TimeSeries.
+
+Appends --samples values with timestamps and compares, per sample:
+a deque of (timestamp, value) tuples, a TimeSeries
+with no windows, and a TimeSeries with count and duration RollingWindows,
+against recomputing the same windowed statistics with NumPy every sample:
+
+    python -m src.benchmarks.timeseries_benchmark --samples 200000 --window 300
+"""
+
+import argparse
+import time
+import numpy as np
+from collections import deque
+from ..utils.timeseries import TimeSeries
+
+
+def per_sample_us(started: float, samples: int) -> float:
+    """Microseconds per sample since started."""
+    return (time.perf_counter() - started) / samples * 1e6
+
+
+def run_benchmark(samples: int, capacity: int, window: int, rate: float, seed: int) -> dict:
+    """Append the same stream to each container and time it."""
+    rng = np.random.default_rng(seed)
+    times = np.cumsum(rng.uniform(0.5, 1.5, samples) / rate)
+    values = 70.0 + np.cumsum(rng.normal(0.0, 0.5, samples))
+    results = {}
+    
+    history = deque(maxlen=window)
+    started = time.perf_counter()
+    for t, value in zip(times.tolist(), values.tolist()):
+        history.append((t, value))
+    results['deque'] = per_sample_us(started, samples)
+    
+    series = TimeSeries(capacity)
+    started = time.perf_counter()
+    for t, value in zip(times.tolist(), values.tolist()):
+        series.append(t, value)
+    results['timeseries'] = per_sample_us(started, samples)
+    
+    series = TimeSeries(capacity)
+    by_count = series.add_window(count=window)
+    by_time = series.add_window(duration=window / rate)
+    started = time.perf_counter()
+    for t, value in zip(times.tolist(), values.tolist()):
+        series.append(t, value)
+        by_count.mean, by_count.std, by_count.min, by_count.max
+    results['windows'] = per_sample_us(started, samples)
+    
+    series = TimeSeries(capacity)
+    recomputed = min(samples, 20000)
+    started = time.perf_counter()
+    for t, value in zip(times[:recomputed].tolist(), values[:recomputed].tolist()):
+        series.append(t, value)
+        _, latest = series.latest(window)
+        latest.mean(), latest.std(ddof=1) if len(latest) > 1 else None, latest.min(), latest.max()
+    results['numpy'] = per_sample_us(started, recomputed)
+    
+    # Rolling statistics must match a recomputation over the same samples, after
+    # every append, for the benchmarked window and one spanning the whole series
+    check = TimeSeries(capacity)
+    check_windows = [check.add_window(count=window), check.add_window()]
+    error = 0.0
+    for t, value in zip(times[:recomputed].tolist(), values[:recomputed].tolist()):
+        check.append(t, value)
+        for check_window in check_windows:
+            _, latest = check.latest(check_window.max_count)
+            if len(latest) < 2:
+                continue
+            error = max(
+                error,
+                abs(check_window.mean - latest.mean()),
+                abs(check_window.std - latest.std(ddof=1)),
+                abs(check_window.min - latest.min()),
+                abs(check_window.max - latest.max()),
+            )
+    results['error'] = error
+    results['time_window_count'] = by_time.count
+    return results
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description="Streaming time series benchmark")
+    parser.add_argument('--samples', type=int, default=200000, help="Samples appended")
+    parser.add_argument('--capacity', type=int, default=1800, help="TimeSeries capacity")
+    parser.add_argument('--window', type=int, default=300, help="Window length in samples")
+    parser.add_argument('--rate', type=float, default=30.0, help="Mean samples per second")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    results = run_benchmark(args.samples, args.capacity, args.window, args.rate, args.seed)
+    print(f"{args.samples} samples, capacity {args.capacity}, {args.window}-sample windows")
+    print(f"  deque append: {results['deque']:.2f} us/sample")
+    print(f"  TimeSeries append: {results['timeseries']:.2f} us/sample")
+    print(f"  TimeSeries append + count and duration windows, stats read every sample: "
+          f"{results['windows']:.2f} us/sample ({results['time_window_count']} samples in the duration window)")
+    print(f"  NumPy recompute of the window stats every sample: {results['numpy']:.2f} us/sample")
+    print(f"  Max difference between rolling and recomputed stats ({args.window}-sample and "
+          f"{args.capacity}-sample windows): {results['error']:.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,119 +1,307 @@
 """Heart beat animation controller."""
 
-import time
 import math
-from typing import Optional
+import numpy as np
+from typing import List, Optional, Sequence
+from .beat_predictor import BeatPredictor
+from .beat_reconstructor import BeatReconstructor
+from ..utils import clock
 from ..utils.config import Config
 
 
+def _pulse_curve(progress: float) -> float:
+    """Triggered pulse shape over progress 0-1: quick expansion, then slow contraction."""
+    if progress < 0.3:
+        # Quick expansion (first 30% of pulse)
+        return math.sin(progress * math.pi / 0.3)
+    # Slow contraction (remaining 70%)
+    decay_progress = (progress - 0.3) / 0.7
+    return math.cos(decay_progress * math.pi / 2)
+
+
+def _rhythm_curve(phase: float) -> float:
+    """BPM-driven pulse shape over one beat (phase 0-1)."""
+    angle = phase * 2.0 * math.pi
+    if angle < math.pi:
+        # Expansion phase (first half)
+        return math.sin(angle)
+    # Contraction phase (second half) - slower
+    return math.sin(angle) * 0.5
+
+
+def _build_lut(curve, size: int) -> np.ndarray:
+    """Sample a curve at size + 1 evenly spaced points over 0-1 (both ends included)."""
+    return np.array([curve(i / size) for i in range(size + 1)], dtype=np.float64)
+
+
+def _lookup(table: List[float], x: float) -> float:
+    """Linearly interpolate a LUT built by _build_lut at x in 0-1 (scalar fast path)."""
+    position = x * (len(table) - 1)
+    index = int(position)
+    if index >= len(table) - 1:
+        return table[-1]
+    if index < 0:
+        return table[0]
+    low = table[index]
+    return low + (table[index + 1] - low) * (position - index)
+
+
 class AnimationController:
-    """Controls heart beat animation based on heart rate."""
+    """
+    Controls heart beat animation based on heart rate.
+    
+    Times are in the shared clock domain (see utils.clock). With RR intervals the pulse fires on
+    beats predicted by a phase-locked loop (see BeatPredictor), in time with
+    the real heart; until the loop locks it fires at reconstructed beat times
+    after a playout delay (see BeatReconstructor). Without RR intervals it
+    falls back to explicit triggers and then to a BPM-driven rhythm.
+    
+    Pulse shapes are precomputed lookup tables. The BPM rhythm follows BPM
+    changes with an exponential approach in closed form, so the scale at any
+    time is a pure function of the controller state: beat_scale_at() can
+    evaluate many timestamps without touching it, and only get_beat_scale()
+    advances beat scheduling.
+    """
+    
+    LUT_SIZE = 256
+    PULSE_LUT = _build_lut(_pulse_curve, LUT_SIZE)
+    RHYTHM_LUT = _build_lut(_rhythm_curve, LUT_SIZE)
+    LUT_POSITIONS = np.linspace(0.0, 1.0, LUT_SIZE + 1)
     
     def __init__(self):
         """Initialize animation controller."""
-        self.start_time = time.time()
-        self.current_bpm: Optional[int] = None
-        self.target_bpm: Optional[int] = None
+        self.target_bpm: Optional[float] = None
         self.beat_scale = 1.0
-        self.animation_smoothing = Config.ANIMATION_SMOOTHING
+        self.bpm_time_constant = Config.ANIMATION_BPM_TIME_CONSTANT
         self.last_heartbeat_time: Optional[float] = None
         self.heartbeat_pulse_start: Optional[float] = None
         self.pulse_duration = 0.3  # Pulse animation duration in seconds
+        self.beat_reconstructor = BeatReconstructor()
+        self.beat_predictor = BeatPredictor()
+        self.use_prediction = Config.HEART_BEAT_PREDICTION
+        
+        # Rhythm state at the last BPM change: BPM was bpm_from, approaching
+        # target_bpm, and the rhythm had completed rhythm_beats beats
+        self.bpm_change_time = 0.0
+        self.bpm_from: Optional[float] = None
+        self.rhythm_beats = 0.0
+        
+        self._pulse_table = self.PULSE_LUT.tolist()
+        self._rhythm_table = self.RHYTHM_LUT.tolist()
     
-    def update_bpm(self, bpm: Optional[int]):
+    def update_bpm(self, bpm: Optional[int], current_time: Optional[float] = None):
         """
         Update target BPM for animation.
         
         Args:
             bpm: Beats per minute (None to stop animation)
+            current_time: Time of the change (default: clock.now())
+        """
+        if current_time is None:
+            current_time = clock.now()
+        
+        if bpm is None:
+            self.target_bpm = None
+            self.bpm_from = None
+            return
+        if self.target_bpm is None:
+            # Rhythm starts at this BPM
+            self.bpm_from = float(bpm)
+            self.rhythm_beats = 0.0
+        else:
+            # Continue from where the current approach has got to
+            self.rhythm_beats = float(self._rhythm_beats_at(current_time))
+            self.bpm_from = float(self.bpm_at(current_time))
+        self.target_bpm = float(bpm)
+        self.bpm_change_time = current_time
+    
+    def bpm_at(self, timestamps):
+        """
+        Get the rhythm's BPM (smoothed toward the target) at given times.
+        
+        Args:
+            timestamps: Time or array of times
+        
+        Returns:
+            BPM of the same shape (None if no BPM is set)
+        """
+        if self.target_bpm is None:
+            return None
+        tau = self.bpm_time_constant
+        elapsed = np.maximum(np.asarray(timestamps, dtype=np.float64) - self.bpm_change_time, 0.0)
+        if tau <= 0:
+            return np.full_like(elapsed, self.target_bpm)
+        return self.target_bpm + (self.bpm_from - self.target_bpm) * np.exp(-elapsed / tau)
+    
+    def _rhythm_beats_at(self, timestamps) -> np.ndarray:
+        """
+        Number of rhythm beats completed at given times (integral of BPM / 60).
+        
+        Times before the last BPM change extrapolate at the BPM it started from.
         """
-        self.target_bpm = bpm
+        elapsed = np.asarray(timestamps, dtype=np.float64) - self.bpm_change_time
+        after = np.maximum(elapsed, 0.0)
+        tau = self.bpm_time_constant
+        beats = self.target_bpm * after
+        if tau > 0:
+            beats = beats + (self.bpm_from - self.target_bpm) * tau * (1.0 - np.exp(-after / tau))
+        beats = beats + self.bpm_from * np.minimum(elapsed, 0.0)
+        return self.rhythm_beats + beats / 60.0
+    
+    def _rhythm_phase(self, current_time: float) -> float:
+        """Scalar _rhythm_beats_at() modulo 1, without numpy overhead (per-frame path)."""
+        elapsed = current_time - self.bpm_change_time
+        tau = self.bpm_time_constant
+        if elapsed < 0:
+            beats = self.bpm_from * elapsed
+        elif tau > 0:
+            beats = self.target_bpm * elapsed + (self.bpm_from - self.target_bpm) * tau * (1.0 - math.exp(-elapsed / tau))
+        else:
+            beats = self.target_bpm * elapsed
+        return (self.rhythm_beats + beats / 60.0) % 1.0
     
-    def trigger_heartbeat(self):
+    def trigger_heartbeat(self, beat_time: Optional[float] = None):
         """
         Trigger a heartbeat pulse animation.
-        Called on each heartbeat notification from the H10.
+        
+        Args:
+            beat_time: When the pulse starts (default: now)
+        """
+        if beat_time is None:
+            beat_time = clock.now()
+        self.last_heartbeat_time = beat_time
+        self.heartbeat_pulse_start = beat_time
+    
+    def add_rr_intervals(self, arrival_time: float, rr_intervals: Sequence[float]):
+        """
+        Schedule pulses for the beats described by a notification's RR intervals.
+        
+        Args:
+            arrival_time: clock.now() when the notification arrived
+            rr_intervals: RR intervals in seconds, oldest first
+        """
+        for beat_time in self.beat_reconstructor.add(arrival_time, rr_intervals):
+            self.beat_predictor.observe(beat_time)
+    
+    def has_beat_timing(self, current_time: Optional[float] = None) -> bool:
+        """
+        Check whether pulses are driven by RR intervals.
+        
+        Args:
+            current_time: Current time (default: clock.now())
+        
+        Returns:
+            True if RR intervals arrived recently
         """
-        import time
-        self.last_heartbeat_time = time.time()
-        self.heartbeat_pulse_start = time.time()
+        if current_time is None:
+            current_time = clock.now()
+        return self.beat_reconstructor.is_active(current_time)
+    
+    def _predicting(self, current_time: float) -> bool:
+        """Check whether pulses come from the beat predictor rather than the playout queue."""
+        return self.use_prediction and self.beat_predictor.is_locked(current_time)
     
     def get_beat_scale(self, current_time: Optional[float] = None) -> float:
         """
-        Get current heartbeat scale factor.
+        Get current heartbeat scale factor and advance beat scheduling.
         Uses real-time heartbeat triggers if available, otherwise falls back to BPM-based animation.
         
         Args:
-            current_time: Current time (default: time.time())
+            current_time: Current time (default: clock.now())
         
         Returns:
             Scale factor (1.0 = normal, >1.0 = expanded)
         """
         if current_time is None:
-            current_time = time.time()
+            current_time = clock.now()
+        
+        # Start the pulse of the most recent beat that is due; its exact due
+        # time is kept so the pulse phase does not depend on the frame rate
+        due_beats = self.beat_reconstructor.pop_due_beats(current_time)
+        if self._predicting(current_time):
+            # Delayed beats are only needed until the predictor has locked
+            due_beats = self.beat_predictor.pop_due_beats(current_time)
+        if due_beats:
+            self.trigger_heartbeat(due_beats[-1])
+        
+        amplitude = Config.HEART_BEAT_SCALE_AMPLITUDE
         
         # If we have a recent heartbeat pulse, use that for animation
         if self.heartbeat_pulse_start is not None:
             pulse_elapsed = current_time - self.heartbeat_pulse_start
-            
-            if pulse_elapsed < self.pulse_duration:
-                # Create a pulse animation: quick expansion, then slow contraction
-                # Use a curve that peaks early and decays
-                progress = pulse_elapsed / self.pulse_duration
-                
-                if progress < 0.3:
-                    # Quick expansion (first 30% of pulse)
-                    pulse = math.sin(progress * math.pi / 0.3) * Config.HEART_BEAT_SCALE_AMPLITUDE
-                else:
-                    # Slow contraction (remaining 70%)
-                    decay_progress = (progress - 0.3) / 0.7
-                    pulse = math.cos(decay_progress * math.pi / 2) * Config.HEART_BEAT_SCALE_AMPLITUDE
-                
-                self.beat_scale = 1.0 + pulse
+            if 0.0 <= pulse_elapsed < self.pulse_duration:
+                self.beat_scale = 1.0 + _lookup(self._pulse_table, pulse_elapsed / self.pulse_duration) * amplitude
                 return self.beat_scale
-            else:
-                # Pulse finished, reset
-                self.heartbeat_pulse_start = None
         
         # Fallback to BPM-based continuous animation if no recent heartbeat
-        # Smooth BPM transition
-        if self.target_bpm is not None:
-            if self.current_bpm is None:
-                self.current_bpm = self.target_bpm
-            else:
-                # Smooth interpolation
-                diff = self.target_bpm - self.current_bpm
-                self.current_bpm += diff * self.animation_smoothing
-        
-        if self.current_bpm is None or self.current_bpm <= 0:
+        if self.target_bpm is None:
             self.beat_scale = 1.0
             return 1.0
+        phase = self._rhythm_phase(current_time)
+        self.beat_scale = 1.0 + _lookup(self._rhythm_table, phase) * amplitude
+        return self.beat_scale
+    
+    def _pulse_starts(self, start: float, end: float) -> np.ndarray:
+        """
+        Pulse start times known or scheduled up to end, without consuming them.
         
-        # Calculate beat phase (0 to 2π) for continuous animation
-        elapsed = current_time - self.start_time
-        beat_interval = 60.0 / self.current_bpm
-        phase = (elapsed % beat_interval) / beat_interval * 2.0 * math.pi
+        Args:
+            start: Earliest time of interest
+            end: Latest time of interest
         
-        # Create heartbeat pulse using sine wave
-        # Pulse shape: quick expansion, slow contraction
-        if phase < math.pi:
-            # Expansion phase (first half)
-            pulse = math.sin(phase) * Config.HEART_BEAT_SCALE_AMPLITUDE
+        Returns:
+            Sorted array of pulse start times
+        """
+        starts = [] if self.heartbeat_pulse_start is None else [self.heartbeat_pulse_start]
+        if self._predicting(start):
+            starts.extend(self.beat_predictor.upcoming_beats(start, end))
         else:
-            # Contraction phase (second half) - slower
-            pulse = math.sin(phase) * Config.HEART_BEAT_SCALE_AMPLITUDE * 0.5
+            starts.extend(beat for beat in self.beat_reconstructor.pending if beat <= end)
+        return np.sort(np.array(starts, dtype=np.float64))
+    
+    def beat_scale_at(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the heartbeat scale at many times without changing any state.
         
-        # Scale factor: 1.0 + pulse
-        self.beat_scale = 1.0 + pulse
+        Uses the current pulse and the beats already scheduled (played-out or
+        predicted) plus the BPM rhythm, so it matches what get_beat_scale()
+        would return at those times unless new heart rate data arrives. Meant
+        for offline replay and display-rate interpolation.
         
-        return self.beat_scale
+        Args:
+            timestamps: Times in seconds (any shape)
+        
+        Returns:
+            Scale factors with the shape of timestamps
+        """
+        times = np.asarray(timestamps, dtype=np.float64)
+        amplitude = Config.HEART_BEAT_SCALE_AMPLITUDE
+        
+        if self.target_bpm is None:
+            scale = np.ones_like(times)
+        else:
+            phase = np.mod(self._rhythm_beats_at(times), 1.0)
+            scale = 1.0 + np.interp(phase, self.LUT_POSITIONS, self.RHYTHM_LUT) * amplitude
+        if times.size == 0:
+            return scale
+        
+        starts = self._pulse_starts(float(times.min()), float(times.max()))
+        if starts.size:
+            # Latest pulse started at or before each time
+            index = np.searchsorted(starts, times, side='right') - 1
+            elapsed = times - starts[np.maximum(index, 0)]
+            in_pulse = (index >= 0) & (elapsed < self.pulse_duration)
+            progress = elapsed[in_pulse] / self.pulse_duration
+            scale[in_pulse] = 1.0 + np.interp(progress, self.LUT_POSITIONS, self.PULSE_LUT) * amplitude
+        return scale
     
     def reset(self):
         """Reset animation state."""
-        self.start_time = time.time()
-        self.current_bpm = None
         self.target_bpm = None
+        self.bpm_from = None
+        self.rhythm_beats = 0.0
         self.beat_scale = 1.0
         self.last_heartbeat_time = None
         self.heartbeat_pulse_start = None
-
+        self.beat_reconstructor.reset()
+        self.beat_predictor.reset()
@@ -0,0 +1,180 @@
+"""Phase-locked loop that predicts upcoming heartbeats from observed ones."""
+
+from typing import List, Optional
+from ..utils.config import Config
+
+
+class BeatPredictor:
+    """
+    Second-order phase-locked loop over heartbeat times.
+    
+    The loop keeps a beat grid (anchor + k * period). Each observed beat is
+    matched to the nearest grid beat and the timing error nudges the phase
+    (phase_gain) and the period (period_gain), so late or jittery
+    observations are averaged out instead of restarting the rhythm. Pulses
+    fire on the extrapolated grid, i.e. when the next beat is expected rather
+    than when it is reported, and a correction shifts the following pulses
+    gradually instead of making the heart skip.
+    
+    Observed beats may arrive long after they happened (RR intervals are
+    reported up to a second late); only their timestamps matter.
+    """
+    
+    MIN_PERIOD = 60.0 / 220.0
+    MAX_PERIOD = 60.0 / 30.0
+    # Errors beyond this fraction of a period are treated as ectopic or missed
+    # beats and only counted; enough of them in a row re-locks the loop
+    OUTLIER_FRACTION = 0.35
+    MAX_OUTLIERS = 3
+    
+    def __init__(self, phase_gain: Optional[float] = None, period_gain: Optional[float] = None,
+                 lock_beats: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        Initialize beat predictor.
+        
+        Args:
+            phase_gain: Fraction of the timing error applied to the phase (default from config)
+            period_gain: Fraction of the timing error applied to the period (default from config)
+            lock_beats: Observed beats needed before predictions are used (default from config)
+            timeout: Seconds without an observed beat after which predictions stop (default from config)
+        """
+        self.phase_gain = Config.HEART_BEAT_PLL_PHASE_GAIN if phase_gain is None else phase_gain
+        self.period_gain = Config.HEART_BEAT_PLL_PERIOD_GAIN if period_gain is None else period_gain
+        self.lock_beats = Config.HEART_BEAT_PLL_LOCK_BEATS if lock_beats is None else lock_beats
+        self.timeout = Config.HEART_BEAT_PLL_TIMEOUT if timeout is None else timeout
+        
+        self.anchor: Optional[float] = None  # A grid beat time
+        self.period: Optional[float] = None
+        self.last_observed: Optional[float] = None
+        self.observed_count = 0
+        self.outliers = 0
+        self.last_fired: Optional[float] = None
+        self.last_error = 0.0
+    
+    def observe(self, beat_time: float) -> Optional[float]:
+        """
+        Feed the time of a real beat.
+        
+        Args:
+            beat_time: When the beat happened (same clock as pop_due_beats)
+        
+        Returns:
+            Timing error against the prediction in seconds (None while acquiring)
+        """
+        if self.last_observed is not None and beat_time <= self.last_observed:
+            return None
+        
+        if self.period is None or (self.last_observed is not None and beat_time - self.last_observed > self.timeout):
+            self._acquire(beat_time)
+            return None
+        
+        # Match to the nearest grid beat
+        k = round((beat_time - self.anchor) / self.period)
+        predicted = self.anchor + k * self.period
+        error = beat_time - predicted
+        
+        if abs(error) > self.OUTLIER_FRACTION * self.period:
+            self.outliers += 1
+            if self.outliers >= self.MAX_OUTLIERS:
+                # The rhythm changed faster than the loop can follow
+                self._acquire(beat_time, keep_period=False)
+            else:
+                self.last_observed = beat_time
+            return None
+        self.outliers = 0
+        self.last_observed = beat_time
+        
+        self.anchor = predicted + self.phase_gain * error
+        self.period = min(self.MAX_PERIOD, max(self.MIN_PERIOD, self.period + self.period_gain * error))
+        self.observed_count += 1
+        self.last_error = error
+        return error
+    
+    def _acquire(self, beat_time: float, keep_period: bool = True):
+        """Start locking from a single beat (period from the interval to the previous one)."""
+        if self.last_observed is not None and beat_time - self.last_observed <= self.MAX_PERIOD:
+            self.period = max(self.MIN_PERIOD, beat_time - self.last_observed)
+        elif not keep_period:
+            self.period = None
+        self.anchor = beat_time
+        self.last_observed = beat_time
+        self.observed_count = 1 if self.period is not None else 0
+        self.outliers = 0
+    
+    def is_locked(self, now: float) -> bool:
+        """Check whether predictions are reliable enough to drive the animation."""
+        return (
+            self.period is not None
+            and self.observed_count >= self.lock_beats
+            and now - self.last_observed <= self.timeout
+        )
+    
+    def predict_next(self, after: float) -> Optional[float]:
+        """
+        Get the first predicted beat later than a given time.
+        
+        Args:
+            after: Time in seconds
+        
+        Returns:
+            Predicted beat time, None if not locked
+        """
+        if self.period is None:
+            return None
+        k = int((after - self.anchor) // self.period) + 1
+        return self.anchor + k * self.period
+    
+    def upcoming_beats(self, now: float, end: float) -> List[float]:
+        """
+        Get the predicted beats pop_due_beats would fire from now until end,
+        without firing them.
+        
+        Args:
+            now: Current time
+            end: Last time of interest
+        
+        Returns:
+            Predicted beat times <= end, oldest first (empty unless locked)
+        """
+        if not self.is_locked(now):
+            return []
+        
+        if self.last_fired is None:
+            # Do not replay the past: start with the beat just before now
+            start = now - self.period
+        else:
+            # A phase correction may have moved the grid toward the last pulse;
+            # half a period of spacing keeps it from firing the same beat twice
+            start = max(self.last_fired + 0.5 * self.period, now - self.period)
+        
+        beats = []
+        beat = self.predict_next(start)
+        while beat <= end:
+            beats.append(beat)
+            beat += self.period
+        return beats
+    
+    def pop_due_beats(self, now: float) -> List[float]:
+        """
+        Take the predicted beats that are due and not yet fired.
+        
+        Args:
+            now: Current time
+        
+        Returns:
+            Predicted beat times <= now, oldest first (empty unless locked)
+        """
+        due = self.upcoming_beats(now, now)
+        if due:
+            self.last_fired = due[-1]
+        return due
+    
+    def reset(self):
+        """Reset predictor state."""
+        self.anchor = None
+        self.period = None
+        self.last_observed = None
+        self.observed_count = 0
+        self.outliers = 0
+        self.last_fired = None
+        self.last_error = 0.0
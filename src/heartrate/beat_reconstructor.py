@@ -0,0 +1,129 @@
+"""Beat timestamp reconstruction from Heart Rate Measurement RR intervals."""
+
+from collections import deque
+from typing import Deque, List, Optional, Sequence
+from ..utils.config import Config
+
+
+class BeatReconstructor:
+    """
+    Reconstructs when each heartbeat happened from RR intervals.
+    
+    The H10 sends a notification about once a second with the RR intervals
+    of the beats since the previous one, so notification arrival says little
+    about when a beat happened. Summing RR intervals gives a beat clock in
+    sensor time; it is anchored to local time with the smallest observed
+    delay between a notification's last beat and its arrival (the last beat
+    happened at or before arrival), which is allowed to creep up slowly so
+    clock drift between sensor and host is followed.
+    
+    A lost notification takes its RR intervals with it and leaves the beat
+    clock behind. The beat after a notification's last one had not happened
+    when it was sent, so a notification arriving more than about one RR
+    interval later than the anchor allows shows intervals were lost, and the
+    beat clock is anchored anew from that notification.
+    
+    Reconstructed beats lie in the past, so they are played out after a
+    fixed delay: the rhythm on screen matches the real beats exactly, shifted
+    by playout_delay.
+    """
+    
+    # How fast the anchor may move later (seconds per second) when no
+    # notification arrives as early as the best one so far
+    ANCHOR_DRIFT_RATE = 0.0002
+    # Beats closer together than this are the same beat seen twice
+    MIN_BEAT_SPACING = 0.2
+    # Radio latency spread and RR change allowed on top of one RR interval
+    # before a late notification counts as lost intervals
+    LOST_INTERVAL_SLACK = 0.5
+    
+    def __init__(self, playout_delay: Optional[float] = None, max_gap: Optional[float] = None):
+        """
+        Initialize beat reconstructor.
+        
+        Args:
+            playout_delay: Seconds between a beat and its display (default from config)
+            max_gap: Notification gap in seconds after which the beat clock is re-anchored
+                (default from config)
+        """
+        self.playout_delay = Config.HEART_BEAT_PLAYOUT_DELAY if playout_delay is None else playout_delay
+        self.max_gap = Config.HEART_BEAT_MAX_GAP if max_gap is None else max_gap
+        
+        self.sensor_time = 0.0  # Beat clock: sum of RR intervals up to the latest beat
+        self.offset: Optional[float] = None  # Local time of sensor_time 0
+        self.last_arrival: Optional[float] = None
+        self.last_beat_time: Optional[float] = None
+        self.pending: Deque[float] = deque()  # Display times of beats not yet played out
+    
+    def add(self, arrival_time: float, rr_intervals: Sequence[float]) -> List[float]:
+        """
+        Add one notification's RR intervals.
+        
+        Args:
+            arrival_time: Local time the notification arrived (same clock as pop_due_beats)
+            rr_intervals: RR intervals in seconds, oldest first
+        
+        Returns:
+            Local times of the newly reconstructed beats
+        """
+        if not rr_intervals:
+            return []
+        
+        if self.last_arrival is None or arrival_time - self.last_arrival > self.max_gap:
+            # First notification or intervals were lost: start a new beat clock
+            self.sensor_time = 0.0
+            self.offset = None
+        elapsed = 0.0 if self.last_arrival is None else arrival_time - self.last_arrival
+        self.last_arrival = arrival_time
+        
+        sensor_beats = []
+        for rr in rr_intervals:
+            self.sensor_time += rr
+            sensor_beats.append(self.sensor_time)
+        
+        # The latest beat happened no later than the notification arrived
+        candidate = arrival_time - self.sensor_time
+        if (self.offset is None or candidate < self.offset
+                or candidate - self.offset > max(rr_intervals) + self.LOST_INTERVAL_SLACK):
+            # First notification, an earlier arrival, or intervals were lost
+            # and the beat clock is behind
+            self.offset = candidate
+        else:
+            self.offset += min(candidate - self.offset, self.ANCHOR_DRIFT_RATE * elapsed)
+        
+        beats = []
+        for sensor_beat in sensor_beats:
+            beat_time = sensor_beat + self.offset
+            if self.last_beat_time is not None and beat_time < self.last_beat_time + self.MIN_BEAT_SPACING:
+                continue
+            beats.append(beat_time)
+            self.last_beat_time = beat_time
+            self.pending.append(beat_time + self.playout_delay)
+        return beats
+    
+    def pop_due_beats(self, now: float) -> List[float]:
+        """
+        Take the beats whose display time has come.
+        
+        Args:
+            now: Current local time
+        
+        Returns:
+            Display times (beat time + playout delay) that are <= now, oldest first
+        """
+        due = []
+        while self.pending and self.pending[0] <= now:
+            due.append(self.pending.popleft())
+        return due
+    
+    def is_active(self, now: float) -> bool:
+        """Check whether RR-based beat timing is currently available."""
+        return self.last_arrival is not None and now - self.last_arrival <= self.max_gap
+    
+    def reset(self):
+        """Reset reconstructor state."""
+        self.sensor_time = 0.0
+        self.offset = None
+        self.last_arrival = None
+        self.last_beat_time = None
+        self.pending.clear()
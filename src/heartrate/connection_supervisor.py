@@ -0,0 +1,135 @@
+"""Automatic reconnection of a Polar H10 after link loss."""
+
+import asyncio
+import random
+from typing import Callable, Optional
+from .polar_h10 import PolarH10
+from ..utils import clock
+from ..utils.config import Config
+from ..utils.latency_histogram import LatencyHistogram
+
+
+class ConnectionSupervisor:
+    """
+    Reconnects a PolarH10 to its cached address when the link drops.
+    
+    PolarH10 reports link loss through bleak's disconnected callback, which
+    wakes the supervisor at once. The first attempt follows immediately,
+    reusing the client and its cached services; later attempts wait a
+    jittered, exponentially growing delay (initial_delay, doubling up to
+    max_delay, each randomized between half and the full value so straps
+    dropped together do not retry in lockstep). Every second failed attempt
+    builds a fresh client with full service discovery, in case the cache is
+    what fails. Once a link stays down for give_up_after seconds the
+    supervisor stops and reports the strap as lost.
+    
+    Time from link loss to restored notifications is recorded in recovery.
+    """
+    
+    def __init__(
+        self,
+        polar_h10: PolarH10,
+        on_status: Optional[Callable[[bool], None]] = None,
+        on_give_up: Optional[Callable[[], None]] = None,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Initialize connection supervisor.
+        
+        Args:
+            polar_h10: Connected client to supervise; its on_link_lost must call link_lost()
+            on_status: Called with False when the link drops and True when it is restored
+            on_give_up: Called when reconnection is abandoned
+            rng: Random source for the backoff jitter
+        """
+        self.polar_h10 = polar_h10
+        self.on_status = on_status
+        self.on_give_up = on_give_up
+        self.rng = rng or random.Random()
+        self.initial_delay = Config.BLE_RECONNECT_INITIAL_DELAY
+        self.max_delay = Config.BLE_RECONNECT_MAX_DELAY
+        self.attempt_timeout = Config.BLE_RECONNECT_TIMEOUT
+        self.give_up_after = Config.BLE_RECONNECT_GIVE_UP
+        
+        self.recovery = LatencyHistogram(min_latency=0.01, max_latency=600.0)
+        self.link_losses = 0
+        self.attempts = 0
+        self.lost_at: Optional[float] = None  # Clock time of the current outage, if any
+        self._lost = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start supervising (event loop thread)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    def stop(self):
+        """Stop supervising; an attempt in progress is cancelled."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+    
+    def link_lost(self):
+        """Report a dropped link (event loop thread, from the disconnected callback)."""
+        if self.lost_at is not None:
+            return
+        self.lost_at = clock.now()
+        self.link_losses += 1
+        self._lost.set()
+        if self.on_status:
+            self.on_status(False)
+    
+    def backoff_delay(self, failures: int) -> float:
+        """
+        Delay before the next attempt.
+        
+        Args:
+            failures: Failed attempts in this outage so far (>= 1)
+        
+        Returns:
+            Seconds, randomized between half and all of the exponential delay
+        """
+        delay = min(self.max_delay, self.initial_delay * (2.0 ** (failures - 1)))
+        return delay * (0.5 + 0.5 * self.rng.random())
+    
+    async def _run(self):
+        """Wait for link losses and reconnect."""
+        while True:
+            await self._lost.wait()
+            self._lost.clear()
+            if await self._recover():
+                continue
+            if self.on_give_up:
+                self.on_give_up()
+            self._task = None
+            return
+    
+    async def _recover(self) -> bool:
+        """Reconnect until it succeeds or the outage exceeds give_up_after."""
+        failures = 0
+        while clock.now() - self.lost_at < self.give_up_after:
+            self.attempts += 1
+            # Cached attempts are cheap; alternate with full rediscovery once they fail
+            use_cache = failures % 2 == 0
+            if await self.polar_h10.reconnect(use_cache=use_cache, timeout=self.attempt_timeout):
+                self.recovery.record(clock.now() - self.lost_at)
+                self.lost_at = None
+                if self.on_status:
+                    self.on_status(True)
+                return True
+            failures += 1
+            await asyncio.sleep(self.backoff_delay(failures))
+        return False
+    
+    def summary(self) -> dict:
+        """
+        Get reconnection statistics.
+        
+        Returns:
+            Dict with link_losses, attempts and time-to-recover statistics in ms
+        """
+        return {
+            'link_losses': self.link_losses,
+            'attempts': self.attempts,
+            'time_to_recover_ms': self.recovery.summary(),
+        }
@@ -0,0 +1,175 @@
+"""Persistent BLE discovery of Polar H10 devices."""
+
+import asyncio
+from bleak import BleakScanner
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+from ..utils import clock
+from ..utils.config import Config
+
+
+class DiscoveredDevice(NamedTuple):
+    """One entry of the device table."""
+    address: str
+    name: str
+    rssi: int  # dBm of the latest advertisement
+    last_seen: float  # Shared clock time of the latest advertisement
+
+
+class DeviceTableDiff(NamedTuple):
+    """Changes to the device table since the previous diff."""
+    added: List[DiscoveredDevice]
+    updated: List[DiscoveredDevice]
+    removed: List[str]  # Addresses
+
+
+class DeviceScanner:
+    """
+    Callback-driven BLE scanner that keeps a deduplicated device table.
+    
+    One scan stays active instead of restarting discover() every few
+    seconds, so no advertisements are missed between cycles. The OS filters
+    advertisements by service UUID; the detection callback only updates the
+    table entry of known addresses and checks the name once per new address.
+    Changes are batched and reported as a DeviceTableDiff at most every
+    emit_interval seconds, and only when something changed: a new device,
+    a name change, an RSSI change of at least rssi_threshold dB, or a device
+    not heard from for device_timeout seconds.
+    """
+    
+    def __init__(
+        self,
+        on_changes: Callable[[DeviceTableDiff], None],
+        device_name: str = "Polar H10",
+        service_uuids: Optional[Sequence[str]] = None,
+        scanner_factory: Optional[Callable[..., BleakScanner]] = None
+    ):
+        """
+        Initialize device scanner.
+        
+        Args:
+            on_changes: Called with each non-empty DeviceTableDiff on the event loop thread
+            device_name: Name substring a device must advertise (case-insensitive)
+            service_uuids: Advertised services to scan for (default: Heart Rate Service)
+            scanner_factory: Creates the scanner from BleakScanner's keyword
+                arguments (default: BleakScanner); a fake can be injected for testing
+        """
+        self.on_changes = on_changes
+        self.device_name = device_name.lower()
+        self.service_uuids = list(service_uuids or [Config.POLAR_H10_SERVICE_UUID])
+        self.scanner_factory = scanner_factory or BleakScanner
+        self.emit_interval = Config.BLE_SCAN_EMIT_INTERVAL
+        self.device_timeout = Config.BLE_DEVICE_TIMEOUT
+        self.rssi_threshold = Config.BLE_RSSI_CHANGE_THRESHOLD
+        
+        self.scanner: Optional[BleakScanner] = None
+        self.devices: Dict[str, DiscoveredDevice] = {}
+        self.ble_devices: Dict[str, object] = {}  # Latest bleak BLEDevice per table entry, for connecting
+        self.ignored: set = set()  # Addresses whose advertised name does not match
+        self._reported_rssi: Dict[str, int] = {}  # RSSI last sent to on_changes
+        self._added: Dict[str, DiscoveredDevice] = {}
+        self._updated: Dict[str, DiscoveredDevice] = {}
+        self._flush_handle = None
+    
+    @property
+    def is_scanning(self) -> bool:
+        """Whether a scan is active."""
+        return self.scanner is not None
+    
+    async def start(self) -> bool:
+        """
+        Start scanning (no-op if already scanning).
+        
+        Returns:
+            True if the scan is active
+        """
+        if self.scanner is not None:
+            return True
+        try:
+            self.scanner = self.scanner_factory(
+                detection_callback=self._on_detection, service_uuids=self.service_uuids
+            )
+            await self.scanner.start()
+            self._schedule_flush()
+            return True
+        except Exception as e:
+            print(f"Error starting BLE scan: {e}")
+            self.scanner = None
+            return False
+    
+    async def stop(self):
+        """Stop scanning; the device table is kept."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        scanner, self.scanner = self.scanner, None
+        if scanner is None:
+            return
+        try:
+            await scanner.stop()
+        except Exception as e:
+            print(f"Error stopping BLE scan: {e}")
+    
+    def _on_detection(self, device, advertisement_data):
+        """Handle one advertisement from bleak's detection callback."""
+        address = device.address
+        if address in self.ignored:
+            return
+        entry = self.devices.get(address)
+        name = advertisement_data.local_name or device.name or (entry.name if entry else "")
+        rssi = advertisement_data.rssi
+        
+        if entry is None:
+            if not name:
+                # Passive advertisements may omit the name; decide on a later one
+                return
+            if self.device_name not in name.lower():
+                self.ignored.add(address)
+                return
+            entry = DiscoveredDevice(address, name, rssi, clock.now())
+            self.devices[address] = entry
+            self.ble_devices[address] = device
+            self._reported_rssi[address] = rssi
+            self._added[address] = entry
+            return
+        
+        entry = DiscoveredDevice(address, name, rssi, clock.now())
+        previous = self.devices[address]
+        self.devices[address] = entry
+        self.ble_devices[address] = device
+        if address in self._added:
+            self._added[address] = entry
+        elif name != previous.name or abs(rssi - self._reported_rssi[address]) >= self.rssi_threshold:
+            self._reported_rssi[address] = rssi
+            self._updated[address] = entry
+    
+    def _schedule_flush(self):
+        """Run the next flush after emit_interval on the scanner's event loop."""
+        self._flush_handle = asyncio.get_running_loop().call_later(self.emit_interval, self._flush)
+    
+    def _flush(self):
+        """Expire silent devices and report pending changes."""
+        self._schedule_flush()
+        now = clock.now()
+        expired = [
+            address for address, entry in self.devices.items()
+            if now - entry.last_seen > self.device_timeout
+        ]
+        removed = []
+        for address in expired:
+            del self.devices[address]
+            del self.ble_devices[address]
+            del self._reported_rssi[address]
+            self._updated.pop(address, None)
+            # A device that came and went within one interval was never reported
+            if self._added.pop(address, None) is None:
+                removed.append(address)
+        
+        if not (self._added or self._updated or removed):
+            return
+        diff = DeviceTableDiff(list(self._added.values()), list(self._updated.values()), removed)
+        self._added.clear()
+        self._updated.clear()
+        try:
+            self.on_changes(diff)
+        except Exception as e:
+            print(f"Error in device table callback: {e}")
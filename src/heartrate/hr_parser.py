@@ -1,12 +1,103 @@
 """Heart rate data parsing and processing."""
 
-from typing import Optional
-from collections import deque
-import time
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+from .hrv import HRVAnalyzer
+from ..utils import clock
+from ..utils.config import Config
+from ..utils.timeseries import TimeSeries
+
+
+class HeartRateMeasurement(NamedTuple):
+    """Decoded Heart Rate Measurement characteristic (0x2A37)."""
+    
+    bpm: int
+    sensor_contact: Optional[bool]  # None if the sensor does not report contact
+    energy_expended: Optional[int]  # Kilojoules, None if not included
+    rr_intervals: Tuple[float, ...]  # Beat-to-beat intervals in seconds, oldest first
+
+
+# Heart Rate Measurement flag bits (Bluetooth Heart Rate Service 1.0)
+HRM_FLAG_UINT16_BPM = 0x01
+HRM_FLAG_CONTACT_DETECTED = 0x02
+HRM_FLAG_CONTACT_SUPPORTED = 0x04
+HRM_FLAG_ENERGY_EXPENDED = 0x08
+HRM_FLAG_RR_INTERVALS = 0x10
+
+RR_INTERVAL_RESOLUTION = 1.0 / 1024.0  # Seconds per RR-interval unit
+
+
+def parse_heart_rate_measurement(data: bytes) -> HeartRateMeasurement:
+    """
+    Decode a Heart Rate Measurement notification.
+    
+    Layout: flags (1 byte), heart rate (uint8 or uint16), energy expended
+    (uint16, if flag bit 3), then any number of RR intervals (uint16 in
+    1/1024 s, if flag bit 4). All multi-byte fields are little-endian.
+    
+    Args:
+        data: Notification payload
+    
+    Returns:
+        Decoded measurement
+    
+    Raises:
+        ValueError: If the payload is shorter than its flags require
+    """
+    if len(data) < 2:
+        raise ValueError(f"Heart rate measurement too short ({len(data)} bytes)")
+    
+    flags = data[0]
+    offset = 1
+    
+    if flags & HRM_FLAG_UINT16_BPM:
+        if len(data) < 3:
+            raise ValueError("Heart rate measurement truncated in 16-bit heart rate")
+        bpm = int.from_bytes(data[1:3], byteorder='little')
+        offset = 3
+    else:
+        bpm = data[1]
+        offset = 2
+    
+    sensor_contact = None
+    if flags & HRM_FLAG_CONTACT_SUPPORTED:
+        sensor_contact = bool(flags & HRM_FLAG_CONTACT_DETECTED)
+    
+    energy_expended = None
+    if flags & HRM_FLAG_ENERGY_EXPENDED:
+        if len(data) < offset + 2:
+            raise ValueError("Heart rate measurement truncated in energy expended")
+        energy_expended = int.from_bytes(data[offset:offset + 2], byteorder='little')
+        offset += 2
+    
+    rr_intervals = ()
+    if flags & HRM_FLAG_RR_INTERVALS:
+        # A trailing odd byte is not a complete interval and is ignored
+        count = (len(data) - offset) // 2
+        rr_intervals = tuple(
+            int.from_bytes(data[offset + 2 * i:offset + 2 * i + 2], byteorder='little') * RR_INTERVAL_RESOLUTION
+            for i in range(count)
+        )
+    
+    return HeartRateMeasurement(bpm, sensor_contact, energy_expended, rr_intervals)
+
+
+class HeartRateSample(NamedTuple):
+    """One heart rate notification, as handed from the BLE thread to the UI."""
+    
+    timestamp: float  # clock.now() when the notification arrived
+    bpm: int
+    rr_intervals: Tuple[float, ...] = ()  # Beat-to-beat intervals in seconds
 
 
 class HeartRateParser:
-    """Parses and processes heart rate data."""
+    """
+    Parses and processes heart rate data.
+    
+    Values are kept with their arrival times in a TimeSeries (the last
+    Config.HR_HISTORY_SIZE of them); the smoothed BPM is its rolling mean over
+    the last smoothing_window values. RR intervals feed HRVAnalyzer for
+    windowed HRV statistics.
+    """
     
     def __init__(self, smoothing_window: int = 5):
         """
@@ -16,31 +107,52 @@ class HeartRateParser:
             smoothing_window: Number of recent values to average for smoothing
         """
         self.smoothing_window = smoothing_window
-        self.recent_values = deque(maxlen=smoothing_window)
+        self.history = TimeSeries(max(Config.HR_HISTORY_SIZE, smoothing_window))
+        self.smoothed = self.history.add_window(count=smoothing_window)
         self.current_bpm: Optional[int] = None
         self.last_update_time: Optional[float] = None
+        self.hrv = HRVAnalyzer()
     
-    def update(self, heart_rate: int) -> int:
+    def update(self, heart_rate: int, timestamp: Optional[float] = None) -> int:
         """
         Update with new heart rate value.
         
         Args:
             heart_rate: Raw heart rate value (beats per minute)
+            timestamp: When the value arrived (default: clock.now())
         
         Returns:
             Smoothed heart rate value
         """
-        self.recent_values.append(heart_rate)
-        self.last_update_time = time.time()
+        self.last_update_time = clock.now() if timestamp is None else timestamp
+        self.history.append(self.last_update_time, heart_rate)
         
-        # Calculate smoothed average
-        if len(self.recent_values) > 0:
-            self.current_bpm = int(sum(self.recent_values) / len(self.recent_values))
-        else:
-            self.current_bpm = heart_rate
+        # Rolling mean of the last smoothing_window values
+        self.current_bpm = int(self.smoothed.mean)
         
         return self.current_bpm
     
+    def add_rr_intervals(self, rr_intervals: Sequence[float]) -> int:
+        """
+        Add beat-to-beat intervals to the HRV statistics.
+        
+        Args:
+            rr_intervals: RR intervals in seconds, oldest first
+        
+        Returns:
+            Number of beats accepted (the rest were rejected as artifacts)
+        """
+        return self.hrv.add_rr_intervals(rr_intervals)
+    
+    def get_hrv(self) -> Dict[float, Dict[str, float]]:
+        """
+        Get HRV statistics for each configured window.
+        
+        Returns:
+            Dict keyed by window duration in seconds (see HRVAnalyzer.summary)
+        """
+        return self.hrv.summary()
+    
     def get_bpm(self) -> Optional[int]:
         """
         Get current BPM value.
@@ -62,12 +174,13 @@ class HeartRateParser:
         
         return 60.0 / self.current_bpm
     
-    def is_stale(self, timeout: float = 5.0) -> bool:
+    def is_stale(self, timeout: float = 5.0, current_time: Optional[float] = None) -> bool:
         """
         Check if heart rate data is stale.
         
         Args:
             timeout: Timeout in seconds
+            current_time: Current time (default: clock.now())
         
         Returns:
             True if data is stale (no updates within timeout)
@@ -75,11 +188,14 @@ class HeartRateParser:
         if self.last_update_time is None:
             return True
         
-        return (time.time() - self.last_update_time) > timeout
+        if current_time is None:
+            current_time = clock.now()
+        return (current_time - self.last_update_time) > timeout
     
     def reset(self):
         """Reset parser state."""
-        self.recent_values.clear()
+        self.history.clear()
         self.current_bpm = None
         self.last_update_time = None
+        self.hrv.reset()
 
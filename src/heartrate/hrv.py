@@ -0,0 +1,232 @@
+"""Incremental heart rate variability statistics over sliding time windows."""
+
+import math
+import numpy as np
+from collections import deque
+from typing import Deque, Dict, Optional, Sequence
+from ..utils.config import Config
+
+# RR intervals are kept in the H10's native 1/1024 s ticks, so the running
+# sums are exact integers and do not drift over hour-long sessions
+TICKS_PER_SECOND = 1024
+MS_PER_TICK = 1000.0 / TICKS_PER_SECOND
+NN50_TICKS = 50.0 / MS_PER_TICK
+
+
+class _WindowStats:
+    """Running sums and min/max candidates for one window over the shared beat buffer."""
+    
+    def __init__(self, duration: float):
+        """
+        Initialize window statistics.
+        
+        Args:
+            duration: Window length in seconds
+        """
+        self.duration = duration
+        self.tail = 0  # Sequence number of the oldest beat in the window
+        self.count = 0
+        self.rr_sum = 0
+        self.rr_sq_sum = 0
+        self.diff_count = 0
+        self.diff_sq_sum = 0
+        self.nn50_count = 0
+        # Sequence numbers with increasing / decreasing RR (front is the min / max)
+        self.min_candidates: Deque[int] = deque()
+        self.max_candidates: Deque[int] = deque()
+
+
+class HRVAnalyzer:
+    """
+    RMSSD, SDNN, pNN50 and mean/min/max heart rate over several time windows.
+    
+    Accepted beats go into one fixed-size NumPy ring buffer sized for the
+    longest window. Each window keeps running sums over its part of the
+    buffer and monotonic queues for the RR extremes, so adding a beat is O(1)
+    (amortized) per window and summary() never walks the history.
+    
+    Beats outside the physiological range, or deviating from the median of
+    the last accepted beats by more than artifact_threshold, are rejected as
+    artifacts or ectopic beats. A rejected beat also breaks the successive
+    difference chain, so RMSSD and pNN50 only use pairs of normal beats.
+    """
+    
+    MIN_RR = 60.0 / 220.0
+    MAX_RR = 60.0 / 30.0
+    REFERENCE_BEATS = 5
+    
+    def __init__(self, windows: Optional[Sequence[float]] = None, artifact_threshold: Optional[float] = None):
+        """
+        Initialize HRV analyzer.
+        
+        Args:
+            windows: Window durations in seconds (default from config)
+            artifact_threshold: Maximum relative deviation from the reference RR (default from config)
+        """
+        self.windows = [_WindowStats(duration) for duration in (windows or Config.HRV_WINDOWS)]
+        self.artifact_threshold = Config.HRV_ARTIFACT_THRESHOLD if artifact_threshold is None else artifact_threshold
+        
+        longest = max(window.duration for window in self.windows)
+        self.capacity = int(math.ceil(longest / self.MIN_RR)) + 2
+        self.beat_times = np.zeros(self.capacity, dtype=np.float64)
+        self.rr_ticks = np.zeros(self.capacity, dtype=np.int64)
+        self.diff_sq = np.zeros(self.capacity, dtype=np.int64)
+        self.has_diff = np.zeros(self.capacity, dtype=bool)
+        self.is_nn50 = np.zeros(self.capacity, dtype=bool)
+        self.head = 0  # Sequence number of the next beat
+        
+        self.sensor_time = 0.0
+        self.reference: Deque[int] = deque(maxlen=self.REFERENCE_BEATS)
+        self.previous_ticks: Optional[int] = None  # Last beat, if it was accepted
+        self.accepted = 0
+        self.rejected = 0
+        self.consecutive_rejections = 0
+    
+    def add_rr(self, rr: float, beat_time: Optional[float] = None) -> bool:
+        """
+        Add one RR interval.
+        
+        Args:
+            rr: RR interval in seconds
+            beat_time: Time of the beat ending the interval (default: sum of all RR intervals)
+        
+        Returns:
+            True if the beat was accepted, False if rejected as an artifact
+        """
+        self.sensor_time += rr
+        if beat_time is None:
+            beat_time = self.sensor_time
+        
+        ticks = int(round(rr * TICKS_PER_SECOND))
+        if not self._is_normal(rr, ticks):
+            self.rejected += 1
+            self.previous_ticks = None
+            self.consecutive_rejections += 1
+            if self.consecutive_rejections >= self.REFERENCE_BEATS:
+                # The rhythm itself changed: learn a new reference
+                self.reference.clear()
+            return False
+        self.consecutive_rejections = 0
+        self.reference.append(ticks)
+        self.accepted += 1
+        
+        seq = self.head
+        slot = seq % self.capacity
+        for window in self.windows:
+            # Expire by time, and never let a window outgrow the buffer
+            while window.count and (
+                self.beat_times[window.tail % self.capacity] <= beat_time - window.duration
+                or window.tail <= seq - self.capacity
+            ):
+                self._evict(window)
+        
+        has_diff = self.previous_ticks is not None
+        diff = ticks - self.previous_ticks if has_diff else 0
+        self.beat_times[slot] = beat_time
+        self.rr_ticks[slot] = ticks
+        self.diff_sq[slot] = diff * diff
+        self.has_diff[slot] = has_diff
+        self.is_nn50[slot] = has_diff and abs(diff) > NN50_TICKS
+        self.head = seq + 1
+        self.previous_ticks = ticks
+        
+        for window in self.windows:
+            if window.count == 0:
+                window.tail = seq
+            window.count += 1
+            window.rr_sum += ticks
+            window.rr_sq_sum += ticks * ticks
+            if has_diff:
+                window.diff_count += 1
+                window.diff_sq_sum += diff * diff
+                window.nn50_count += int(self.is_nn50[slot])
+            while window.min_candidates and self.rr_ticks[window.min_candidates[-1] % self.capacity] >= ticks:
+                window.min_candidates.pop()
+            window.min_candidates.append(seq)
+            while window.max_candidates and self.rr_ticks[window.max_candidates[-1] % self.capacity] <= ticks:
+                window.max_candidates.pop()
+            window.max_candidates.append(seq)
+        return True
+    
+    def add_rr_intervals(self, rr_intervals: Sequence[float]) -> int:
+        """
+        Add several RR intervals, oldest first.
+        
+        Returns:
+            Number of accepted beats
+        """
+        return sum(self.add_rr(rr) for rr in rr_intervals)
+    
+    def _is_normal(self, rr: float, ticks: int) -> bool:
+        """Check a beat against the physiological range and the recent median."""
+        if rr < self.MIN_RR or rr > self.MAX_RR:
+            return False
+        if len(self.reference) < self.REFERENCE_BEATS:
+            return True
+        reference = sorted(self.reference)[self.REFERENCE_BEATS // 2]
+        return abs(ticks - reference) <= self.artifact_threshold * reference
+    
+    def _evict(self, window: _WindowStats):
+        """Remove the oldest beat from a window."""
+        seq = window.tail
+        slot = seq % self.capacity
+        ticks = int(self.rr_ticks[slot])
+        window.count -= 1
+        window.rr_sum -= ticks
+        window.rr_sq_sum -= ticks * ticks
+        if self.has_diff[slot]:
+            window.diff_count -= 1
+            window.diff_sq_sum -= int(self.diff_sq[slot])
+            window.nn50_count -= int(self.is_nn50[slot])
+        if window.min_candidates and window.min_candidates[0] == seq:
+            window.min_candidates.popleft()
+        if window.max_candidates and window.max_candidates[0] == seq:
+            window.max_candidates.popleft()
+        window.tail = seq + 1
+    
+    def _window_summary(self, window: _WindowStats) -> Dict[str, float]:
+        """Statistics of one window from its running sums."""
+        count = window.count
+        if count == 0:
+            return {'beats': 0}
+        
+        mean_ticks = window.rr_sum / count
+        summary = {
+            'beats': count,
+            'mean_rr': mean_ticks * MS_PER_TICK,
+            'mean_hr': 60.0 * TICKS_PER_SECOND / mean_ticks,
+            'min_hr': 60.0 * TICKS_PER_SECOND / int(self.rr_ticks[window.max_candidates[0] % self.capacity]),
+            'max_hr': 60.0 * TICKS_PER_SECOND / int(self.rr_ticks[window.min_candidates[0] % self.capacity]),
+            'sdnn': 0.0,
+            'rmssd': 0.0,
+            'pnn50': 0.0,
+        }
+        if count > 1:
+            # Integer sums keep this exact; only the final division is rounded
+            variance = (window.rr_sq_sum * count - window.rr_sum * window.rr_sum) / (count * (count - 1))
+            summary['sdnn'] = math.sqrt(max(0.0, variance)) * MS_PER_TICK
+        if window.diff_count:
+            summary['rmssd'] = math.sqrt(window.diff_sq_sum / window.diff_count) * MS_PER_TICK
+            summary['pnn50'] = 100.0 * window.nn50_count / window.diff_count
+        return summary
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get statistics for every window.
+        
+        Returns:
+            Dict keyed by window duration in seconds, each with beats, mean_rr
+            (ms), mean_hr, min_hr, max_hr (BPM), sdnn, rmssd (ms) and pnn50 (%)
+        """
+        return {window.duration: self._window_summary(window) for window in self.windows}
+    
+    def reset(self):
+        """Reset all statistics."""
+        self.windows = [_WindowStats(window.duration) for window in self.windows]
+        self.head = 0
+        self.sensor_time = 0.0
+        self.reference.clear()
+        self.previous_ticks = None
+        self.accepted = 0
+        self.rejected = 0
+        self.consecutive_rejections = 0
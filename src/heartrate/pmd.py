@@ -0,0 +1,210 @@
+"""Polar Measurement Data (PMD) protocol: stream control and frame decoding."""
+
+import math
+import struct
+import numpy as np
+from typing import Dict, NamedTuple, Tuple
+
+# Measurement types
+PMD_ECG = 0x00
+PMD_PPG = 0x01
+PMD_ACC = 0x02
+PMD_PPI = 0x03
+PMD_GYRO = 0x05
+PMD_MAG = 0x06
+
+# Control point operations
+PMD_OP_GET_SETTINGS = 0x01
+PMD_OP_START = 0x02
+PMD_OP_STOP = 0x03
+PMD_CONTROL_RESPONSE = 0xF0
+
+# Setting types in start requests
+PMD_SETTING_SAMPLE_RATE = 0x00
+PMD_SETTING_RESOLUTION = 0x01
+PMD_SETTING_RANGE = 0x02
+
+PMD_HEADER_SIZE = 10  # Type (1) + timestamp (8) + frame type (1)
+PMD_COMPRESSED_FLAG = 0x80
+# Sensor timestamps count nanoseconds from 2000-01-01
+PMD_NS_PER_SECOND = 1_000_000_000
+
+# (measurement type, frame type) -> (channels, bytes per sample) of uncompressed frames
+FRAME_LAYOUTS: Dict[Tuple[int, int], Tuple[int, int]] = {
+    (PMD_ECG, 0x00): (1, 3),
+    (PMD_ACC, 0x00): (3, 1),
+    (PMD_ACC, 0x01): (3, 2),
+    (PMD_ACC, 0x02): (3, 3),
+}
+
+
+class PMDFrame(NamedTuple):
+    """One decoded PMD data notification."""
+    measurement_type: int
+    timestamp: float  # Sensor time of the last sample in seconds
+    samples: np.ndarray  # (N, channels) int32: µV for ECG, mG for ACC
+    sample_times: np.ndarray  # (N,) sensor time of each sample in seconds
+
+
+def build_start_command(measurement_type: int, sample_rate: int, resolution: int, measurement_range: int = None) -> bytes:
+    """
+    Build a control point request that starts a stream.
+    
+    Args:
+        measurement_type: PMD_ECG, PMD_ACC, ...
+        sample_rate: Samples per second (ECG: 130, ACC: 25-200)
+        resolution: Bits per sample (ECG: 14, ACC: 16)
+        measurement_range: Range in G (ACC only)
+    
+    Returns:
+        Request bytes
+    """
+    command = bytearray([PMD_OP_START, measurement_type])
+    settings = [(PMD_SETTING_SAMPLE_RATE, sample_rate), (PMD_SETTING_RESOLUTION, resolution)]
+    if measurement_range is not None:
+        settings.append((PMD_SETTING_RANGE, measurement_range))
+    for setting, value in settings:
+        # Setting type, value count, little-endian uint16 value
+        command += struct.pack('<BBH', setting, 1, value)
+    return bytes(command)
+
+
+def build_stop_command(measurement_type: int) -> bytes:
+    """Build a control point request that stops a stream."""
+    return bytes([PMD_OP_STOP, measurement_type])
+
+
+def parse_control_response(data: bytes) -> Tuple[int, int, int]:
+    """
+    Parse a control point response.
+    
+    Returns:
+        (operation, measurement type, status); status 0 means success
+    
+    Raises:
+        ValueError: If data is not a control point response
+    """
+    if len(data) < 4 or data[0] != PMD_CONTROL_RESPONSE:
+        raise ValueError(f"Not a PMD control response: {bytes(data).hex()}")
+    return data[1], data[2], data[3]
+
+
+def _signed(values: np.ndarray, bits: int) -> np.ndarray:
+    """Sign-extend unsigned integers of the given bit width."""
+    sign = 1 << (bits - 1)
+    return (values ^ sign) - sign
+
+
+def _unpack_samples(payload: np.ndarray, channels: int, sample_bytes: int) -> np.ndarray:
+    """Little-endian signed integers of sample_bytes each into an (N, channels) int32 array."""
+    count = len(payload) // (channels * sample_bytes)
+    raw = payload[:count * channels * sample_bytes].reshape(count * channels, sample_bytes).astype(np.int32)
+    values = np.zeros(count * channels, dtype=np.int32)
+    for byte in range(sample_bytes):
+        values |= raw[:, byte] << (8 * byte)
+    return _signed(values, 8 * sample_bytes).reshape(count, channels)
+
+
+def _unpack_deltas(payload: np.ndarray, channels: int, sample_bytes: int) -> np.ndarray:
+    """
+    Decode a delta-compressed payload.
+    
+    The payload starts with one full reference sample, followed by blocks of
+    [delta bit width, sample count, packed deltas]. Deltas are signed,
+    packed LSB-first, interleaved by channel, and accumulate from the
+    reference.
+    """
+    reference_size = channels * sample_bytes
+    blocks = [_unpack_samples(payload[:reference_size], channels, sample_bytes)]
+    offset = reference_size
+    while offset + 2 <= len(payload):
+        width = int(payload[offset])
+        count = int(payload[offset + 1])
+        offset += 2
+        if width == 0 or count == 0:
+            break
+        size = int(math.ceil(count * channels * width / 8))
+        bits = np.unpackbits(payload[offset:offset + size], bitorder='little')[:count * channels * width]
+        offset += size
+        if len(bits) < count * channels * width:
+            raise ValueError("Truncated PMD delta block")
+        # Each row of bits is one delta, least significant bit first
+        weights = (1 << np.arange(width, dtype=np.int64))
+        deltas = bits.reshape(count * channels, width).astype(np.int64) @ weights
+        blocks.append(_signed(deltas, width).astype(np.int32).reshape(count, channels))
+    return np.cumsum(np.concatenate(blocks), axis=0, dtype=np.int32)
+
+
+def decode_pmd_frame(data: bytes, sample_rate: float) -> PMDFrame:
+    """
+    Decode a PMD data notification.
+    
+    Args:
+        data: Notification payload
+        sample_rate: Stream sample rate (used to timestamp the samples)
+    
+    Returns:
+        Decoded frame
+    
+    Raises:
+        ValueError: If the frame is truncated or of an unsupported type
+    """
+    if len(data) < PMD_HEADER_SIZE:
+        raise ValueError(f"PMD frame too short: {len(data)} bytes")
+    measurement_type = data[0]
+    timestamp_ns = int.from_bytes(data[1:9], 'little')
+    frame_type = data[9]
+    
+    layout = FRAME_LAYOUTS.get((measurement_type, frame_type & ~PMD_COMPRESSED_FLAG))
+    if layout is None:
+        raise ValueError(f"Unsupported PMD frame: measurement {measurement_type}, frame type {frame_type:#x}")
+    channels, sample_bytes = layout
+    
+    payload = np.frombuffer(bytes(data), dtype=np.uint8, offset=PMD_HEADER_SIZE)
+    if frame_type & PMD_COMPRESSED_FLAG:
+        samples = _unpack_deltas(payload, channels, sample_bytes)
+    else:
+        samples = _unpack_samples(payload, channels, sample_bytes)
+    
+    timestamp = timestamp_ns / PMD_NS_PER_SECOND
+    sample_times = timestamp - np.arange(len(samples) - 1, -1, -1, dtype=np.float64) / sample_rate
+    return PMDFrame(measurement_type, timestamp, samples, sample_times)
+
+
+def encode_pmd_frame(measurement_type: int, timestamp: float, samples: np.ndarray, compressed_width: int = 0) -> bytes:
+    """
+    Encode samples as a PMD data notification (for fake devices and benchmarks).
+    
+    Args:
+        measurement_type: PMD_ECG or PMD_ACC
+        timestamp: Sensor time of the last sample in seconds
+        samples: (N, channels) integers
+        compressed_width: Delta bit width for a compressed frame (0: uncompressed)
+    
+    Returns:
+        Notification bytes
+    """
+    samples = np.asarray(samples, dtype=np.int64).reshape(len(samples), -1)
+    channels = samples.shape[1]
+    frame_type = {PMD_ECG: 0x00, PMD_ACC: 0x01}[measurement_type]
+    sample_bytes = FRAME_LAYOUTS[(measurement_type, frame_type)][1]
+    
+    def pack(values: np.ndarray) -> bytes:
+        unsigned = values.astype(np.int64) & ((1 << (8 * sample_bytes)) - 1)
+        shifts = 8 * np.arange(sample_bytes)
+        return ((unsigned.reshape(-1, 1) >> shifts) & 0xFF).astype(np.uint8).tobytes()
+    
+    if compressed_width:
+        frame_type |= PMD_COMPRESSED_FLAG
+        payload = pack(samples[0])
+        deltas = np.diff(samples, axis=0)
+        for start in range(0, len(deltas), 255):
+            block = deltas[start:start + 255]
+            unsigned = block.reshape(-1) & ((1 << compressed_width) - 1)
+            bits = ((unsigned.reshape(-1, 1) >> np.arange(compressed_width)) & 1).astype(np.uint8)
+            payload += bytes([compressed_width, len(block)]) + np.packbits(bits.reshape(-1), bitorder='little').tobytes()
+    else:
+        payload = pack(samples.reshape(-1))
+    
+    header = bytes([measurement_type]) + int(round(timestamp * PMD_NS_PER_SECOND)).to_bytes(8, 'little') + bytes([frame_type])
+    return header + payload
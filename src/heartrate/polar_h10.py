@@ -2,7 +2,12 @@
 
 import asyncio
 from bleak import BleakScanner, BleakClient
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, Tuple
+from .hr_parser import HeartRateMeasurement, parse_heart_rate_measurement
+from .pmd import (
+    PMD_ACC, PMD_ECG, PMDFrame, build_start_command, build_stop_command,
+    decode_pmd_frame, parse_control_response
+)
 from ..utils.config import Config
 
 
@@ -12,18 +17,44 @@ class PolarH10:
     # BLE Service and Characteristic UUIDs
     HEART_RATE_SERVICE_UUID = Config.POLAR_H10_SERVICE_UUID
     HEART_RATE_CHARACTERISTIC_UUID = Config.POLAR_H10_CHARACTERISTIC_UUID
+    PMD_CONTROL_UUID = Config.POLAR_PMD_CONTROL_UUID
+    PMD_DATA_UUID = Config.POLAR_PMD_DATA_UUID
+    # Services resolved on connect (backends that support it skip the others)
+    SERVICE_UUIDS = [Config.POLAR_H10_SERVICE_UUID, Config.POLAR_PMD_SERVICE_UUID]
     
-    def __init__(self, on_heart_rate: Optional[Callable[[int], None]] = None):
+    def __init__(
+        self,
+        on_heart_rate: Optional[Callable[[int], None]] = None,
+        on_measurement: Optional[Callable[[HeartRateMeasurement], None]] = None,
+        client_factory: Optional[Callable[..., BleakClient]] = None,
+        on_link_lost: Optional[Callable[[], None]] = None
+    ):
         """
         Initialize Polar H10 client.
         
         Args:
             on_heart_rate: Callback function called when heart rate data is received
+            on_measurement: Callback with the fully decoded measurement (RR intervals,
+                contact, energy expended), called from the bleak notification callback
+            client_factory: Creates the client from an address or BLEDevice and
+                BleakClient's keyword arguments (default: BleakClient); a fake
+                client with the same methods can be injected for testing
+            on_link_lost: Called on the event loop thread when the link drops
+                without disconnect() having been called
         """
+        self.client_factory = client_factory or BleakClient
         self.client: Optional[BleakClient] = None
         self.on_heart_rate = on_heart_rate
+        self.on_measurement = on_measurement
+        self.on_link_lost = on_link_lost
         self.is_connected = False
         self.device_address: Optional[str] = None
+        self._disconnecting = False
+        
+        # PMD streams by measurement type: (sample rate, frame callback, start command)
+        self._pmd_streams: Dict[int, Tuple[float, Callable[[PMDFrame], None], bytes]] = {}
+        self._pmd_subscribed = False
+        self._pmd_response: Optional[asyncio.Future] = None
     
     async def scan_for_device(self, device_name: str = "Polar H10", timeout: float = None) -> Optional[str]:
         """
@@ -83,12 +114,14 @@ class PolarH10:
             print(f"Error scanning for devices: {e}")
             return []
     
-    async def connect(self, address: Optional[str] = None) -> bool:
+    async def connect(self, address: Optional[str] = None, ble_device=None) -> bool:
         """
         Connect to Polar H10 device.
         
         Args:
             address: Device address (if None, uses previously scanned address)
+            ble_device: BLEDevice from a scan; connecting to it skips the
+                device lookup bleak otherwise runs for a bare address
         
         Returns:
             True if connected successfully
@@ -102,7 +135,13 @@ class PolarH10:
         
         try:
             print(f"Connecting to {address}...")
-            self.client = BleakClient(address)
+            self.device_address = address
+            self._disconnecting = False
+            self.client = self.client_factory(
+                ble_device or address,
+                disconnected_callback=self._on_client_disconnected,
+                services=self.SERVICE_UUIDS
+            )
             await self.client.connect()
             
             if self.client.is_connected:
@@ -118,22 +157,92 @@ class PolarH10:
                 
         except Exception as e:
             print(f"Error connecting to device: {e}")
+            # Not a dropped link: the attempt failed
+            self._disconnecting = True
+            await self._release_link()
             return False
     
-    async def _subscribe_to_heart_rate(self):
-        """Subscribe to heart rate characteristic notifications."""
-        if self.client is None or not self.client.is_connected:
-            return
+    async def reconnect(self, use_cache: bool = True, timeout: float = None) -> bool:
+        """
+        Re-establish a dropped link to the same device and restore notifications.
         
-        try:
-            # Enable notifications
-            await self.client.start_notify(
-                self.HEART_RATE_CHARACTERISTIC_UUID,
-                self._heart_rate_notification_handler
+        With use_cache the existing client object is reconnected and told to
+        reuse the services it resolved before (BlueZ), so there is neither a
+        device lookup nor a service discovery. Otherwise a new client is
+        created and services are discovered again.
+        
+        Args:
+            use_cache: Reuse the previous client and its cached services
+            timeout: Connection timeout in seconds (default: the client's)
+        
+        Returns:
+            True if connected and the heart rate notifications are restored
+        """
+        if self.client is None or self._disconnecting:
+            return False
+        if not use_cache:
+            self.client = self.client_factory(
+                self.device_address,
+                disconnected_callback=self._on_client_disconnected,
+                services=self.SERVICE_UUIDS
             )
-            print("Subscribed to heart rate notifications")
+        
+        kwargs = {'dangerous_use_bleak_cache': use_cache}
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        try:
+            await self.client.connect(**kwargs)
+            if not self.client.is_connected:
+                return False
+            self.is_connected = True
+            await self._subscribe_to_heart_rate()
+            
+            # The sensor forgets PMD streams with the link: start them again
+            streams = list(self._pmd_streams.items())
+            self._pmd_subscribed = False
+            for measurement_type, (sample_rate, on_frame, command) in streams:
+                await self._start_pmd_command(measurement_type, sample_rate, on_frame, command)
+            return True
         except Exception as e:
-            print(f"Error subscribing to heart rate: {e}")
+            print(f"Error reconnecting to {self.device_address}: {e}")
+            # A link without notifications is no use; the next attempt starts from scratch
+            await self._release_link()
+            return False
+    
+    async def _release_link(self):
+        """Drop the link after a failed (re)connection attempt."""
+        if self.client is not None and self.client.is_connected:
+            try:
+                await self.client.disconnect()
+            except Exception:
+                pass
+        self.is_connected = False
+    
+    def _on_client_disconnected(self, client):
+        """Handle bleak's disconnected callback (link loss or our own disconnect)."""
+        if client is not self.client:
+            return
+        self.is_connected = False
+        if not self._disconnecting and self.on_link_lost:
+            self.on_link_lost()
+    
+    async def _subscribe_to_heart_rate(self):
+        """
+        Subscribe to heart rate characteristic notifications.
+        
+        Raises:
+            RuntimeError: If the link is down
+            Exception: Whatever start_notify raised; the connection is useless without it
+        """
+        if self.client is None or not self.client.is_connected:
+            raise RuntimeError("Not connected")
+        
+        # Enable notifications
+        await self.client.start_notify(
+            self.HEART_RATE_CHARACTERISTIC_UUID,
+            self._heart_rate_notification_handler
+        )
+        print("Subscribed to heart rate notifications")
     
     def _heart_rate_notification_handler(self, sender: str, data: bytearray):
         """
@@ -146,36 +255,193 @@ class PolarH10:
         try:
             # Parse heart rate data according to BLE Heart Rate Profile
             # Format: Flags (1 byte) + Heart Rate Value (1-2 bytes)
-            if len(data) < 2:
-                return
-            
-            flags = data[0]
-            heart_rate_format = (flags & 0x01) == 0x01  # Bit 0: 0 = 8-bit, 1 = 16-bit
+            # + Energy Expended (2 bytes, optional) + RR intervals (2 bytes each, optional)
+            measurement = parse_heart_rate_measurement(data)
             
-            if heart_rate_format and len(data) >= 3:
-                # 16-bit heart rate value
-                heart_rate = int.from_bytes(data[1:3], byteorder='little')
-            else:
-                # 8-bit heart rate value
-                heart_rate = data[1]
-            
-            # Call callback if provided
+            # Call callbacks if provided
+            if self.on_measurement:
+                self.on_measurement(measurement)
             if self.on_heart_rate:
-                self.on_heart_rate(heart_rate)
+                self.on_heart_rate(measurement.bpm)
                 
         except Exception as e:
             print(f"Error parsing heart rate data: {e}")
     
-    async def disconnect(self):
-        """Disconnect from device."""
+    async def start_ecg_stream(self, on_frame: Callable[[PMDFrame], None]) -> bool:
+        """
+        Start raw ECG streaming (130 Hz, µV).
+        
+        Args:
+            on_frame: Called with each decoded PMDFrame on the event loop thread
+        
+        Returns:
+            True if the sensor started the stream
+        """
+        return await self.start_pmd_stream(
+            PMD_ECG, Config.POLAR_ECG_SAMPLE_RATE, Config.POLAR_ECG_RESOLUTION, on_frame
+        )
+    
+    async def start_acc_stream(self, on_frame: Callable[[PMDFrame], None], sample_rate: int = None) -> bool:
+        """
+        Start accelerometer streaming (x, y, z in mG).
+        
+        Args:
+            on_frame: Called with each decoded PMDFrame on the event loop thread
+            sample_rate: Samples per second (default from config)
+        
+        Returns:
+            True if the sensor started the stream
+        """
+        if sample_rate is None:
+            sample_rate = Config.POLAR_ACC_SAMPLE_RATE
+        return await self.start_pmd_stream(
+            PMD_ACC, sample_rate, Config.POLAR_ACC_RESOLUTION, on_frame, Config.POLAR_ACC_RANGE
+        )
+    
+    async def start_pmd_stream(
+        self,
+        measurement_type: int,
+        sample_rate: int,
+        resolution: int,
+        on_frame: Callable[[PMDFrame], None],
+        measurement_range: Optional[int] = None
+    ) -> bool:
+        """
+        Start a Polar Measurement Data stream.
+        
+        Args:
+            measurement_type: PMD_ECG, PMD_ACC, ...
+            sample_rate: Samples per second
+            resolution: Bits per sample
+            on_frame: Called with each decoded PMDFrame on the event loop thread
+            measurement_range: Range setting (ACC only)
+        
+        Returns:
+            True if the sensor started the stream
+        """
+        if self.client is None or not self.client.is_connected:
+            return False
+        command = build_start_command(measurement_type, sample_rate, resolution, measurement_range)
+        return await self._start_pmd_command(measurement_type, float(sample_rate), on_frame, command)
+    
+    async def _start_pmd_command(
+        self,
+        measurement_type: int,
+        sample_rate: float,
+        on_frame: Callable[[PMDFrame], None],
+        command: bytes
+    ) -> bool:
+        """Subscribe to PMD notifications if needed and send a start request."""
+        try:
+            if not self._pmd_subscribed:
+                await self.client.start_notify(self.PMD_CONTROL_UUID, self._pmd_control_handler)
+                await self.client.start_notify(self.PMD_DATA_UUID, self._pmd_data_handler)
+                self._pmd_subscribed = True
+            
+            # Registered first: data can arrive before the control response
+            self._pmd_streams[measurement_type] = (sample_rate, on_frame, command)
+            status = await self._pmd_request(command)
+            if status != 0:
+                self._pmd_streams.pop(measurement_type, None)
+                print(f"PMD stream {measurement_type} rejected (status {status})")
+                return False
+            print(f"Started PMD stream {measurement_type} at {sample_rate:g} Hz")
+            return True
+        except Exception as e:
+            self._pmd_streams.pop(measurement_type, None)
+            print(f"Error starting PMD stream: {e}")
+            return False
+    
+    async def stop_pmd_stream(self, measurement_type: int):
+        """
+        Stop a Polar Measurement Data stream.
+        
+        Args:
+            measurement_type: PMD_ECG, PMD_ACC, ...
+        """
+        if self._pmd_streams.pop(measurement_type, None) is None:
+            return
+        if self.client is None or not self.client.is_connected:
+            return
+        try:
+            await self._pmd_request(build_stop_command(measurement_type))
+        except Exception as e:
+            print(f"Error stopping PMD stream: {e}")
+    
+    async def _pmd_request(self, command: bytes) -> int:
+        """
+        Write a control point request and wait for its response.
+        
+        Returns:
+            Response status (0 = success)
+        """
+        self._pmd_response = asyncio.get_running_loop().create_future()
+        try:
+            await self.client.write_gatt_char(self.PMD_CONTROL_UUID, command, response=True)
+            _, _, status = await asyncio.wait_for(self._pmd_response, Config.POLAR_PMD_CONTROL_TIMEOUT)
+            return status
+        finally:
+            self._pmd_response = None
+    
+    def _pmd_control_handler(self, sender: str, data: bytearray):
+        """Handle a PMD control point response."""
+        try:
+            response = parse_control_response(data)
+        except ValueError as e:
+            print(f"Error parsing PMD control response: {e}")
+            return
+        if self._pmd_response is not None and not self._pmd_response.done():
+            self._pmd_response.set_result(response)
+    
+    def _pmd_data_handler(self, sender: str, data: bytearray):
+        """
+        Handle a PMD data notification.
+        
+        Runs on the event loop, so decoding is vectorized and any heavier
+        processing belongs to the frame callback's consumer.
+        """
+        if not data:
+            return
+        stream = self._pmd_streams.get(data[0])
+        if stream is None:
+            return
+        sample_rate, on_frame, _ = stream
+        try:
+            on_frame(decode_pmd_frame(data, sample_rate))
+        except ValueError as e:
+            print(f"Error decoding PMD frame: {e}")
+    
+    async def disconnect(self, link_only: bool = False):
+        """
+        Disconnect from device.
+        
+        Args:
+            link_only: Only drop the link (on exit): skip stopping notifications
+                and PMD streams, which costs a GATT round trip each and would
+                leave the strap connected if the exit budget ran out first.
+                The strap stops streaming once the link is gone.
+        """
+        # Our own disconnect must not look like a dropped link
+        self._disconnecting = True
         if self.client is not None and self.client.is_connected:
             try:
-                # Stop notifications first
-                try:
-                    await self.client.stop_notify(self.HEART_RATE_CHARACTERISTIC_UUID)
-                except Exception:
-                    # Ignore errors stopping notifications (device may have already disconnected)
-                    pass
+                if not link_only:
+                    # Stop notifications first
+                    try:
+                        await self.client.stop_notify(self.HEART_RATE_CHARACTERISTIC_UUID)
+                    except Exception:
+                        # Ignore errors stopping notifications (device may have already disconnected)
+                        pass
+                    
+                    # Stop PMD streams while the link is still up
+                    for measurement_type in list(self._pmd_streams):
+                        await self.stop_pmd_stream(measurement_type)
+                    if self._pmd_subscribed:
+                        for uuid in (self.PMD_DATA_UUID, self.PMD_CONTROL_UUID):
+                            try:
+                                await self.client.stop_notify(uuid)
+                            except Exception:
+                                pass
                 
                 # Disconnect
                 try:
@@ -190,6 +456,8 @@ class PolarH10:
             finally:
                 self.is_connected = False
                 self.client = None
+                self._pmd_streams.clear()
+                self._pmd_subscribed = False
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -0,0 +1,117 @@
+"""Streaming R-peak detection on raw ECG."""
+
+import numpy as np
+from typing import Optional
+from ..utils.ring_buffer import SampleRingBuffer
+
+
+class RPeakDetector:
+    """
+    Pan-Tompkins style R-peak detector for chunked ECG.
+    
+    Each chunk is appended to a ring buffer and the feature signal
+    (five-point derivative, squared, moving-window integrated) is computed
+    for the new samples plus enough history to cover the filters, all in
+    NumPy. A QRS complex is a run of samples above an adaptive threshold.
+    Its R peak is the largest deviation from the run's median in the raw
+    ECG. Runs still open at the end of a chunk are finished on the next one,
+    so chunk boundaries do not split or duplicate beats.
+    """
+    
+    INTEGRATION_WINDOW = 0.15  # Seconds, about one QRS width
+    REFRACTORY_PERIOD = 0.25  # Seconds; no beat follows another sooner (240 BPM)
+    LEARNING_PERIOD = 2.0  # Seconds of signal used to set the first threshold
+    THRESHOLD_FRACTION = 0.3  # Of the running QRS feature level
+    LEVEL_UPDATE = 0.125  # Weight of each new QRS in the running level
+    BUFFER_SECONDS = 5.0
+    
+    def __init__(self, sample_rate: float = 130.0):
+        """
+        Initialize R-peak detector.
+        
+        Args:
+            sample_rate: ECG sample rate in Hz
+        """
+        self.sample_rate = sample_rate
+        self.window = max(1, int(round(self.INTEGRATION_WINDOW * sample_rate)))
+        self.refractory = int(round(self.REFRACTORY_PERIOD * sample_rate))
+        # Derivative (4 samples) plus integration window of history per feature sample
+        self.context = self.window + 4
+        
+        capacity = int(self.BUFFER_SECONDS * sample_rate)
+        self.signal = SampleRingBuffer(capacity, np.float64)
+        self.times = SampleRingBuffer(capacity, np.float64)
+        self.scan_from = 0  # Absolute index from which QRS runs are still undecided
+        self.level: Optional[float] = None
+        self.last_peak: Optional[int] = None
+    
+    def _features(self, x: np.ndarray) -> np.ndarray:
+        """Integrated squared derivative; entry i covers x up to i (first context entries are partial)."""
+        derivative = np.zeros_like(x)
+        derivative[4:] = (2.0 * x[4:] + x[3:-1] - x[1:-3] - 2.0 * x[:-4]) / 8.0
+        cumulative = np.concatenate(([0.0], np.cumsum(derivative * derivative)))
+        integrated = cumulative[1:].copy()
+        integrated[self.window:] -= cumulative[1:-self.window]
+        return integrated / self.window
+    
+    def process(self, samples: np.ndarray, sample_times: np.ndarray) -> np.ndarray:
+        """
+        Add an ECG chunk and detect the R peaks it completes.
+        
+        Args:
+            samples: ECG samples (any unit, e.g. µV)
+            sample_times: Time of each sample in seconds
+        
+        Returns:
+            Times of newly detected R peaks, oldest first
+        """
+        self.signal.extend(np.asarray(samples, dtype=np.float64).reshape(-1))
+        self.times.extend(sample_times)
+        total = self.signal.total
+        
+        if self.level is None:
+            if total < self.LEARNING_PERIOD * self.sample_rate:
+                return np.empty(0)
+            start = self.signal.first_index
+            self.level = float(self._features(self.signal.get(start, total))[self.context:].max())
+            self.scan_from = start + self.context
+        
+        start = max(self.signal.first_index, self.scan_from - self.context)
+        x = self.signal.get(start, total)
+        features = self._features(x)
+        above = features > self.THRESHOLD_FRACTION * self.level
+        above[:self.scan_from - start] = False
+        
+        # Runs of samples above the threshold: [rise, fall)
+        edges = np.diff(above.astype(np.int8), prepend=0, append=0)
+        rises = np.flatnonzero(edges == 1)
+        falls = np.flatnonzero(edges == -1)
+        
+        peaks = []
+        self.scan_from = total
+        for rise, fall in zip(rises, falls):
+            if fall == len(x):
+                # Still rising or on the plateau: decide when it has ended
+                self.scan_from = start + rise
+                break
+            # The integrator lags the QRS by up to one window
+            begin = max(0, rise - self.window)
+            segment = x[begin:fall]
+            peak = begin + int(np.argmax(np.abs(segment - np.median(segment))))
+            absolute = start + peak
+            if self.last_peak is not None and absolute - self.last_peak < self.refractory:
+                continue
+            self.last_peak = absolute
+            peaks.append(absolute)
+            qrs_level = float(features[rise:fall].max())
+            self.level += self.LEVEL_UPDATE * (qrs_level - self.level)
+        
+        return np.array([self.times.get(peak, peak + 1)[0] for peak in peaks])
+    
+    def reset(self):
+        """Reset detector state."""
+        self.signal = SampleRingBuffer(self.signal.capacity, np.float64)
+        self.times = SampleRingBuffer(self.times.capacity, np.float64)
+        self.scan_from = 0
+        self.level = None
+        self.last_peak = None
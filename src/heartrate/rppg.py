@@ -0,0 +1,228 @@
+"""Remote photoplethysmography: pulse rate from the skin color of the face in the camera image."""
+
+import cv2
+import numpy as np
+from typing import Any, List, NamedTuple, Optional, Tuple
+from ..utils.config import Config
+from ..utils.timeseries import TimeSeries
+
+# MediaPipe Pose landmark indices of the face
+NOSE = 0
+LEFT_EYE = 2
+RIGHT_EYE = 5
+
+
+class RPPGEstimate(NamedTuple):
+    """One pulse rate estimate."""
+    timestamp: float  # Capture time of the newest frame used
+    bpm: float
+    snr: float  # dB: power at the pulse frequency and its harmonic over the rest of the band
+
+
+def face_rois(landmarks: Any, width: int, height: int) -> Optional[List[Tuple[int, int, int, int]]]:
+    """
+    Skin regions of the face from MediaPipe Pose landmarks.
+    
+    The forehead sits above the eyes and each cheek below its eye, all
+    sized by the distance between the eyes, so they scale with the face.
+    
+    Args:
+        landmarks: MediaPipe normalized pose landmarks
+        width: Frame width in pixels
+        height: Frame height in pixels
+    
+    Returns:
+        (x0, y0, x1, y1) pixel rectangles (forehead, left cheek, right cheek),
+        or None if the face is not visible or too small
+    """
+    points = []
+    for index in (LEFT_EYE, RIGHT_EYE, NOSE):
+        landmark = landmarks.landmark[index]
+        if landmark.visibility < 0.5:
+            return None
+        points.append((landmark.x * width, landmark.y * height))
+    (left_x, left_y), (right_x, right_y), _ = points
+    eye_distance = float(np.hypot(right_x - left_x, right_y - left_y))
+    if eye_distance < Config.RPPG_MIN_EYE_DISTANCE:
+        return None
+    
+    center_x, center_y = (left_x + right_x) / 2.0, (left_y + right_y) / 2.0
+    boxes = [
+        (center_x, center_y - 0.9 * eye_distance, 0.6 * eye_distance, 0.25 * eye_distance),
+        (left_x, left_y + 0.75 * eye_distance, 0.25 * eye_distance, 0.25 * eye_distance),
+        (right_x, right_y + 0.75 * eye_distance, 0.25 * eye_distance, 0.25 * eye_distance),
+    ]
+    rois = []
+    for x, y, half_width, half_height in boxes:
+        x0, y0 = max(0, int(x - half_width)), max(0, int(y - half_height))
+        x1, y1 = min(width, int(x + half_width)), min(height, int(y + half_height))
+        if x1 - x0 >= 2 and y1 - y0 >= 2:
+            rois.append((x0, y0, x1, y1))
+    return rois or None
+
+
+class RPPGEstimator:
+    """
+    Streaming pulse rate estimator using the POS method (Wang et al. 2017).
+    
+    Each frame contributes one sample: the mean color of the forehead and
+    cheek regions, which costs a few microseconds per region and is all
+    the per-frame work. Every update_interval seconds the last window
+    seconds are resampled to a uniform rate and projected onto the plane
+    orthogonal to the skin tone in sliding 1.6 s windows (overlap-added),
+    which cancels illumination and most motion changes. The pulse rate is
+    the largest spectral peak between min_bpm and max_bpm, refined by
+    parabolic interpolation; estimates with an SNR below min_snr are
+    withheld. All window and FFT steps are vectorized in NumPy.
+    
+    Samples are kept in a three-channel TimeSeries; a gap of more than max_gap
+    seconds without a face restarts the window.
+    """
+    
+    RESAMPLE_RATE = 30.0  # Hz of the uniform grid the spectrum is computed on
+    POS_WINDOW = 1.6  # Seconds per projection window (about one slow beat)
+    FFT_SIZE = 2048  # Zero-padded; 0.9 BPM bins at 30 Hz before interpolation
+    SNR_BANDWIDTH = 0.1  # Hz either side of the pulse frequency and its harmonic
+    
+    def __init__(self):
+        """Initialize estimator."""
+        self.window = Config.RPPG_WINDOW
+        self.min_window = Config.RPPG_MIN_WINDOW
+        self.update_interval = Config.RPPG_UPDATE_INTERVAL
+        self.min_bpm = Config.RPPG_MIN_BPM
+        self.max_bpm = Config.RPPG_MAX_BPM
+        self.min_snr = Config.RPPG_MIN_SNR
+        self.max_gap = Config.RPPG_MAX_GAP
+        
+        # Twice the nominal frame rate of samples, so a faster camera still fills the window
+        capacity = int(np.ceil(2 * self.window * Config.VIDEO_FPS))
+        self.samples = TimeSeries(capacity, channels=3)  # R, G, B
+        self.last_estimate_time: Optional[float] = None
+        self.last_estimate: Optional[RPPGEstimate] = None
+        
+        self._pos_length = int(round(self.POS_WINDOW * self.RESAMPLE_RATE))
+        frequencies = np.fft.rfftfreq(self.FFT_SIZE, 1.0 / self.RESAMPLE_RATE)
+        self._band = np.flatnonzero((frequencies >= self.min_bpm / 60.0) & (frequencies <= self.max_bpm / 60.0))
+        self._frequencies = frequencies
+    
+    def add_sample(self, timestamp: float, rgb: Tuple[float, float, float]):
+        """
+        Add one mean skin color.
+        
+        Args:
+            timestamp: Capture time of the frame
+            rgb: Mean red, green and blue of the skin regions
+        """
+        last = self.samples.last()
+        if last is not None and timestamp - last[0] > self.max_gap:
+            self.reset()
+        self.samples.append(timestamp, rgb)
+    
+    def process_frame(self, frame: np.ndarray, landmarks: Any, timestamp: float) -> Optional[RPPGEstimate]:
+        """
+        Sample the skin color of a frame and estimate the pulse when due.
+        
+        Args:
+            frame: BGR frame
+            landmarks: MediaPipe normalized pose landmarks of the frame, or None
+            timestamp: Capture time of the frame
+        
+        Returns:
+            New estimate, or None if none is due or the signal is too weak
+        """
+        if landmarks is None:
+            return None
+        height, width = frame.shape[:2]
+        rois = face_rois(landmarks, width, height)
+        if rois is None:
+            return None
+        
+        # Area-weighted mean over the regions (cv2.mean works on views, no copies)
+        total = np.zeros(3)
+        area = 0
+        for x0, y0, x1, y1 in rois:
+            pixels = (x1 - x0) * (y1 - y0)
+            total += np.array(cv2.mean(frame[y0:y1, x0:x1])[:3]) * pixels
+            area += pixels
+        blue, green, red = total / area
+        self.add_sample(timestamp, (red, green, blue))
+        
+        if self.last_estimate_time is not None and timestamp - self.last_estimate_time < self.update_interval:
+            return None
+        self.last_estimate_time = timestamp
+        estimate = self.estimate()
+        if estimate is not None:
+            self.last_estimate = estimate
+        return estimate
+    
+    def pulse_signal(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        POS pulse signal of the current window.
+        
+        Returns:
+            (times, pulse) on the uniform grid, or None if less than min_window
+            seconds are buffered
+        """
+        times, colors = self.samples.latest()
+        if len(times) < 2 or times[-1] - times[0] < self.min_window:
+            return None
+        span = min(self.window, times[-1] - times[0])
+        samples = int(span * self.RESAMPLE_RATE)
+        grid = times[-1] - (np.arange(samples)[::-1] / self.RESAMPLE_RATE)
+        rgb = np.stack([np.interp(grid, times, colors[:, channel]) for channel in range(3)])
+        
+        length = self._pos_length
+        windows = np.lib.stride_tricks.sliding_window_view(rgb, length, axis=1)  # (3, windows, length)
+        normalized = windows / np.maximum(windows.mean(axis=2, keepdims=True), 1e-6)
+        red, green, blue = normalized
+        s1 = green - blue
+        s2 = green + blue - 2.0 * red
+        alpha = s1.std(axis=1) / np.maximum(s2.std(axis=1), 1e-12)
+        h = s1 + alpha[:, None] * s2
+        h -= h.mean(axis=1, keepdims=True)
+        # Overlap-add: projected sample j of window i belongs to grid sample i + j
+        index = np.arange(samples - length + 1)[:, None] + np.arange(length)
+        pulse = np.bincount(index.ravel(), weights=h.ravel(), minlength=samples)
+        return grid, pulse
+    
+    def estimate(self) -> Optional[RPPGEstimate]:
+        """
+        Estimate the pulse rate from the current window.
+        
+        Returns:
+            Estimate, or None if the window is too short or the SNR too low
+        """
+        signal = self.pulse_signal()
+        if signal is None:
+            return None
+        grid, pulse = signal
+        power = np.abs(np.fft.rfft(pulse * np.hanning(len(pulse)), self.FFT_SIZE)) ** 2
+        band = self._band
+        peak = int(band[np.argmax(power[band])])
+        
+        # Parabolic interpolation of the log power around the peak bin
+        offset = 0.0
+        if band[0] < peak < band[-1]:
+            left, center, right = np.log(power[peak - 1:peak + 2] + 1e-30)
+            denominator = left - 2.0 * center + right
+            if denominator < 0:
+                offset = 0.5 * (left - right) / denominator
+        resolution = self._frequencies[1]
+        frequency = (peak + offset) * resolution
+        
+        frequencies = self._frequencies[band]
+        signal_bins = (np.abs(frequencies - frequency) <= self.SNR_BANDWIDTH) | (
+            np.abs(frequencies - 2.0 * frequency) <= self.SNR_BANDWIDTH
+        )
+        signal_power = power[band][signal_bins].sum()
+        noise_power = power[band][~signal_bins].sum()
+        snr = 10.0 * np.log10(max(signal_power, 1e-30) / max(noise_power, 1e-30))
+        if snr < self.min_snr:
+            return None
+        return RPPGEstimate(float(grid[-1]), 60.0 * frequency, float(snr))
+    
+    def reset(self):
+        """Drop all samples."""
+        self.samples.clear()
+        self.last_estimate_time = None
+        self.last_estimate = None
@@ -0,0 +1,256 @@
+"""Concurrent Polar H10 sessions on one asyncio event loop."""
+
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+from .connection_supervisor import ConnectionSupervisor
+from .hr_parser import HeartRateMeasurement, HeartRateParser, HeartRateSample
+from .polar_h10 import PolarH10
+from ..utils import clock
+from ..utils.config import Config
+from ..utils.ring_buffer import SPSCRingBuffer
+
+# Why a strap's link is down, reported with connected=False
+LINK_DROPPED = "dropped"  # Lost; the supervisor is reconnecting and the session is kept
+LINK_GIVEN_UP = "given up"  # Could not be restored; the session has ended
+LINK_DISCONNECTED = "disconnected"  # Disconnected on request, or the connection attempt failed
+
+
+class BLESession:
+    """
+    One connected strap.
+    
+    The client and the ring buffer's producer side belong to the event loop
+    thread; the ring buffer's consumer side and the parser belong to the
+    thread that calls BLESessionManager.drain().
+    """
+    
+    def __init__(self, address: str, capacity: int):
+        """
+        Initialize session.
+        
+        Args:
+            address: Device address
+            capacity: Unread notifications buffered for this strap
+        """
+        self.address = address
+        self.polar_h10: Optional[PolarH10] = None
+        self.supervisor: Optional[ConnectionSupervisor] = None
+        self.samples: SPSCRingBuffer[HeartRateSample] = SPSCRingBuffer(capacity)
+        self.parser = HeartRateParser()
+        self.connected_at: Optional[float] = None
+    
+    @property
+    def is_connected(self) -> bool:
+        """Whether the strap is connected."""
+        return self.polar_h10 is not None and self.polar_h10.is_connected
+    
+    @property
+    def is_reconnecting(self) -> bool:
+        """Whether the link dropped and the supervisor is reconnecting."""
+        return self.supervisor is not None and self.supervisor.lost_at is not None
+
+
+class BLESessionManager:
+    """
+    Runs several PolarH10 clients concurrently on one event loop.
+    
+    Every strap gets its own session with a ring buffer and a parser, so a
+    busy or stalled strap can neither overwrite nor delay another's samples.
+    Notification callbacks only push into their session's buffer; one
+    coalesced wake-up tells the consumer that something arrived.
+    drain() visits the sessions round-robin, starting one further each call
+    and taking at most max_batch samples from each, so the order of
+    sessions never decides whose samples wait.
+    
+    Connection setup is serialized (most adapters allow only one pending
+    connection), while connected straps stream concurrently. A
+    ConnectionSupervisor per session reconnects dropped links; the session,
+    its buffer and its parser survive the outage. Sessions are
+    published to the consumer as an immutable tuple that is replaced on
+    every change, so drain() never sees a half-updated collection.
+    """
+    
+    def __init__(
+        self,
+        on_samples_available: Optional[Callable[[], None]] = None,
+        client_factory: Optional[Callable[..., object]] = None,
+        max_sessions: Optional[int] = None,
+        on_status: Optional[Callable[[str, bool, str], None]] = None
+    ):
+        """
+        Initialize session manager.
+        
+        Args:
+            on_samples_available: Called on the event loop thread when samples
+                arrive and the consumer has drained everything before
+            client_factory: Passed to each PolarH10 (default: BleakClient)
+            max_sessions: Maximum simultaneous straps (default from config)
+            on_status: Called with (address, connected, reason) on the event loop
+                thread when a link drops (LINK_DROPPED), is restored (reason "")
+                or is given up (LINK_GIVEN_UP, the session has ended); connect()
+                and disconnect() report through their return value and the
+                caller instead
+        """
+        self.on_samples_available = on_samples_available
+        self.on_status = on_status
+        self.client_factory = client_factory
+        self.max_sessions = Config.BLE_MAX_SESSIONS if max_sessions is None else max_sessions
+        self.max_batch = Config.BLE_DRAIN_BATCH
+        self.sessions: Tuple[BLESession, ...] = ()
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._ended_dropped = 0  # Samples dropped by sessions that have ended
+        self._wake_pending = False
+        self._next_session = 0  # Consumer only: where the next drain starts
+    
+    def get(self, address: str) -> Optional[BLESession]:
+        """Get the session of a device, if any."""
+        for session in self.sessions:
+            if session.address == address:
+                return session
+        return None
+    
+    def __len__(self) -> int:
+        """Number of sessions."""
+        return len(self.sessions)
+    
+    async def connect(self, address: str, ble_device=None) -> bool:
+        """
+        Connect a strap and start its session (event loop thread).
+        
+        Args:
+            address: Device address
+            ble_device: BLEDevice from the scanner, if known (skips bleak's device lookup)
+        
+        Returns:
+            True if the strap is connected (also if it already was)
+        """
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            existing = self.get(address)
+            if existing is not None:
+                if existing.is_connected:
+                    return True
+                # Still reconnecting: connect now instead of waiting for the backoff
+                self._end(existing)
+                # Let the cancelled attempt unwind, then release its client so a
+                # half-open link does not linger next to the new one
+                await asyncio.sleep(0)
+                try:
+                    await existing.polar_h10.disconnect()
+                except Exception as e:
+                    print(f"Error releasing previous connection to {address}: {e}")
+            if len(self.sessions) >= self.max_sessions:
+                print(f"Cannot connect {address}: {self.max_sessions} straps already connected")
+                return False
+            
+            session = BLESession(address, Config.HEART_RATE_RING_CAPACITY)
+            session.polar_h10 = PolarH10(
+                on_measurement=lambda measurement: self._on_measurement(session, measurement),
+                client_factory=self.client_factory,
+                on_link_lost=lambda: session.supervisor.link_lost()
+            )
+            session.supervisor = ConnectionSupervisor(
+                session.polar_h10,
+                on_status=lambda connected: self._report(address, connected, "" if connected else LINK_DROPPED),
+                on_give_up=lambda: self._give_up(session)
+            )
+            if not await session.polar_h10.connect(address, ble_device):
+                return False
+            session.connected_at = clock.now()
+            session.supervisor.start()
+            self.sessions = self.sessions + (session,)
+            return True
+    
+    async def disconnect(self, address: str):
+        """
+        Disconnect a strap and end its session (event loop thread).
+        
+        Args:
+            address: Device address
+        """
+        session = self.get(address)
+        if session is None:
+            return
+        self._end(session)
+        await session.polar_h10.disconnect()
+    
+    async def disconnect_all(self, link_only: bool = False):
+        """
+        Disconnect every strap concurrently (event loop thread).
+        
+        Args:
+            link_only: Only drop the links, without stopping notifications first (on exit)
+        """
+        sessions = self.sessions
+        for session in sessions:
+            self._end(session)
+        await asyncio.gather(
+            *(session.polar_h10.disconnect(link_only) for session in sessions), return_exceptions=True
+        )
+    
+    def _end(self, session: BLESession):
+        """Remove a session and stop its supervisor (event loop thread)."""
+        session.supervisor.stop()
+        self.sessions = tuple(other for other in self.sessions if other is not session)
+        self._ended_dropped += session.samples.dropped
+    
+    def _report(self, address: str, connected: bool, reason: str):
+        """Forward a link status change, with the reason when the link is down."""
+        if self.on_status:
+            self.on_status(address, connected, reason)
+    
+    def _give_up(self, session: BLESession):
+        """End a session whose link could not be restored."""
+        print(f"Giving up reconnecting to {session.address}")
+        self._end(session)
+        # Releases the client; no strap is connected, so this only cleans up
+        asyncio.get_running_loop().create_task(session.polar_h10.disconnect())
+        self._report(session.address, False, LINK_GIVEN_UP)
+    
+    def _on_measurement(self, session: BLESession, measurement: HeartRateMeasurement):
+        """Buffer one notification of a session (event loop thread)."""
+        sample = HeartRateSample(clock.now(), measurement.bpm, measurement.rr_intervals)
+        if not session.samples.push(sample):
+            return
+        # Wake the consumer once; further samples ride along until it drains
+        if not self._wake_pending:
+            self._wake_pending = True
+            if self.on_samples_available:
+                self.on_samples_available()
+    
+    def drain(self) -> Dict[str, List[HeartRateSample]]:
+        """
+        Take buffered samples and apply them to each session's parser (consumer thread).
+        
+        Samples outside 30-220 BPM are discarded.
+        
+        Returns:
+            Valid samples in arrival order, keyed by address (only sessions with samples)
+        """
+        # Cleared before draining so a sample pushed meanwhile emits a new wake-up
+        self._wake_pending = False
+        sessions = self.sessions
+        if not sessions:
+            return {}
+        start = self._next_session % len(sessions)
+        self._next_session = start + 1
+        
+        drained = {}
+        for session in sessions[start:] + sessions[:start]:
+            samples = [
+                sample for sample in session.samples.drain(self.max_batch)
+                if 30 <= sample.bpm <= 220
+            ]
+            if not samples:
+                continue
+            for sample in samples:
+                session.parser.update(sample.bpm, sample.timestamp)
+                if sample.rr_intervals:
+                    session.parser.add_rr_intervals(sample.rr_intervals)
+            drained[session.address] = samples
+        return drained
+    
+    def dropped(self) -> int:
+        """Samples dropped because a session's ring buffer was full, over all sessions so far."""
+        return self._ended_dropped + sum(session.samples.dropped for session in self.sessions)
@@ -0,0 +1,482 @@
+"""Simulated Polar H10 straps behind drop-in fakes for BleakScanner and BleakClient."""
+
+import asyncio
+import numpy as np
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Sequence, Union
+from .hr_parser import (
+    HRM_FLAG_CONTACT_DETECTED, HRM_FLAG_CONTACT_SUPPORTED, HRM_FLAG_ENERGY_EXPENDED,
+    HRM_FLAG_RR_INTERVALS, HRM_FLAG_UINT16_BPM, RR_INTERVAL_RESOLUTION
+)
+from ..utils import clock
+from ..utils.config import Config
+
+HRM_MAX_PAYLOAD = 20  # Bytes of one notification at the default ATT MTU (23)
+ADVERTISING_INTERVAL = 0.25  # Seconds between a simulated strap's advertisements
+
+
+def encode_heart_rate_measurement(
+    bpm: int,
+    rr_intervals: Sequence[float] = (),
+    uint16: bool = False,
+    sensor_contact: Optional[bool] = True,
+    energy_expended: Optional[int] = None
+) -> bytes:
+    """
+    Encode a Heart Rate Measurement notification (inverse of parse_heart_rate_measurement).
+    
+    Args:
+        bpm: Heart rate
+        rr_intervals: Beat-to-beat intervals in seconds, oldest first
+        uint16: Send the heart rate as uint16 (forced above 255 BPM)
+        sensor_contact: Contact state (None: contact detection not supported)
+        energy_expended: Kilojoules (None: field omitted)
+    
+    Returns:
+        Notification payload
+    
+    Raises:
+        ValueError: If the RR intervals do not fit into one notification
+    """
+    uint16 = uint16 or bpm > 0xFF
+    flags = HRM_FLAG_UINT16_BPM if uint16 else 0
+    if sensor_contact is not None:
+        flags |= HRM_FLAG_CONTACT_SUPPORTED | (HRM_FLAG_CONTACT_DETECTED if sensor_contact else 0)
+    if energy_expended is not None:
+        flags |= HRM_FLAG_ENERGY_EXPENDED
+    if len(rr_intervals):
+        flags |= HRM_FLAG_RR_INTERVALS
+    
+    payload = bytearray((flags,))
+    payload += int(bpm).to_bytes(2 if uint16 else 1, byteorder='little')
+    if energy_expended is not None:
+        payload += min(int(energy_expended), 0xFFFF).to_bytes(2, byteorder='little')
+    for rr in rr_intervals:
+        payload += min(int(round(rr / RR_INTERVAL_RESOLUTION)), 0xFFFF).to_bytes(2, byteorder='little')
+    if len(payload) > HRM_MAX_PAYLOAD:
+        raise ValueError(f"{len(rr_intervals)} RR intervals do not fit into one notification")
+    return bytes(payload)
+
+
+def max_rr_intervals(uint16: bool = False, energy_expended: bool = False) -> int:
+    """RR intervals that fit into one notification next to the other fields."""
+    header = 1 + (2 if uint16 else 1) + (2 if energy_expended else 0)
+    return (HRM_MAX_PAYLOAD - header) // 2
+
+
+def synthetic_rr_intervals(
+    count: int,
+    mean_bpm: float = 70.0,
+    breathing_rate: float = 0.25,
+    rsa_depth: float = 0.04,
+    mayer_depth: float = 0.02,
+    noise: float = 0.015,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Generate a plausible RR interval series.
+    
+    The mean interval is modulated by breathing (respiratory sinus
+    arrhythmia, high-frequency band) and by ~0.1 Hz Mayer waves
+    (low-frequency band), plus white beat-to-beat noise.
+    
+    Args:
+        count: Number of intervals
+        mean_bpm: Average heart rate
+        breathing_rate: Breaths per second
+        rsa_depth: Relative RR modulation by breathing
+        mayer_depth: Relative RR modulation at 0.1 Hz
+        noise: Relative standard deviation of the beat-to-beat noise
+        seed: Random seed
+    
+    Returns:
+        Intervals in seconds
+    """
+    rng = np.random.default_rng(seed)
+    mean_rr = 60.0 / mean_bpm
+    # Beat times only depend on the mean closely enough for the modulation phase
+    t = np.arange(count) * mean_rr
+    phases = rng.uniform(0.0, 2.0 * np.pi, 2)
+    modulation = (
+        rsa_depth * np.sin(2.0 * np.pi * breathing_rate * t + phases[0])
+        + mayer_depth * np.sin(2.0 * np.pi * 0.1 * t + phases[1])
+        + rng.normal(0.0, noise, count)
+    )
+    return np.clip(mean_rr * (1.0 + modulation), 0.27, 2.0)
+
+
+def load_rr_trace(path: Union[str, Path]) -> np.ndarray:
+    """
+    Load recorded RR intervals.
+    
+    One interval per line, or the first column of a CSV; blank lines, '#'
+    comments and a non-numeric header are skipped. Values above 10 are
+    taken as milliseconds (the usual export format), others as seconds.
+    
+    Args:
+        path: Text or CSV file
+    
+    Returns:
+        Intervals in seconds
+    
+    Raises:
+        ValueError: If the file holds no intervals
+    """
+    values = []
+    for line in Path(path).read_text().splitlines():
+        field = line.split('#')[0].replace(';', ',').split(',')[0].strip()
+        if not field:
+            continue
+        try:
+            values.append(float(field))
+        except ValueError:
+            continue
+    if not values:
+        raise ValueError(f"No RR intervals in {path}")
+    rr = np.array(values)
+    return rr / 1000.0 if np.median(rr) > 10.0 else rr
+
+
+class SimulatedStrap:
+    """
+    Radio-side state of one simulated Polar H10.
+    
+    The heart beats along an RR trace (looped) whether or not a client is
+    connected. Like the H10, the strap notifies at a fixed rate with the
+    current heart rate and the RR intervals of the beats completed since
+    the previous notification (as many as fit; the rest follow in the next
+    one). Notifications can be delayed by jitter and lost with the dropout
+    probability, which also loses their RR intervals. Beats that complete
+    while no client is subscribed are never sent.
+    """
+    
+    def __init__(
+        self,
+        address: str,
+        rr_intervals: Optional[Sequence[float]] = None,
+        rate: float = 1.0,
+        jitter: float = 0.0,
+        dropout: float = 0.0,
+        uint16: bool = False,
+        name: Optional[str] = None,
+        rssi: int = -60,
+        connect_delay: float = 0.05,
+        service_discovery_time: float = 1.0,
+        seed: int = 0
+    ):
+        """
+        Initialize simulated strap.
+        
+        Args:
+            address: Device address
+            rr_intervals: RR trace in seconds (default: synthetic_rr_intervals())
+            rate: Notifications per second (H10: 1)
+            jitter: Mean extra delay of a notification in seconds (exponential)
+            dropout: Probability that a notification is lost
+            uint16: Send the heart rate as uint16
+            name: Advertised name (default: "Polar H10 " and the address's last bytes)
+            rssi: Mean advertised RSSI in dBm
+            connect_delay: Seconds a connection with cached services takes
+            service_discovery_time: Extra seconds a connection without cached services takes
+            seed: Random seed for jitter, dropouts and RSSI
+        """
+        self.address = address
+        self.name = name or f"Polar H10 {address.replace(':', '')[-8:]}"
+        self.rr = np.asarray(rr_intervals if rr_intervals is not None else synthetic_rr_intervals(4096, seed=seed), dtype=float)
+        self.rate = rate
+        self.jitter = jitter
+        self.dropout = dropout
+        self.uint16 = uint16
+        self.rssi = rssi
+        self.connect_delay = connect_delay
+        self.service_discovery_time = service_discovery_time
+        self.rng = np.random.default_rng(seed)
+        self.max_rr = max_rr_intervals(uint16)
+        
+        self.unreachable_until = 0.0  # Clock time until which connecting waits
+        self.client: Optional['SimulatedClient'] = None  # Most recently connected client
+        self.sent = 0  # Notifications delivered
+        self.lost = 0  # Notifications lost to dropout
+        self.beats_sent = 0  # RR intervals delivered
+        self._beat_index = 0
+        self._next_beat = clock.now() + self.rr[0]
+        self._pending: List[float] = []
+        self._bpm = int(round(60.0 / self.rr[0]))
+    
+    @property
+    def is_reachable(self) -> bool:
+        """Whether the strap is in radio range."""
+        return clock.now() >= self.unreachable_until
+    
+    def skip_to(self, now: float):
+        """Let the heart beat up to now without sending the beats."""
+        self._advance(now)
+        self._pending.clear()
+    
+    def _advance(self, now: float):
+        """Complete the beats up to now."""
+        while self._next_beat <= now:
+            rr = float(self.rr[self._beat_index % len(self.rr)])
+            self._pending.append(rr)
+            self._bpm = int(round(60.0 / rr))
+            self._beat_index += 1
+            self._next_beat += self.rr[self._beat_index % len(self.rr)]
+        # A strap that is never read does not hoard beats
+        if len(self._pending) > 4 * self.max_rr:
+            del self._pending[:-self.max_rr]
+    
+    def next_notification(self, now: float) -> Optional[bytes]:
+        """
+        Build the notification due at now.
+        
+        Returns:
+            Payload, or None if the notification is lost
+        """
+        self._advance(now)
+        rr_intervals = self._pending[:self.max_rr]
+        del self._pending[:self.max_rr]
+        if self.dropout and self.rng.random() < self.dropout:
+            self.lost += 1
+            return None
+        self.sent += 1
+        self.beats_sent += len(rr_intervals)
+        return encode_heart_rate_measurement(self._bpm, rr_intervals, self.uint16)
+    
+    def notification_delay(self) -> float:
+        """Extra delay of the next notification."""
+        return float(self.rng.exponential(self.jitter)) if self.jitter else 0.0
+    
+    def advertisement(self):
+        """Build one advertisement as (device, advertisement_data) for a detection callback."""
+        device = SimpleNamespace(address=self.address, name=self.name)
+        data = SimpleNamespace(
+            local_name=self.name,
+            rssi=int(round(self.rssi + self.rng.normal(0.0, 3.0))),
+            service_uuids=[Config.POLAR_H10_SERVICE_UUID]
+        )
+        return device, data
+
+
+class SimulatedClient:
+    """
+    Drop-in fake for BleakClient connected to a SimulatedStrap.
+    
+    Connecting waits until the strap is in reach and then takes its connect
+    delay, plus its service discovery time unless dangerous_use_bleak_cache
+    is set; if that exceeds the timeout the attempt fails like bleak's.
+    Only the Heart Rate Measurement characteristic exists.
+    """
+    
+    def __init__(self, strap: SimulatedStrap, disconnected_callback: Optional[Callable] = None, **kwargs):
+        """
+        Initialize simulated client.
+        
+        Args:
+            strap: Simulated strap
+            disconnected_callback: Called with the client when the link drops
+        """
+        self.strap = strap
+        self.address = strap.address
+        self.disconnected_callback = disconnected_callback
+        self.is_connected = False
+        self.task: Optional[asyncio.Task] = None
+    
+    async def connect(self, dangerous_use_bleak_cache: bool = False, timeout: float = 10.0, **kwargs):
+        """Connect once the strap is in reach and the connection delay has passed, or time out."""
+        strap = self.strap
+        delay = strap.connect_delay + (0.0 if dangerous_use_bleak_cache else strap.service_discovery_time)
+        # Like a real controller, the attempt waits for the strap to advertise again
+        unreachable = max(0.0, strap.unreachable_until - clock.now())
+        if unreachable + delay > timeout:
+            await asyncio.sleep(timeout)
+            raise TimeoutError(f"Device with address {self.address} was not found")
+        await asyncio.sleep(unreachable + delay)
+        self.is_connected = True
+        strap.client = self
+    
+    async def disconnect(self):
+        """Disconnect and stop notifying."""
+        self._stop_task()
+        was_connected, self.is_connected = self.is_connected, False
+        if was_connected and self.disconnected_callback:
+            self.disconnected_callback(self)
+    
+    def drop(self, outage: float):
+        """Lose the link; the strap stays out of reach for outage seconds."""
+        self.strap.unreachable_until = clock.now() + outage
+        self._stop_task()
+        if self.is_connected:
+            self.is_connected = False
+            if self.disconnected_callback:
+                self.disconnected_callback(self)
+    
+    async def start_notify(self, uuid: str, handler: Callable):
+        """Start notifying measurements to handler."""
+        if uuid != Config.POLAR_H10_CHARACTERISTIC_UUID:
+            raise ValueError(f"Characteristic {uuid} was not found")
+        if not self.is_connected:
+            raise RuntimeError("Not connected")
+        self._stop_task()
+        self.task = asyncio.get_running_loop().create_task(self._notify(handler))
+    
+    async def stop_notify(self, uuid: str):
+        """Stop notifying."""
+        self._stop_task()
+    
+    async def write_gatt_char(self, uuid: str, data: bytes, response: bool = False):
+        """Reject writes: the simulated strap has no writable characteristics."""
+        raise ValueError(f"Characteristic {uuid} was not found")
+    
+    def _stop_task(self):
+        """Cancel the notification task."""
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+    
+    async def _notify(self, handler: Callable):
+        """
+        Notify at the strap's rate, paced against the subscription time.
+        
+        Each notification is built when the strap sends it; the jitter only
+        delays its delivery, so the RR intervals in it age like over the air.
+        """
+        strap = self.strap
+        start = clock.now()
+        strap.skip_to(start)
+        count = 0
+        while True:
+            count += 1
+            sent_at = start + count / strap.rate
+            await asyncio.sleep(max(0.0, sent_at - clock.now()))
+            payload = strap.next_notification(sent_at)
+            await asyncio.sleep(max(0.0, sent_at + strap.notification_delay() - clock.now()))
+            if payload is not None:
+                handler(Config.POLAR_H10_CHARACTERISTIC_UUID, bytearray(payload))
+
+
+class SimulatedScanner:
+    """
+    Drop-in fake for BleakScanner advertising the simulated straps.
+    
+    Each strap in reach advertises every ADVERTISING_INTERVAL seconds (with
+    a random phase) to the detection callback; the service filter is
+    applied like the OS would.
+    """
+    
+    def __init__(
+        self,
+        straps: Sequence[SimulatedStrap],
+        detection_callback: Optional[Callable] = None,
+        service_uuids: Optional[Sequence[str]] = None,
+        **kwargs
+    ):
+        """
+        Initialize simulated scanner.
+        
+        Args:
+            straps: Simulated straps
+            detection_callback: Called with (device, advertisement_data) per advertisement
+            service_uuids: Services to filter on (None: all)
+        """
+        self.straps = straps
+        self.detection_callback = detection_callback
+        self.service_uuids = service_uuids
+        self.task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Start advertising."""
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self._advertise())
+    
+    async def stop(self):
+        """Stop advertising."""
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+    
+    async def _advertise(self):
+        """Deliver advertisements round-robin."""
+        if self.service_uuids and Config.POLAR_H10_SERVICE_UUID not in self.service_uuids:
+            return
+        step = ADVERTISING_INTERVAL / max(1, len(self.straps))
+        while True:
+            for strap in self.straps:
+                await asyncio.sleep(step)
+                if strap.is_reachable and self.detection_callback:
+                    self.detection_callback(*strap.advertisement())
+
+
+class SimulatedBLE:
+    """
+    A set of simulated straps with factories for DeviceScanner and PolarH10.
+    
+    Pass scanner_factory to DeviceScanner and client_factory to PolarH10 or
+    BLESessionManager in place of BleakScanner and BleakClient.
+    """
+    
+    def __init__(self, straps: Sequence[SimulatedStrap]):
+        """
+        Initialize simulated environment.
+        
+        Args:
+            straps: Simulated straps
+        """
+        self.straps: Dict[str, SimulatedStrap] = {strap.address: strap for strap in straps}
+    
+    @classmethod
+    def create(
+        cls,
+        count: int,
+        rate: float = 1.0,
+        jitter: float = 0.0,
+        dropout: float = 0.0,
+        uint16: bool = False,
+        rr_trace: Optional[Sequence[float]] = None,
+        seed: int = 0
+    ) -> 'SimulatedBLE':
+        """
+        Create count straps with the same settings.
+        
+        Args:
+            count: Number of straps
+            rate: Notifications per second per strap
+            jitter: Mean extra notification delay in seconds
+            dropout: Probability that a notification is lost
+            uint16: Send heart rates as uint16
+            rr_trace: Recorded RR intervals in seconds, each strap starting at a
+                different offset (default: a synthetic trace per strap)
+            seed: Random seed
+        
+        Returns:
+            Simulated environment
+        """
+        straps = []
+        for index in range(count):
+            if rr_trace is not None:
+                offset = index * len(rr_trace) // max(1, count)
+                rr = np.roll(np.asarray(rr_trace, dtype=float), -offset)
+            else:
+                rr = synthetic_rr_intervals(4096, mean_bpm=60.0 + 5.0 * (index % 8), seed=seed + index)
+            straps.append(SimulatedStrap(
+                f"A0:00:00:00:00:{index:02X}", rr, rate=rate, jitter=jitter, dropout=dropout,
+                uint16=uint16, rssi=-50 - 3 * (index % 10), connect_delay=0.05 + 0.02 * index,
+                seed=seed + index
+            ))
+        return cls(straps)
+    
+    def scanner_factory(self, **kwargs) -> SimulatedScanner:
+        """Create a scanner from BleakScanner's keyword arguments."""
+        return SimulatedScanner(list(self.straps.values()), **kwargs)
+    
+    def client_factory(self, device, **kwargs) -> SimulatedClient:
+        """
+        Create a client from an address or scanned device and BleakClient's keyword arguments.
+        
+        Raises:
+            ValueError: If no simulated strap has the address
+        """
+        address = device if isinstance(device, str) else device.address
+        if address not in self.straps:
+            raise ValueError(f"Device with address {address} was not found")
+        return SimulatedClient(self.straps[address], **kwargs)
@@ -107,6 +107,7 @@ from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
 from src.ui.main_window import MainWindow
 from src.utils.config import Config
+from src.rendering.shader_manager import enable_driver_shader_cache
 
 
 def main():
@@ -114,6 +115,9 @@ def main():
     # Ensure directories exist
     Config.ensure_directories()
     
+    # Must happen before the GL driver is loaded by the first context
+    enable_driver_shader_cache()
+    
     # Create Qt application
     app = QApplication(sys.argv)
     app.setApplicationName("Health Check-in Mirror System")
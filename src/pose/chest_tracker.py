@@ -9,6 +9,7 @@ from ..utils.math_utils import (
     create_transform_matrix
 )
 from ..utils.config import Config
+from ..utils.timeseries import TimeSeries
 
 
 class ChestTracker:
@@ -31,6 +32,8 @@ class ChestTracker:
         self.last_position: Optional[np.ndarray] = None
         self.last_rotation: Optional[np.ndarray] = None
         self.last_position_2d: Optional[np.ndarray] = None  # For 2D tracking
+        self.last_angles_2d: Optional[np.ndarray] = None  # (yaw, pitch) in degrees for 2D tracking
+        self.position_history_2d = TimeSeries(Config.CHEST_HISTORY_SIZE, channels=2)  # Smoothed (x, y) by frame time
         self.smoothing_factor = smoothing_factor  # 0.7 = 70% old, 30% new
     
     def extract_landmark_2d(
@@ -170,7 +173,8 @@ class ChestTracker:
         self,
         normalized_landmarks: Any,
         frame_width: int,
-        frame_height: int
+        frame_height: int,
+        timestamp: Optional[float] = None
     ) -> Optional[np.ndarray]:
         """
         Get 2D heart position in screen coordinates (anatomically adjusted).
@@ -179,6 +183,8 @@ class ChestTracker:
             normalized_landmarks: MediaPipe normalized landmarks (0-1 range)
             frame_width: Video frame width in pixels
             frame_height: Video frame height in pixels
+            timestamp: Capture time of the frame; if given, the position is
+                added to position_history_2d
         
         Returns:
             2D position as numpy array [x, y] in screen coordinates, or None if tracking fails
@@ -230,8 +236,54 @@ class ChestTracker:
                            (1.0 - self.smoothing_factor) * chest_pos_2d)
         
         self.last_position_2d = chest_pos_2d
+        if timestamp is not None:
+            self.position_history_2d.append(timestamp, chest_pos_2d)
         return chest_pos_2d
     
+    def get_chest_rotation_2d(
+        self,
+        normalized_landmarks: Any
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Estimate chest yaw and pitch from normalized landmarks.
+        
+        Uses the relative depth (z) MediaPipe reports for normalized landmarks,
+        which is on roughly the same scale as x.
+        
+        Args:
+            normalized_landmarks: MediaPipe normalized landmarks (0-1 range)
+        
+        Returns:
+            (yaw, pitch) in degrees, or None if the shoulders are not visible.
+            Positive yaw turns the person's left shoulder towards the camera,
+            positive pitch leans the shoulders towards the camera.
+        """
+        if self.extract_landmark_2d(normalized_landmarks, self.LEFT_SHOULDER) is None or \
+                self.extract_landmark_2d(normalized_landmarks, self.RIGHT_SHOULDER) is None:
+            return None
+        
+        lm = normalized_landmarks.landmark
+        left, right = lm[self.LEFT_SHOULDER], lm[self.RIGHT_SHOULDER]
+        yaw = np.degrees(np.arctan2(right.z - left.z, abs(right.x - left.x)))
+        
+        pitch = 0.0
+        if self.extract_landmark_2d(normalized_landmarks, self.LEFT_HIP) is not None and \
+                self.extract_landmark_2d(normalized_landmarks, self.RIGHT_HIP) is not None:
+            left_hip, right_hip = lm[self.LEFT_HIP], lm[self.RIGHT_HIP]
+            shoulder_z = (left.z + right.z) / 2.0
+            hip_z = (left_hip.z + right_hip.z) / 2.0
+            torso_height = abs((left_hip.y + right_hip.y) / 2.0 - (left.y + right.y) / 2.0)
+            pitch = np.degrees(np.arctan2(hip_z - shoulder_z, torso_height))
+        
+        # Apply smoothing
+        angles = np.array([yaw, pitch], dtype=np.float32)
+        if self.last_angles_2d is not None:
+            angles = (self.smoothing_factor * self.last_angles_2d +
+                      (1.0 - self.smoothing_factor) * angles)
+        
+        self.last_angles_2d = angles
+        return float(angles[0]), float(angles[1])
+    
     def get_transform_matrix(
         self,
         world_landmarks: Any
@@ -330,4 +382,6 @@ class ChestTracker:
         self.last_position = None
         self.last_rotation = None
         self.last_position_2d = None
+        self.last_angles_2d = None
+        self.position_history_2d.clear()
 
@@ -4,6 +4,7 @@ import cv2
 import mediapipe as mp
 import numpy as np
 from typing import Optional, Tuple, List, Any
+from ..utils import clock
 from ..utils.config import Config
 
 
@@ -22,17 +23,23 @@ class MediaPipeTracker:
             enable_segmentation=Config.MEDIAPIPE_ENABLE_SEGMENTATION,
             smooth_landmarks=Config.MEDIAPIPE_SMOOTH_LANDMARKS
         )
+        
+        # Timestamp of the frame behind the latest result (shared clock domain)
+        self.last_timestamp: Optional[float] = None
     
-    def process(self, frame: np.ndarray) -> Optional[Any]:
+    def process(self, frame: np.ndarray, timestamp: Optional[float] = None) -> Optional[Any]:
         """
         Process a frame and detect pose landmarks.
         
         Args:
             frame: Input frame (BGR format)
+            timestamp: Capture time of the frame (default: clock.now())
         
         Returns:
             MediaPipe landmarks or None if no pose detected
         """
+        self.last_timestamp = clock.now() if timestamp is None else timestamp
+        
         # Convert BGR to RGB for MediaPipe
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         
@@ -43,16 +50,19 @@ class MediaPipeTracker:
             return results.pose_landmarks
         return None
     
-    def get_world_landmarks(self, frame: np.ndarray) -> Optional[Any]:
+    def get_world_landmarks(self, frame: np.ndarray, timestamp: Optional[float] = None) -> Optional[Any]:
         """
         Get 3D world landmarks from a frame.
         
         Args:
             frame: Input frame (BGR format)
+            timestamp: Capture time of the frame (default: clock.now())
         
         Returns:
             MediaPipe world landmarks or None if no pose detected
         """
+        self.last_timestamp = clock.now() if timestamp is None else timestamp
+        
         # Convert BGR to RGB for MediaPipe
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         
@@ -0,0 +1,76 @@
+"""Headless ModernGL context creation (no window or display required)."""
+
+import logging
+import os
+import sys
+import moderngl
+from typing import Optional
+from .shader_manager import enable_driver_shader_cache
+
+logger = logging.getLogger(__name__)
+
+
+def create_headless_context(require: int = 330, backend: Optional[str] = None) -> moderngl.Context:
+    """
+    Create a standalone ModernGL context without a window.
+    
+    Tries the platform default standalone backend first (CGL on macOS,
+    WGL on Windows, GLX on Linux), then EGL for machines without a display.
+    On Linux, if no hardware driver works, Mesa's llvmpipe software
+    rasterizer is forced as a last resort so rendering still works on
+    machines with no GPU.
+    
+    Args:
+        require: Minimum OpenGL version code (e.g. 330 for 3.3)
+        backend: Force a specific moderngl backend (e.g. 'egl'), or None to auto-detect
+    
+    Returns:
+        ModernGL context, current on the calling thread
+    
+    Raises:
+        RuntimeError: If no headless backend could create a context
+    """
+    enable_driver_shader_cache()
+    
+    if backend is not None:
+        attempts = [backend]
+    else:
+        attempts = [None, 'egl']
+    
+    errors = []
+    for attempt in attempts:
+        ctx = _try_create(require, attempt, errors)
+        if ctx is not None:
+            return ctx
+    
+    if sys.platform.startswith('linux') and os.environ.get('GALLIUM_DRIVER') != 'llvmpipe':
+        # Mesa reads these when the driver is loaded, so they apply to the retry
+        logger.warning("No hardware OpenGL available, falling back to llvmpipe software rendering")
+        os.environ['LIBGL_ALWAYS_SOFTWARE'] = '1'
+        os.environ['GALLIUM_DRIVER'] = 'llvmpipe'
+        ctx = _try_create(require, backend or 'egl', errors)
+        if ctx is not None:
+            return ctx
+    
+    raise RuntimeError(f"Could not create headless OpenGL context ({'; '.join(errors)})")
+
+
+def _try_create(require: int, backend: Optional[str], errors: list) -> Optional[moderngl.Context]:
+    """Try one backend, recording the failure reason in errors."""
+    kwargs = {} if backend is None else {'backend': backend}
+    try:
+        ctx = moderngl.create_context(standalone=True, require=require, **kwargs)
+        logger.info(
+            f"Headless OpenGL context ({backend or 'default'}): "
+            f"{ctx.info['GL_RENDERER']} ({ctx.version_code})"
+        )
+        return ctx
+    except Exception as e:
+        errors.append(f"{backend or 'default'}: {e}")
+        return None
+
+
+def is_software_renderer(ctx: moderngl.Context) -> bool:
+    """Check whether a context is backed by a software rasterizer."""
+    renderer = str(ctx.info.get('GL_RENDERER', '')).lower()
+    return any(name in renderer for name in ('llvmpipe', 'softpipe', 'swrast', 'software'))
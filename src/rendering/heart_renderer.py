@@ -3,9 +3,10 @@
 import logging
 import moderngl
 import numpy as np
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from pathlib import Path
 from ..rendering.model_loader import ModelLoader
+from ..rendering.shader_manager import ShaderManager
 from ..utils.config import Config
 from ..utils.math_utils import perspective_projection_matrix, look_at_matrix
 
@@ -15,57 +16,38 @@ logger = logging.getLogger(__name__)
 class HeartRenderer:
     """Renders 3D heart model using ModernGL."""
     
-    # Vertex shader (using GLSL 410 for OpenGL 4.1)
-    VERTEX_SHADER = """
-    #version 410
+    # Per-vertex attributes in interleaved buffer order
+    VERTEX_ATTRIBUTES = ('in_position', 'in_normal', 'in_systole')
     
-    in vec3 in_position;
-    in vec3 in_normal;
+    # Shader sources in Config.SHADERS_DIR (GLSL 410 for OpenGL 4.1);
+    # heart.frag is compiled with LIT defined for the lit variant
+    SHADER_FILES = ('heart.vert', 'heart.frag')
+    INSTANCED_SHADER_FILES = ('heart_instanced.vert', 'heart_instanced.frag')
     
-    uniform mat4 model;
-    uniform mat4 view;
-    uniform mat4 projection;
-    uniform float beat_scale;
+    # Lit variant material and the light shared with the instanced program
+    LIT_COLOR = (0.85, 0.05, 0.1)
+    LIGHT_DIR = (0.0, -0.5, -1.0)
     
-    out vec3 frag_normal;
-    out vec3 frag_position;
+    # Uniform block binding point shared by both programs for the camera UBO
+    CAMERA_BLOCK_BINDING = 0
     
-    void main() {
-        // Apply heartbeat scale (beat_scale is 0.0-0.1, so add 1.0 to get 1.0-1.1)
-        vec3 scaled_position = in_position * (1.0 + beat_scale);
-        vec4 world_pos = model * vec4(scaled_position, 1.0);
-        frag_position = world_pos.xyz;
-        frag_normal = mat3(model) * in_normal;
-        vec4 view_pos = view * world_pos;
-        gl_Position = projection * view_pos;
-    }
-    """
+    # Enable flags shared by both render paths (culling stays off)
+    RENDER_FLAGS = moderngl.DEPTH_TEST | moderngl.BLEND
     
-    # Fragment shader (using GLSL 410 for OpenGL 4.1)
-    FRAGMENT_SHADER = """
-    #version 410
+    # Per-instance record layout, matching '16f 1f 3f/i' in the instanced VAO
+    INSTANCE_DTYPE = np.dtype([
+        ('model', np.float32, (4, 4)),
+        ('beat_scale', np.float32),
+        ('color', np.float32, (3,))
+    ])
     
-    in vec3 frag_normal;
-    in vec3 frag_position;
-    
-    uniform vec3 color;
-    uniform float alpha;
-    uniform vec3 light_dir;
-    
-    out vec4 frag_color;
-    
-    void main() {
-        // TEMPORARY: Force red output to test if shader is working
-        frag_color = vec4(1.0, 0.0, 0.0, 1.0);
-        
-        // Original lighting code (commented out for testing)
-        // float light = max(dot(normalize(frag_normal), normalize(-light_dir)), 0.3);
-        // vec3 final_color = color * light;
-        // frag_color = vec4(final_color, alpha);
-    }
-    """
-    
-    def __init__(self, ctx: moderngl.Context, width: int, height: int):
+    def __init__(
+        self,
+        ctx: moderngl.Context,
+        width: int,
+        height: int,
+        shader_manager: Optional[ShaderManager] = None
+    ):
         """
         Initialize heart renderer.
         
@@ -73,6 +55,8 @@ class HeartRenderer:
             ctx: ModernGL context
             width: Viewport width
             height: Viewport height
+            shader_manager: Program cache to share with other renderers on ctx (it also
+                tracks uniform values and GL state, so sharing renderers stay correct)
         """
         self.ctx = ctx
         self.width = width
@@ -83,14 +67,26 @@ class HeartRenderer:
         self.vertices: Optional[np.ndarray] = None
         self.faces: Optional[np.ndarray] = None
         self.normals: Optional[np.ndarray] = None
+        self.systole_offsets: Optional[np.ndarray] = None
         
         # OpenGL buffers
         self.vbo: Optional[moderngl.Buffer] = None
         self.ibo: Optional[moderngl.Buffer] = None
         self.vao: Optional[moderngl.VertexArray] = None
         
-        # Shader program
+        # Shader program for the active variant, with one VAO per variant
+        self.shader_manager = shader_manager or ShaderManager(ctx)
+        self.lit = Config.HEART_LIT_SHADING
         self.prog: Optional[moderngl.Program] = None
+        self._vaos: Dict[bool, moderngl.VertexArray] = {}
+        
+        # Instanced rendering (one draw call for all tracked people)
+        self.instanced_prog: Optional[moderngl.Program] = None
+        self.instanced_vao: Optional[moderngl.VertexArray] = None
+        self.max_instances = Config.HEART_MAX_INSTANCES
+        self.instance_data = np.zeros(self.max_instances, dtype=self.INSTANCE_DTYPE)
+        self.instance_buffer: Optional[moderngl.Buffer] = None
+        self.instance_count = 0
         
         # Rendering state
         self.beat_scale = 1.0
@@ -103,8 +99,22 @@ class HeartRenderer:
         )
         self.projection_matrix = np.eye(4, dtype=np.float32)
         
+        # Render state cache: uniforms are only uploaded when the program does
+        # not already hold the value (tracked by the shader manager, as the
+        # programs may be shared), and GL state only touched when another
+        # renderer or invalidate_gl_state() may have changed it
+        self.camera_ubo: Optional[moderngl.Buffer] = None
+        self._camera_dirty = True
+        self._gl_state_valid = False
+        
+        # Opt-in diagnostics (clip-space checks, per-frame logging)
+        self.instrumentation = Config.RENDER_INSTRUMENTATION
+        self._render_debug_count = 0
+        
         # Setup shaders
+        self._setup_camera_block()
         self._setup_shaders()
+        self._setup_instancing()
         
         # Setup projection
         self._setup_projection()
@@ -112,10 +122,7 @@ class HeartRenderer:
     def _setup_shaders(self):
         """Setup shader program."""
         try:
-            self.prog = self.ctx.program(
-                vertex_shader=self.VERTEX_SHADER,
-                fragment_shader=self.FRAGMENT_SHADER
-            )
+            self.prog = self._get_program(self.lit)
             logger.info("Shader program created successfully")
             # Verify attributes exist
             try:
@@ -127,6 +134,179 @@ class HeartRenderer:
         except Exception as e:
             logger.error(f"Error creating shader program: {e}", exc_info=True)
             raise
+        
+        # Not needed for the first frame; compiled between frames instead
+        vertex, fragment = self.SHADER_FILES
+        self.shader_manager.preload([
+            (vertex, fragment, {'LIT': 1} if not self.lit else None),
+            (*self.INSTANCED_SHADER_FILES, None)
+        ])
+    
+    def _get_program(self, lit: bool) -> moderngl.Program:
+        """
+        Get the single-heart program for a variant, configured for this renderer.
+        
+        Args:
+            lit: Diffuse-lit variant instead of flat red
+        
+        Returns:
+            Linked program
+        """
+        vertex, fragment = self.SHADER_FILES
+        prog = self.shader_manager.get_program(vertex, fragment, {'LIT': 1} if lit else None)
+        self._configure_program(prog)
+        if lit:
+            prog['color'].value = self.LIT_COLOR
+            prog['alpha'].value = 1.0
+            prog['light_dir'].value = self.LIGHT_DIR
+        return prog
+    
+    def _configure_program(self, prog: moderngl.Program):
+        """Set uniforms that are constant for the lifetime of a program."""
+        amplitude_uniform = prog.get('beat_amplitude', None)
+        if amplitude_uniform is not None:
+            amplitude_uniform.value = Config.HEART_BEAT_SCALE_AMPLITUDE
+        block = prog.get('Camera', None)
+        if block is not None:
+            block.binding = self.CAMERA_BLOCK_BINDING
+    
+    def _setup_instancing(self):
+        """Setup the persistent instance buffer (the program is linked on first use)."""
+        # Allocated once at full capacity; each frame overwrites the used prefix
+        self.instance_buffer = self.ctx.buffer(reserve=self.instance_data.nbytes, dynamic=True)
+    
+    def _get_instanced_program(self) -> Optional[moderngl.Program]:
+        """Get the instanced program, linking it if it has not been yet."""
+        if self.instanced_prog is None:
+            try:
+                self.instanced_prog = self.shader_manager.get_program(*self.INSTANCED_SHADER_FILES)
+                self._configure_program(self.instanced_prog)
+                self.instanced_prog['light_dir'].value = self.LIGHT_DIR
+                logger.info(f"Instanced shader program created (capacity {self.max_instances} hearts)")
+            except Exception as e:
+                logger.error(f"Error creating instanced shader program: {e}", exc_info=True)
+        return self.instanced_prog
+    
+    def _setup_camera_block(self):
+        """Create the camera uniform buffer shared by all programs."""
+        # view + projection, two std140 mat4s
+        self.camera_ubo = self.ctx.buffer(reserve=2 * 64, dynamic=True)
+    
+    def _upload_camera(self):
+        """Write view and projection to the camera UBO if either changed."""
+        if not self._camera_dirty:
+            return
+        # Same byte layout as the former per-program matrix uniforms
+        self.camera_ubo.write(self.view_matrix.tobytes() + self.projection_matrix.tobytes())
+        self._camera_dirty = False
+    
+    def _apply_gl_state(self):
+        """Set depth/blend/cull state, viewport and UBO binding, skipping redundant calls."""
+        if not self._gl_state_valid or self.shader_manager.state_owner is not self:
+            # Depth testing with alpha blending; culling stays off so the
+            # model renders even if it is inside-out
+            self.ctx.enable_only(self.RENDER_FLAGS)
+            self.ctx.blend_func = moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA
+            self.camera_ubo.bind_to_uniform_block(self.CAMERA_BLOCK_BINDING)
+            self._gl_state_valid = True
+            self.shader_manager.state_owner = self
+        
+        # The viewport is tracked per framebuffer by ModernGL (fbo.use() resets
+        # it), so compare against the current one instead of caching it here
+        viewport = (0, 0, self.width, self.height)
+        if self.ctx.viewport != viewport:
+            self.ctx.viewport = viewport
+    
+    def invalidate_gl_state(self):
+        """
+        Force GL state to be re-applied on the next render.
+        
+        Call this after other code (Qt painting, another renderer) has used
+        the same context and may have changed enable flags or UBO bindings.
+        """
+        self._gl_state_valid = False
+    
+    def _create_instanced_vao(self):
+        """Create the instanced VAO sharing the model's vertex and index buffers."""
+        if self._get_instanced_program() is None or self.instance_buffer is None:
+            return
+        
+        try:
+            active = [
+                name for name in self.VERTEX_ATTRIBUTES
+                if self.instanced_prog.get(name, None) is not None
+            ]
+            vertex_format = ' '.join(
+                '3f' if name in active else '3x4'
+                for name in self.VERTEX_ATTRIBUTES
+            )
+            self.instanced_vao = self.ctx.vertex_array(
+                self.instanced_prog,
+                [
+                    (self.vbo, vertex_format, *active),
+                    (self.instance_buffer, '16f 1f 3f/i', 'in_model', 'in_beat_scale', 'in_color')
+                ],
+                self.ibo
+            )
+        except Exception as e:
+            logger.error(f"Error creating instanced VAO: {e}", exc_info=True)
+            self.instanced_vao = None
+    
+    def _active_attributes(self, prog: Optional[moderngl.Program] = None) -> list:
+        """
+        Get the vertex attributes that survived shader linking.
+        
+        Args:
+            prog: Program to inspect (default: the active program)
+        
+        Returns:
+            Attribute names in VERTEX_ATTRIBUTES order
+        """
+        prog = prog or self.prog
+        return [name for name in self.VERTEX_ATTRIBUTES if prog.get(name, None) is not None]
+    
+    def _create_vao(self, prog: moderngl.Program) -> moderngl.VertexArray:
+        """
+        Create a VAO for a program over the interleaved vertex buffer.
+        
+        Args:
+            prog: Program the VAO binds attributes for
+        
+        Returns:
+            Vertex array
+        """
+        available_attrs = self._active_attributes(prog)
+        if 'in_position' not in available_attrs:
+            raise ValueError(f"Missing required attributes. Have: {available_attrs}, Need: in_position")
+        
+        # Attributes the linker optimized out are skipped as padding
+        vertex_format = ' '.join(
+            '3f' if name in available_attrs else '3x4'
+            for name in self.VERTEX_ATTRIBUTES
+        )
+        return self.ctx.vertex_array(prog, [(self.vbo, vertex_format, *available_attrs)], self.ibo)
+    
+    def set_lit(self, lit: bool):
+        """
+        Switch between the flat and diffuse-lit shader variants.
+        
+        Programs and VAOs are cached per variant, so switching back and forth
+        only costs a compile and VAO creation the first time.
+        
+        Args:
+            lit: Use the lit variant
+        """
+        if lit == self.lit:
+            return
+        
+        self.prog = self._get_program(lit)
+        self.lit = lit
+        if self.vbo is not None:
+            vao = self._vaos.get(lit)
+            if vao is None:
+                vao = self._create_vao(self.prog)
+                self._vaos[lit] = vao
+            self.vao = vao
     
     def _setup_projection(self, fov: float = 60.0, near: float = 0.1, far: float = 10.0):
         """
@@ -139,6 +319,7 @@ class HeartRenderer:
         """
         aspect = self.width / self.height if self.height > 0 else 1.0
         self.projection_matrix = perspective_projection_matrix(fov, aspect, near, far)
+        self._camera_dirty = True
     
     def load_model(self, model_path: Path) -> bool:
         """
@@ -181,15 +362,26 @@ class HeartRenderer:
             # Compute simple normals (this is a fallback, ideally normals come from the model)
             self.normals = np.ones((num_vertices, 3), dtype=np.float32) * [0, 0, 1]
         
-        # Create interleaved vertex data: position (3 floats) + normal (3 floats) per vertex
+        # Systolic morph targets are generated once per model and cached on disk,
+        # so the beat costs a single uniform per frame
+        self.systole_offsets = self.model_loader.compute_systole_offsets()
+        if self.systole_offsets is None or len(self.systole_offsets) != num_vertices:
+            logger.warning("Morph targets unavailable, heart will render without beat deformation")
+            self.systole_offsets = np.zeros((num_vertices, 3), dtype=np.float32)
+        
+        # Create interleaved vertex data: position (3 floats) + normal (3 floats)
+        # + systole offset (3 floats) per vertex
         # ModernGL expects interleaved data as a flat array
-        vertex_data = np.zeros(num_vertices * 6, dtype=np.float32)
-        vertex_data[0::6] = self.vertices[:, 0]  # x positions
-        vertex_data[1::6] = self.vertices[:, 1]  # y positions
-        vertex_data[2::6] = self.vertices[:, 2]  # z positions
-        vertex_data[3::6] = self.normals[:, 0]    # nx normals
-        vertex_data[4::6] = self.normals[:, 1]    # ny normals
-        vertex_data[5::6] = self.normals[:, 2]    # nz normals
+        vertex_data = np.zeros(num_vertices * 9, dtype=np.float32)
+        vertex_data[0::9] = self.vertices[:, 0]  # x positions
+        vertex_data[1::9] = self.vertices[:, 1]  # y positions
+        vertex_data[2::9] = self.vertices[:, 2]  # z positions
+        vertex_data[3::9] = self.normals[:, 0]    # nx normals
+        vertex_data[4::9] = self.normals[:, 1]    # ny normals
+        vertex_data[5::9] = self.normals[:, 2]    # nz normals
+        vertex_data[6::9] = self.systole_offsets[:, 0]  # dx systole
+        vertex_data[7::9] = self.systole_offsets[:, 1]  # dy systole
+        vertex_data[8::9] = self.systole_offsets[:, 2]  # dz systole
         
         self.vbo = self.ctx.buffer(vertex_data.tobytes())
         
@@ -220,23 +412,17 @@ class HeartRenderer:
         # Try different format approaches
         try:
             # First try: interleaved format
-            # Format: '3f 3f' means 3 floats for position, 3 floats for normal, interleaved
-            # Stride is automatically calculated (6 floats = 24 bytes)
+            # Format: '3f 3f 3f' means 3 floats each for position, normal and systole offset
+            # Stride is automatically calculated (9 floats = 36 bytes)
             # Verify shader attributes exist before creating VAO
-            available_attrs = list(self.prog.attributes.keys())
+            available_attrs = self._active_attributes()
             logger.info(f"Available shader attributes: {available_attrs}")
-            if 'in_position' not in available_attrs or 'in_normal' not in available_attrs:
-                logger.error(f"Missing required attributes. Have: {available_attrs}, Need: in_position, in_normal")
+            if 'in_position' not in available_attrs:
+                logger.error(f"Missing required attributes. Have: {available_attrs}, Need: in_position")
                 return False
             
             logger.debug("Attempting to create VAO with interleaved format...")
-            self.vao = self.ctx.vertex_array(
-                self.prog,
-                [
-                    (self.vbo, '3f 3f', 'in_position', 'in_normal')
-                ],
-                self.ibo
-            )
+            self.vao = self._create_vao(self.prog)
             logger.info(f"Successfully created VAO with {num_vertices} vertices and {len(faces_flat)} indices")
         except Exception as e1:
             logger.warning(f"First VAO creation attempt failed: {e1}, trying separate buffers...")
@@ -245,27 +431,32 @@ class HeartRenderer:
                 logger.debug("Attempting to create VAO with separate buffers...")
                 pos_data = self.vertices.astype(np.float32).tobytes()
                 norm_data = self.normals.astype(np.float32).tobytes()
+                systole_data = self.systole_offsets.astype(np.float32).tobytes()
                 pos_vbo = self.ctx.buffer(pos_data)
                 norm_vbo = self.ctx.buffer(norm_data)
+                systole_vbo = self.ctx.buffer(systole_data)
                 
+                buffers = {
+                    'in_position': pos_vbo,
+                    'in_normal': norm_vbo,
+                    'in_systole': systole_vbo
+                }
                 self.vao = self.ctx.vertex_array(
                     self.prog,
-                    [
-                        (pos_vbo, '3f', 'in_position'),
-                        (norm_vbo, '3f', 'in_normal')
-                    ],
+                    [(buffers[name], '3f', name) for name in self._active_attributes()],
                     self.ibo
                 )
-                # Store both VBOs for cleanup
+                # Store all VBOs for cleanup
                 self.pos_vbo = pos_vbo
                 self.norm_vbo = norm_vbo
+                self.systole_vbo = systole_vbo
                 logger.info(f"Successfully created VAO with separate buffers: {num_vertices} vertices")
             except Exception as e2:
                 logger.error(f"Both VAO creation attempts failed. First: {e1}, Second: {e2}", exc_info=True)
                 # Try to get more details about the error
                 try:
                     # Check if attributes exist in shader
-                    attrs = list(self.prog.attributes.keys())
+                    attrs = self._active_attributes()
                     logger.error(f"Shader attributes available: {attrs}")
                     logger.error(f"Looking for: in_position, in_normal")
                     logger.error(f"VBO size: {len(vertex_data)} floats, IBO size: {len(faces_flat)} indices")
@@ -274,6 +465,11 @@ class HeartRenderer:
                 self.vao = None
                 return False
         
+        # Variant VAOs bound the previous model's buffers
+        self._vaos = {self.lit: self.vao}
+        # The instanced VAO is created on the first render_instanced()
+        self.instanced_vao = None
+        
         return True
     
     def set_transform(self, transform_matrix: np.ndarray):
@@ -295,8 +491,8 @@ class HeartRenderer:
             up: Up vector
         """
         self.view_matrix = look_at_matrix(eye, target, up)
-        # Debug: log view matrix occasionally
-        if hasattr(self, '_render_debug_count') and self._render_debug_count % 60 == 0:
+        self._camera_dirty = True
+        if self.instrumentation and self._render_debug_count % 60 == 0:
             logger.info(f"View matrix - eye: {eye}, target: {target}, up: {up}")
             logger.info(f"View matrix translation: {self.view_matrix[:3, 3]}")
     
@@ -309,6 +505,39 @@ class HeartRenderer:
         """
         self.beat_scale = max(0.5, min(2.0, scale))  # Clamp between 0.5 and 2.0
     
+    def set_instances(
+        self,
+        transforms: np.ndarray,
+        beat_scales: np.ndarray,
+        colors: Optional[np.ndarray] = None
+    ):
+        """
+        Set per-instance data for instanced rendering.
+        
+        All instances are packed into one preallocated array and uploaded with
+        a single buffer write, regardless of how many people are tracked.
+        
+        Args:
+            transforms: (N, 4, 4) model matrices
+            beat_scales: (N,) heartbeat scale factors (1.0 = normal)
+            colors: (N, 3) RGB colors in 0-1 (default: red)
+        """
+        count = min(len(transforms), self.max_instances)
+        if len(transforms) > self.max_instances:
+            logger.warning(f"Dropping {len(transforms) - self.max_instances} hearts over instance capacity")
+        
+        data = self.instance_data[:count]
+        data['model'] = transforms[:count]
+        data['beat_scale'] = np.clip(beat_scales[:count], 0.5, 2.0)
+        if colors is None:
+            data['color'] = (1.0, 0.0, 0.0)
+        else:
+            data['color'] = colors[:count]
+        
+        self.instance_count = count
+        if self.instance_buffer is not None and count > 0:
+            self.instance_buffer.write(data.tobytes())
+    
     def resize(self, width: int, height: int):
         """
         Resize viewport.
@@ -317,9 +546,15 @@ class HeartRenderer:
             width: New viewport width
             height: New viewport height
         """
+        if (width, height) == (self.width, self.height):
+            return
+        
+        old_aspect = self.width / self.height if self.height > 0 else 1.0
         self.width = width
         self.height = height
-        self._setup_projection()
+        # Projection only depends on the aspect ratio
+        if height <= 0 or abs(width / height - old_aspect) > 1e-6:
+            self._setup_projection()
     
     def render(self):
         """Render the heart model."""
@@ -331,66 +566,56 @@ class HeartRenderer:
                 print("Debug: Shader program is None")
             return
         
-        # Enable depth testing - disable culling to see if model is inside-out
-        self.ctx.enable(moderngl.DEPTH_TEST)
-        self.ctx.disable(moderngl.CULL_FACE)  # Disable culling to see both sides
-        self.ctx.enable(moderngl.BLEND)
-        self.ctx.blend_func = moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA
+        self._apply_gl_state()
+        self._upload_camera()
         
-        # Set viewport - ensure it matches framebuffer size
-        self.ctx.viewport = (0, 0, self.width, self.height)
-        
-        # Set uniforms
-        self.prog['model'].write(self.model_matrix.tobytes())
-        self.prog['view'].write(self.view_matrix.tobytes())
-        self.prog['projection'].write(self.projection_matrix.tobytes())
-        self.prog['beat_scale'].value = self.beat_scale
+        # Per-draw uniforms, skipped if the (possibly shared) program already holds them
+        self.shader_manager.write_uniform(self.prog, 'model', self.model_matrix.tobytes())
+        self.shader_manager.write_uniform(self.prog, 'beat_scale', float(self.beat_scale))
         # Note: color, alpha, and light_dir uniforms removed since shader now outputs fixed red
         
-        # Debug: log transform occasionally
-        if not hasattr(self, '_render_debug_count'):
-            self._render_debug_count = 0
-        self._render_debug_count += 1
-        if self._render_debug_count % 60 == 0:  # Every ~2 seconds at 30fps
-            # Transform a point from model space to clip space to check visibility
-            test_point = np.array([0.0, 0.0, 0.0, 1.0])  # Center of model in model space
-            model_point = self.model_matrix @ test_point
-            view_point = self.view_matrix @ model_point
-            clip_point = self.projection_matrix @ view_point
-            logger.info(f"Model center in clip space: x={clip_point[0]/clip_point[3]:.3f}, y={clip_point[1]/clip_point[3]:.3f}, z={clip_point[2]/clip_point[3]:.3f}, w={clip_point[3]:.3f}")
-            # Check if in view frustum: -w <= x,y,z <= w and 0 < z < w (for perspective)
-            in_frustum = (abs(clip_point[0]) <= abs(clip_point[3]) and 
-                         abs(clip_point[1]) <= abs(clip_point[3]) and 
-                         0 < clip_point[2] and clip_point[2] < clip_point[3])
-            logger.info(f"Heart in view frustum: {in_frustum}")
-            pos = self.model_matrix[:3, 3]
-            scale = np.linalg.norm(self.model_matrix[:3, 0])  # Get scale from first column
-            logger.info(f"Rendering heart at: x={pos[0]:.3f}, y={pos[1]:.3f}, z={pos[2]:.3f}, scale={scale:.3f}")
-            logger.info(f"View matrix: eye at origin, looking at (0,0,-1)")
-            logger.info(f"Projection: FOV=60, near=0.1, far=10.0, aspect={self.width/self.height:.3f}")
-            
-            # Debug: check if model has vertices
-            if self.vao is not None:
-                logger.info(f"VAO exists, attempting to render {len(self.faces) if self.faces is not None else 'unknown'} faces")
-            else:
-                logger.warning("VAO is None!")
-        
-        # Render
-        if self.vao is not None:
-            try:
-                # Try rendering with explicit mode - ModernGL should auto-detect from index buffer
-                # But let's be explicit about it
-                num_indices = len(self.faces.flatten()) if len(self.faces.shape) == 2 else len(self.faces)
-                # Each face is 3 indices, so num_indices is already the total count
-                self.vao.render(moderngl.TRIANGLES)
-                if self._render_debug_count % 60 == 0:
-                    logger.info(f"VAO.render(TRIANGLES) called successfully with {num_indices} indices")
-            except Exception as e:
-                logger.error(f"Error during VAO.render(): {e}", exc_info=True)
-                # Fallback: try without explicit mode
-                try:
-                    self.vao.render()
-                    logger.info("VAO.render() succeeded without explicit mode")
-                except Exception as e2:
-                    logger.error(f"VAO.render() failed both ways: {e}, {e2}", exc_info=True)
-
+        if self.instrumentation:
+            self._render_debug_count += 1
+            if self._render_debug_count % 60 == 0:  # Every ~2 seconds at 30fps
+                self._log_diagnostics()
+        
+        try:
+            self.vao.render(moderngl.TRIANGLES)
+        except Exception as e:
+            logger.error(f"Error during VAO.render(): {e}", exc_info=True)
+    
+    def _log_diagnostics(self):
+        """Log where the model center lands in clip space (instrumentation only)."""
+        # Transform a point from model space to clip space to check visibility
+        test_point = np.array([0.0, 0.0, 0.0, 1.0])  # Center of model in model space
+        model_point = self.model_matrix @ test_point
+        view_point = self.view_matrix @ model_point
+        clip_point = self.projection_matrix @ view_point
+        logger.info(f"Model center in clip space: x={clip_point[0]/clip_point[3]:.3f}, y={clip_point[1]/clip_point[3]:.3f}, z={clip_point[2]/clip_point[3]:.3f}, w={clip_point[3]:.3f}")
+        # Check if in view frustum: -w <= x,y,z <= w and 0 < z < w (for perspective)
+        in_frustum = (abs(clip_point[0]) <= abs(clip_point[3]) and 
+                     abs(clip_point[1]) <= abs(clip_point[3]) and 
+                     0 < clip_point[2] and clip_point[2] < clip_point[3])
+        logger.info(f"Heart in view frustum: {in_frustum}")
+        pos = self.model_matrix[:3, 3]
+        scale = np.linalg.norm(self.model_matrix[:3, 0])  # Get scale from first column
+        logger.info(f"Rendering heart at: x={pos[0]:.3f}, y={pos[1]:.3f}, z={pos[2]:.3f}, scale={scale:.3f}")
+        logger.info(f"View matrix: eye at origin, looking at (0,0,-1)")
+        logger.info(f"Projection: FOV=60, near=0.1, far=10.0, aspect={self.width/self.height:.3f}")
+        num_indices = self.faces.size if self.faces is not None else 'unknown'
+        logger.info(f"Rendering {num_indices} indices")
+    
+    def render_instanced(self):
+        """Render all instances set with set_instances() in a single draw call."""
+        if self.instance_count == 0 or self.vbo is None:
+            return
+        if self.instanced_vao is None:
+            self._create_instanced_vao()
+            if self.instanced_vao is None:
+                return
+        
+        self._apply_gl_state()
+        # Shared camera block is uploaded once for all instances, and only when it changed
+        self._upload_camera()
+        
+        self.instanced_vao.render(moderngl.TRIANGLES, instances=self.instance_count)
@@ -0,0 +1,329 @@
+"""Pre-rendered 3D heart sprite atlas for GPU-less compositing."""
+
+import argparse
+import json
+import logging
+import math
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from ..utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ImpostorAtlas:
+    """
+    Grid of pre-rendered heart sprites indexed by beat phase, yaw and pitch.
+    
+    The atlas is baked once through HeartRenderer on a headless context and
+    stored as a PNG (RGBA) with a JSON sidecar describing the grid. At runtime
+    compositing a heart is a nearest-cell lookup and an alpha blend of a small
+    region, so the 3D look costs no more than the drawn 2D heart.
+    
+    Layout: one row per (pitch, yaw) pair, one column per beat phase.
+    """
+    
+    # Distance from the camera the heart is baked at (model is unit size)
+    BAKE_DISTANCE = 1.6
+    # Supersampling factor used while baking, downsampled for anti-aliasing
+    BAKE_SUPERSAMPLE = 2
+    
+    def __init__(
+        self,
+        atlas: np.ndarray,
+        cell_size: int,
+        beat_steps: int,
+        yaws: np.ndarray,
+        pitches: np.ndarray,
+        beat_amplitude: float
+    ):
+        """
+        Initialize atlas from baked data.
+        
+        Args:
+            atlas: (rows * cell_size, beat_steps * cell_size, 4) BGRA image
+            cell_size: Cell width/height in pixels
+            beat_steps: Number of beat phase columns
+            yaws: Yaw angles in degrees, one per yaw step
+            pitches: Pitch angles in degrees, one per pitch step
+            beat_amplitude: Beat scale amplitude the atlas was baked with
+        """
+        self.atlas = atlas
+        self.cell_size = cell_size
+        self.beat_steps = beat_steps
+        self.yaws = np.asarray(yaws, dtype=np.float32)
+        self.pitches = np.asarray(pitches, dtype=np.float32)
+        self.beat_amplitude = beat_amplitude
+        
+        # Resized sprites keyed by (row, column, size); the heart size only
+        # changes with tracking distance so this stays small
+        self._sprite_cache: Dict[Tuple[int, int, int], Tuple[np.ndarray, np.ndarray]] = {}
+        self._sprite_cache_limit = 512
+    
+    @classmethod
+    def load(cls, path: Path) -> Optional["ImpostorAtlas"]:
+        """
+        Load an atlas and its metadata from disk.
+        
+        Args:
+            path: Atlas PNG path (metadata is read from the .json next to it)
+        
+        Returns:
+            ImpostorAtlas or None if files are missing or unreadable
+        """
+        meta_path = path.with_suffix('.json')
+        if not path.exists() or not meta_path.exists():
+            return None
+        
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            atlas = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+            if atlas is None or atlas.ndim != 3 or atlas.shape[2] != 4:
+                logger.error(f"Impostor atlas {path} is not an RGBA image")
+                return None
+            
+            return cls(
+                atlas,
+                cell_size=int(meta['cell_size']),
+                beat_steps=int(meta['beat_steps']),
+                yaws=np.array(meta['yaws']),
+                pitches=np.array(meta['pitches']),
+                beat_amplitude=float(meta['beat_amplitude'])
+            )
+        except Exception as e:
+            logger.error(f"Error loading impostor atlas {path}: {e}")
+            return None
+    
+    @classmethod
+    def load_or_bake(cls, path: Path, model_path: Path) -> Optional["ImpostorAtlas"]:
+        """
+        Load the atlas, baking it first if it does not exist yet.
+        
+        Args:
+            path: Atlas PNG path
+            model_path: OBJ model to bake from if the atlas is missing
+        
+        Returns:
+            ImpostorAtlas or None if it could not be loaded or baked
+        """
+        atlas = cls.load(path)
+        if atlas is not None:
+            return atlas
+        
+        logger.info(f"Impostor atlas not found, baking from {model_path}")
+        try:
+            cls.bake(model_path, path)
+        except Exception as e:
+            logger.error(f"Error baking impostor atlas: {e}", exc_info=True)
+            return None
+        return cls.load(path)
+    
+    @classmethod
+    def bake(
+        cls,
+        model_path: Path,
+        output_path: Path,
+        cell_size: int = None,
+        beat_steps: int = None,
+        yaw_steps: int = None,
+        pitch_steps: int = None
+    ) -> Path:
+        """
+        Render the heart through HeartRenderer on a headless context into an atlas.
+        
+        Args:
+            model_path: OBJ model to render
+            output_path: Atlas PNG path (JSON metadata written alongside)
+            cell_size: Cell size in pixels (default from config)
+            beat_steps: Beat phases (default from config)
+            yaw_steps: Yaw angles (default from config)
+            pitch_steps: Pitch angles (default from config)
+        
+        Returns:
+            Path of the written atlas
+        
+        Raises:
+            RuntimeError: If no context can be created or the model fails to load
+        """
+        # Imported here so runtime compositing never pulls in GL
+        import moderngl
+        from .headless import create_headless_context
+        from .heart_renderer import HeartRenderer
+        
+        cell_size = cell_size or Config.HEART_IMPOSTOR_CELL_SIZE
+        beat_steps = beat_steps or Config.HEART_IMPOSTOR_BEAT_STEPS
+        yaw_steps = yaw_steps or Config.HEART_IMPOSTOR_YAW_STEPS
+        pitch_steps = pitch_steps or Config.HEART_IMPOSTOR_PITCH_STEPS
+        
+        yaws = np.linspace(-Config.HEART_IMPOSTOR_YAW_RANGE, Config.HEART_IMPOSTOR_YAW_RANGE, yaw_steps)
+        pitches = np.linspace(-Config.HEART_IMPOSTOR_PITCH_RANGE, Config.HEART_IMPOSTOR_PITCH_RANGE, pitch_steps)
+        beat_scales = 1.0 + np.linspace(0.0, Config.HEART_BEAT_SCALE_AMPLITUDE, beat_steps)
+        
+        render_size = cell_size * cls.BAKE_SUPERSAMPLE
+        ctx = create_headless_context()
+        try:
+            color = ctx.texture((render_size, render_size), 4)
+            depth = ctx.depth_texture((render_size, render_size))
+            fbo = ctx.framebuffer(color_attachments=[color], depth_attachment=depth)
+            fbo.use()
+            
+            renderer = HeartRenderer(ctx, render_size, render_size)
+            if not renderer.load_model(model_path):
+                raise RuntimeError(f"Could not load heart model {model_path}")
+            
+            rows = yaw_steps * pitch_steps
+            atlas = np.zeros((rows * cell_size, beat_steps * cell_size, 4), dtype=np.uint8)
+            heart_color = np.array([[0.85, 0.05, 0.1]], dtype=np.float32)
+            
+            for p, pitch in enumerate(pitches):
+                for y, yaw in enumerate(yaws):
+                    transform = cls._bake_transform(yaw, pitch)
+                    row = p * yaw_steps + y
+                    for b, beat_scale in enumerate(beat_scales):
+                        fbo.clear(0.0, 0.0, 0.0, 0.0)
+                        renderer.set_instances(transform[None], np.array([beat_scale]), heart_color)
+                        renderer.render_instanced()
+                        
+                        rgba = np.frombuffer(fbo.read(components=4), dtype=np.uint8)
+                        rgba = rgba.reshape(render_size, render_size, 4)[::-1]  # GL origin is bottom-left
+                        cell = cv2.resize(rgba, (cell_size, cell_size), interpolation=cv2.INTER_AREA)
+                        atlas[row * cell_size:(row + 1) * cell_size, b * cell_size:(b + 1) * cell_size] = \
+                            cv2.cvtColor(cell, cv2.COLOR_RGBA2BGRA)
+        finally:
+            ctx.release()
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        cv2.imwrite(str(output_path), atlas, [cv2.IMWRITE_PNG_COMPRESSION, 9])
+        with open(output_path.with_suffix('.json'), 'w') as f:
+            json.dump({
+                'model': str(model_path),
+                'cell_size': cell_size,
+                'beat_steps': beat_steps,
+                'yaws': yaws.tolist(),
+                'pitches': pitches.tolist(),
+                'beat_amplitude': Config.HEART_BEAT_SCALE_AMPLITUDE
+            }, f, indent=2)
+        
+        logger.info(f"Baked {rows * beat_steps} impostor cells to {output_path}")
+        return output_path
+    
+    @classmethod
+    def _bake_transform(cls, yaw: float, pitch: float) -> np.ndarray:
+        """
+        Build the model matrix for one bake angle, column-major as GL expects.
+        
+        Args:
+            yaw: Rotation about the vertical axis in degrees
+            pitch: Rotation about the horizontal axis in degrees
+        
+        Returns:
+            4x4 float32 matrix ready for upload
+        """
+        yaw_rad = math.radians(yaw)
+        pitch_rad = math.radians(pitch)
+        cy, sy = math.cos(yaw_rad), math.sin(yaw_rad)
+        cp, sp = math.cos(pitch_rad), math.sin(pitch_rad)
+        
+        rot_y = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]], dtype=np.float32)
+        rot_x = np.array([[1, 0, 0], [0, cp, -sp], [0, sp, cp]], dtype=np.float32)
+        
+        transform = np.eye(4, dtype=np.float32)
+        transform[:3, :3] = rot_x @ rot_y
+        transform[2, 3] = -cls.BAKE_DISTANCE
+        return np.ascontiguousarray(transform.T)
+    
+    def get_cell(self, beat_scale: float, yaw: float, pitch: float) -> Tuple[int, int]:
+        """
+        Find the nearest atlas cell for the current pose and beat.
+        
+        Args:
+            beat_scale: Heartbeat scale (1.0 = rest)
+            yaw: Chest yaw in degrees
+            pitch: Chest pitch in degrees
+        
+        Returns:
+            (row, column) of the nearest cell
+        """
+        phase = (beat_scale - 1.0) / self.beat_amplitude if self.beat_amplitude > 0 else 0.0
+        column = int(round(min(max(phase, 0.0), 1.0) * (self.beat_steps - 1)))
+        yaw_index = int(np.argmin(np.abs(self.yaws - yaw)))
+        pitch_index = int(np.argmin(np.abs(self.pitches - pitch)))
+        return pitch_index * len(self.yaws) + yaw_index, column
+    
+    def _get_sprite(self, row: int, column: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get a cell resized to size, as (BGR float32, alpha float32) arrays."""
+        key = (row, column, size)
+        sprite = self._sprite_cache.get(key)
+        if sprite is None:
+            c = self.cell_size
+            cell = self.atlas[row * c:(row + 1) * c, column * c:(column + 1) * c]
+            if size != c:
+                cell = cv2.resize(cell, (size, size), interpolation=cv2.INTER_AREA)
+            alpha = cell[:, :, 3:4].astype(np.float32) / 255.0
+            sprite = (cell[:, :, :3].astype(np.float32) * alpha, alpha)
+            if len(self._sprite_cache) >= self._sprite_cache_limit:
+                self._sprite_cache.clear()
+            self._sprite_cache[key] = sprite
+        return sprite
+    
+    def composite(
+        self,
+        img: np.ndarray,
+        center_x: int,
+        center_y: int,
+        size: int,
+        beat_scale: float,
+        yaw: float = 0.0,
+        pitch: float = 0.0
+    ):
+        """
+        Alpha-blend the nearest heart sprite onto an image in place.
+        
+        Args:
+            img: Image to draw on (BGR format)
+            center_x: X coordinate of heart center
+            center_y: Y coordinate of heart center
+            size: Sprite width/height in pixels
+            beat_scale: Heartbeat scale (1.0 = rest)
+            yaw: Chest yaw in degrees
+            pitch: Chest pitch in degrees
+        """
+        if size <= 0:
+            return
+        
+        row, column = self.get_cell(beat_scale, yaw, pitch)
+        premultiplied, alpha = self._get_sprite(row, column, size)
+        
+        # Clip the sprite rectangle to the frame
+        height, width = img.shape[:2]
+        x0 = center_x - size // 2
+        y0 = center_y - size // 2
+        sx0, sy0 = max(0, -x0), max(0, -y0)
+        sx1 = size - max(0, x0 + size - width)
+        sy1 = size - max(0, y0 + size - height)
+        if sx1 <= sx0 or sy1 <= sy0:
+            return
+        
+        roi = img[y0 + sy0:y0 + sy1, x0 + sx0:x0 + sx1]
+        a = alpha[sy0:sy1, sx0:sx1]
+        blended = premultiplied[sy0:sy1, sx0:sx1] + roi.astype(np.float32) * (1.0 - a)
+        roi[:] = blended.astype(np.uint8)
+
+
+def main():
+    """Bake the impostor atlas offline."""
+    parser = argparse.ArgumentParser(description="Bake the pre-rendered heart impostor atlas")
+    parser.add_argument('--model', type=Path, default=Config.HEART_LOW_POLY, help="OBJ model to render")
+    parser.add_argument('--output', type=Path, default=Config.HEART_IMPOSTOR_ATLAS, help="Atlas PNG path")
+    parser.add_argument('--cell-size', type=int, default=Config.HEART_IMPOSTOR_CELL_SIZE)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    ImpostorAtlas.bake(args.model, args.output, cell_size=args.cell_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 """3D model loading using trimesh."""
 
+import hashlib
+import cv2
 import trimesh
 import numpy as np
 from pathlib import Path
@@ -16,6 +18,9 @@ class ModelLoader:
         self.vertices: Optional[np.ndarray] = None
         self.faces: Optional[np.ndarray] = None
         self.normals: Optional[np.ndarray] = None
+        self.uvs: Optional[np.ndarray] = None
+        self.systole_offsets: Optional[np.ndarray] = None
+        self.model_path: Optional[Path] = None
     
     def load_model(self, model_path: Path, use_low_poly: bool = True) -> bool:
         """
@@ -57,6 +62,16 @@ class ModelLoader:
                 self.mesh.fix_normals()
                 self.normals = np.array(self.mesh.vertex_normals, dtype=np.float32)
             
+            # Texture coordinates (only present when the OBJ has vt entries)
+            uv = getattr(self.mesh.visual, 'uv', None)
+            if uv is not None and len(uv) == len(self.vertices):
+                self.uvs = np.array(uv, dtype=np.float32)
+            else:
+                self.uvs = None
+            
+            self.model_path = model_path
+            self.systole_offsets = None
+            
             # Center and normalize model
             self._normalize_model()
             
@@ -91,6 +106,130 @@ class ModelLoader:
         """
         return self.vertices, self.faces, self.normals
     
+    def compute_systole_offsets(
+        self,
+        displacement_map: Optional[Path] = None,
+        contraction: Optional[float] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Compute per-vertex displacement from the rest pose to peak systole.
+        
+        The field is region weighted: the ventricles (lower part of the model)
+        squeeze towards the long axis and shorten towards the base, while the
+        atria expand slightly as they fill. When the mesh has UVs and a
+        displacement map is available, the map modulates the magnitude so
+        thick muscle moves more than vessels. Results are cached on disk in
+        Config.CACHE_DIR keyed by model, map and contraction amount.
+        
+        Args:
+            displacement_map: Grayscale displacement map (default from config)
+            contraction: Peak contraction as fraction of radius (default from config)
+        
+        Returns:
+            (N, 3) float32 array of offsets, or None if no model is loaded
+        """
+        if self.vertices is None:
+            return None
+        
+        if displacement_map is None:
+            displacement_map = Config.HEART_DISPLACEMENT_MAP
+        if contraction is None:
+            contraction = Config.HEART_SYSTOLE_CONTRACTION
+        
+        use_map = self.uvs is not None and displacement_map.exists()
+        cache_path = self._systole_cache_path(displacement_map if use_map else None, contraction)
+        if cache_path is not None and cache_path.exists():
+            try:
+                offsets = np.load(cache_path)
+                if offsets.shape == self.vertices.shape:
+                    self.systole_offsets = offsets.astype(np.float32)
+                    return self.systole_offsets
+            except Exception as e:
+                print(f"Warning: Ignoring unreadable morph target cache {cache_path}: {e}")
+        
+        # Height along the long axis: 0 at the apex, 1 at the great vessels
+        y = self.vertices[:, 1]
+        y_min, y_max = float(np.min(y)), float(np.max(y))
+        height = (y - y_min) / (y_max - y_min) if y_max > y_min else np.zeros_like(y)
+        
+        # Smooth ventricle/atrium split around 60% of the height
+        t = np.clip((height - 0.5) / 0.25, 0.0, 1.0)
+        atrial_weight = t * t * (3.0 - 2.0 * t)
+        ventricular_weight = 1.0 - atrial_weight
+        
+        # Radial direction from the long axis through the ventricle centroid
+        ventricles = ventricular_weight > 0.5
+        axis_source = self.vertices[ventricles] if np.any(ventricles) else self.vertices
+        axis_xz = np.mean(axis_source[:, [0, 2]], axis=0)
+        radial = np.zeros_like(self.vertices)
+        radial[:, 0] = self.vertices[:, 0] - axis_xz[0]
+        radial[:, 2] = self.vertices[:, 2] - axis_xz[1]
+        
+        offsets = np.zeros_like(self.vertices)
+        # Ventricles squeeze inwards and the apex pulls up towards the base
+        offsets -= radial * (contraction * ventricular_weight)[:, None]
+        offsets[:, 1] += (1.0 - height) * (y_max - y_min) * contraction * 0.3 * ventricular_weight
+        # Atria fill while the ventricles contract
+        offsets += radial * (contraction * 0.25 * atrial_weight)[:, None]
+        
+        if use_map:
+            offsets *= self._sample_displacement_map(displacement_map)[:, None]
+        
+        self.systole_offsets = offsets.astype(np.float32)
+        
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                np.save(cache_path, self.systole_offsets)
+            except Exception as e:
+                print(f"Warning: Could not write morph target cache {cache_path}: {e}")
+        
+        return self.systole_offsets
+    
+    def _sample_displacement_map(self, displacement_map: Path) -> np.ndarray:
+        """
+        Sample a grayscale displacement map at each vertex UV.
+        
+        Args:
+            displacement_map: Path to the displacement image
+        
+        Returns:
+            Per-vertex magnitude multipliers in [0.5, 1.5] (1.0 where unavailable)
+        """
+        ones = np.ones(len(self.vertices), dtype=np.float32)
+        image = cv2.imread(str(displacement_map), cv2.IMREAD_GRAYSCALE)
+        if image is None or self.uvs is None:
+            return ones
+        
+        h, w = image.shape[:2]
+        u = np.mod(self.uvs[:, 0], 1.0)
+        v = np.mod(self.uvs[:, 1], 1.0)
+        # OBJ UV origin is bottom-left, image origin is top-left
+        px = np.clip((u * (w - 1)).astype(np.int32), 0, w - 1)
+        py = np.clip(((1.0 - v) * (h - 1)).astype(np.int32), 0, h - 1)
+        samples = image[py, px].astype(np.float32) / 255.0
+        
+        # Normalize around the map mean so the overall contraction is preserved
+        mean = float(np.mean(samples))
+        if mean <= 0:
+            return ones
+        return np.clip(0.5 + 0.5 * samples / mean, 0.5, 1.5).astype(np.float32)
+    
+    def _systole_cache_path(self, displacement_map: Optional[Path], contraction: float) -> Optional[Path]:
+        """Build the cache file path for the current model's morph targets."""
+        if self.model_path is None or not self.model_path.exists():
+            return None
+        
+        key = hashlib.sha1()
+        stat = self.model_path.stat()
+        key.update(f"{self.model_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        key.update(f"{len(self.vertices)}:{contraction:.6f}".encode())
+        if displacement_map is not None:
+            map_stat = displacement_map.stat()
+            key.update(f"{displacement_map.resolve()}:{map_stat.st_size}:{map_stat.st_mtime_ns}".encode())
+        
+        return Config.CACHE_DIR / "morph_targets" / f"{self.model_path.stem}_{key.hexdigest()[:16]}.npy"
+    
     def get_bounding_box(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
         """
         Get model bounding box.
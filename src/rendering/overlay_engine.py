@@ -1,31 +1,40 @@
 """Video and 3D overlay compositing engine."""
 
+import logging
+import threading
 import numpy as np
 import cv2
 import moderngl
 from typing import Optional, Tuple
 from moderngl import Context
 from .heart_renderer import HeartRenderer
+from .impostor_atlas import ImpostorAtlas
+from .render_target_pool import RenderTarget, RenderTargetPool
+from ..utils import clock
+from ..utils.config import Config
+
+logger = logging.getLogger(__name__)
 
 
 class OverlayEngine:
     """Composites video frames with 3D heart overlay."""
     
-    def __init__(self, ctx: Context, width: int, height: int):
+    def __init__(self, ctx: Optional[Context], width: int, height: int):
         """
         Initialize overlay engine.
         
         Args:
-            ctx: ModernGL context
+            ctx: ModernGL context, or None for CPU-only 2D compositing
+                (a context can be attached later with attach_context)
             width: Video width
             height: Video height
         """
-        self.ctx = ctx
+        self.ctx: Optional[Context] = None
         self.width = width
         self.height = height
         
-        # Heart renderer (shelved for now)
-        self.heart_renderer = HeartRenderer(ctx, width, height)
+        # Heart renderer (shelved for now), only exists once a context is attached
+        self.heart_renderer: Optional[HeartRenderer] = None
         
         # Chest position for simple circle overlay (2D screen coordinates)
         self.chest_position_2d: Optional[Tuple[int, int]] = None
@@ -33,44 +42,140 @@ class OverlayEngine:
         # Heartbeat animation scale (1.0 = normal, >1.0 = expanded)
         self.beat_scale = 1.0
         
+        # Chest rotation in degrees, selects the impostor atlas view
+        self.chest_yaw = 0.0
+        self.chest_pitch = 0.0
+        
+        # Pre-rendered 3D heart sprites; the drawn heart is used until this is ready
+        self.impostor_atlas: Optional[ImpostorAtlas] = None
+        if Config.HEART_IMPOSTOR_ENABLED:
+            # Baking needs its own GL context, which must not disturb the caller's
+            # current context, so it runs on a worker thread
+            threading.Thread(target=self._load_impostor_atlas, daemon=True).start()
+        
         # Framebuffer for rendering (not used for simple circle, but kept for future)
+        # Taken from a size-bucketed pool on first use by get_framebuffer();
+        # fbo/color_texture/depth_texture alias the current target
+        self.render_target_pool: Optional[RenderTargetPool] = None
+        self.render_target: Optional[RenderTarget] = None
         self.fbo: Optional[moderngl.Framebuffer] = None
         self.color_texture: Optional[moderngl.Texture] = None
         self.depth_texture: Optional[moderngl.Texture] = None
         
-        self._setup_framebuffer()
+        # Resize storms (window drags, display reconfiguration) are debounced:
+        # the latest size is applied once no resize arrived for RESIZE_DEBOUNCE_S
+        self._pending_size: Optional[Tuple[int, int]] = None
+        self._resize_requested_at = 0.0
+        self.resize_requests = 0
+        self.resizes_applied = 0
+        
+        if ctx is not None:
+            self.attach_context(ctx)
+    
+    def attach_context(self, ctx: Context):
+        """
+        Attach a ModernGL context and create the GL-side heart renderer.
+        
+        Args:
+            ctx: ModernGL context (must be current)
+        """
+        self.ctx = ctx
+        self.heart_renderer = HeartRenderer(ctx, self.width, self.height)
+        self.render_target_pool = RenderTargetPool(ctx)
     
-    def _setup_framebuffer(self):
-        """Setup framebuffer for off-screen rendering."""
-        # Create color texture
-        self.color_texture = self.ctx.texture((self.width, self.height), 4)  # RGBA
-        self.color_texture.filter = (moderngl.LINEAR, moderngl.LINEAR)
+    def get_framebuffer(self) -> Optional[moderngl.Framebuffer]:
+        """
+        Get the off-screen framebuffer, acquiring a pooled target on first use.
+        
+        The target may be larger than width x height; render into the
+        (0, 0, width, height) viewport, as HeartRenderer does.
+        
+        Returns:
+            Framebuffer or None if no context is attached
+        """
+        if self.ctx is None:
+            return None
         
-        # Create depth texture
-        self.depth_texture = self.ctx.depth_texture((self.width, self.height))
-        self.depth_texture.filter = (moderngl.LINEAR, moderngl.LINEAR)
+        self.apply_pending_resize()
         
-        # Create framebuffer
-        self.fbo = self.ctx.framebuffer(
-            color_attachments=[self.color_texture],
-            depth_attachment=self.depth_texture
-        )
+        if self.render_target is None or not self.render_target.fits(self.width, self.height):
+            if self.render_target is not None:
+                self.render_target_pool.release(self.render_target)
+            self.render_target = self.render_target_pool.acquire(self.width, self.height)
+            self.fbo = self.render_target.fbo
+            self.color_texture = self.render_target.color_texture
+            self.depth_texture = self.render_target.depth_texture
+        
+        return self.fbo
+    
+    def apply_pending_resize(self, force: bool = False):
+        """
+        Apply the most recent resize once the resize storm has settled.
+        
+        Args:
+            force: Apply immediately, ignoring the debounce interval
+        """
+        if self._pending_size is None:
+            return
+        if not force and clock.now() - self._resize_requested_at < Config.RESIZE_DEBOUNCE_S:
+            return
+        
+        self.width, self.height = self._pending_size
+        self._pending_size = None
+        self.resizes_applied += 1
+        
+        # Resize heart renderer
+        if self.heart_renderer is not None:
+            self.heart_renderer.resize(self.width, self.height)
+    
+    def compile_pending_shaders(self):
+        """Compile deferred shader variants a few at a time (call between frames)."""
+        if self.heart_renderer is not None:
+            self.heart_renderer.shader_manager.compile_pending()
+    
+    def get_render_target_stats(self) -> dict:
+        """
+        Get render target allocation and resize counters.
+        
+        Returns:
+            Pool counters plus resize_requests and resizes_applied
+        """
+        stats = self.render_target_pool.get_stats() if self.render_target_pool is not None else {}
+        stats['resize_requests'] = self.resize_requests
+        stats['resizes_applied'] = self.resizes_applied
+        return stats
     
     def load_heart_model(self, model_path):
         """Load heart model."""
+        if self.heart_renderer is None:
+            logger.error("Cannot load heart model: no OpenGL context attached")
+            return False
         return self.heart_renderer.load_model(model_path)
     
     def set_heart_transform(self, transform_matrix: np.ndarray):
         """Set heart transformation matrix."""
-        self.heart_renderer.set_transform(transform_matrix)
+        if self.heart_renderer is not None:
+            self.heart_renderer.set_transform(transform_matrix)
     
     def set_heart_beat_scale(self, scale: float):
         """Set heart beat animation scale."""
-        self.heart_renderer.set_beat_scale(scale)
+        if self.heart_renderer is not None:
+            self.heart_renderer.set_beat_scale(scale)
+    
+    def set_heart_instances(
+        self,
+        transforms: np.ndarray,
+        beat_scales: np.ndarray,
+        colors: Optional[np.ndarray] = None
+    ):
+        """Set per-person heart transforms, beat scales and colors for instanced rendering."""
+        if self.heart_renderer is not None:
+            self.heart_renderer.set_instances(transforms, beat_scales, colors)
     
     def set_view(self, eye: np.ndarray, target: np.ndarray, up: np.ndarray = np.array([0, 0, 1])):
         """Set camera view."""
-        self.heart_renderer.set_view(eye, target, up)
+        if self.heart_renderer is not None:
+            self.heart_renderer.set_view(eye, target, up)
     
     def set_chest_position_2d(self, x: int, y: int):
         """
@@ -82,6 +187,26 @@ class OverlayEngine:
         """
         self.chest_position_2d = (x, y)
     
+    def _load_impostor_atlas(self):
+        """Load (or bake on first run) the impostor atlas in the background."""
+        atlas = ImpostorAtlas.load_or_bake(Config.HEART_IMPOSTOR_ATLAS, Config.HEART_LOW_POLY)
+        if atlas is not None:
+            self.impostor_atlas = atlas
+            logger.info("Heart impostor atlas ready")
+        else:
+            logger.warning("Heart impostor atlas unavailable, using drawn heart")
+    
+    def set_chest_rotation(self, yaw: float, pitch: float):
+        """
+        Set chest rotation used to pick the impostor view.
+        
+        Args:
+            yaw: Rotation about the vertical axis in degrees
+            pitch: Forward/backward lean in degrees
+        """
+        self.chest_yaw = yaw
+        self.chest_pitch = pitch
+    
     def set_beat_scale(self, scale: float):
         """
         Set heartbeat animation scale.
@@ -120,8 +245,16 @@ class OverlayEngine:
             # Base size scales with beat_scale (1.0 = normal, >1.0 = expanded)
             # Heart is 3x bigger (was 40, now 120)
             base_size = 120
-            animated_size = int(base_size * self.beat_scale)
-            self._draw_heart(result, int(x), int(y), size=animated_size)
+            atlas = self.impostor_atlas
+            if atlas is not None:
+                # The beat is baked into the atlas cells, so the sprite size stays fixed
+                atlas.composite(
+                    result, int(x), int(y), int(base_size * 1.5),
+                    self.beat_scale, self.chest_yaw, self.chest_pitch
+                )
+            else:
+                animated_size = int(base_size * self.beat_scale)
+                self._draw_heart(result, int(x), int(y), size=animated_size)
         
         return result
     
@@ -161,20 +294,26 @@ class OverlayEngine:
         cv2.circle(img, right_circle_center, radius, (0, 0, 255), 2)
         cv2.polylines(img, [triangle_pts], isClosed=True, color=(0, 0, 255), thickness=2)
     
-    def resize(self, width: int, height: int):
+    def resize(self, width: int, height: int, immediate: bool = False):
         """
         Resize overlay engine.
         
+        The new size is applied by apply_pending_resize() once resizing has
+        settled, and reuses a pooled render target whenever one is big enough.
+        
         Args:
             width: New width
             height: New height
+            immediate: Apply now instead of debouncing (e.g. initial sizing)
         """
-        self.width = width
-        self.height = height
+        if self._pending_size is None and (width, height) == (self.width, self.height):
+            return
         
-        # Recreate framebuffer
-        self._setup_framebuffer()
+        self._pending_size = (width, height)
+        self._resize_requested_at = clock.now()
+        self.resize_requests += 1
         
-        # Resize heart renderer
-        self.heart_renderer.resize(width, height)
+        # Without a context there is nothing to reallocate, so no reason to wait
+        if immediate or self.ctx is None:
+            self.apply_pending_resize(force=True)
 
@@ -0,0 +1,154 @@
+"""Pooled off-screen render targets with size bucketing."""
+
+import logging
+import moderngl
+from typing import Dict, List
+from ..utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class RenderTarget:
+    """Framebuffer with RGBA color and depth attachments."""
+    
+    def __init__(self, ctx: moderngl.Context, width: int, height: int):
+        """
+        Allocate a render target.
+        
+        Args:
+            ctx: ModernGL context
+            width: Allocated width in pixels
+            height: Allocated height in pixels
+        """
+        self.width = width
+        self.height = height
+        self.in_use = False
+        
+        self.color_texture = ctx.texture((width, height), 4)  # RGBA
+        self.color_texture.filter = (moderngl.LINEAR, moderngl.LINEAR)
+        self.depth_texture = ctx.depth_texture((width, height))
+        self.fbo = ctx.framebuffer(
+            color_attachments=[self.color_texture],
+            depth_attachment=self.depth_texture
+        )
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate GPU memory used (RGBA8 color + 32-bit depth)."""
+        return self.width * self.height * 8
+    
+    def fits(self, width: int, height: int) -> bool:
+        """Check whether a viewport of the given size fits in this target."""
+        return self.width >= width and self.height >= height
+    
+    def release(self):
+        """Release GL resources."""
+        self.fbo.release()
+        self.color_texture.release()
+        self.depth_texture.release()
+
+
+class RenderTargetPool:
+    """
+    Reuses render targets across resizes.
+    
+    Targets are allocated with dimensions rounded up to a bucket size and any
+    free target at least as large as the request is reused, with the caller
+    rendering into a (0, 0, width, height) sub-viewport. Growing a window by a
+    few pixels therefore usually costs nothing, and shrinking never allocates.
+    """
+    
+    def __init__(self, ctx: moderngl.Context, bucket_size: int = None, max_targets: int = None):
+        """
+        Initialize pool.
+        
+        Args:
+            ctx: ModernGL context
+            bucket_size: Allocation granularity in pixels (default from config)
+            max_targets: Maximum targets kept alive (default from config)
+        """
+        self.ctx = ctx
+        self.bucket_size = bucket_size or Config.RENDER_TARGET_BUCKET
+        self.max_targets = max_targets or Config.RENDER_TARGET_POOL_SIZE
+        self.targets: List[RenderTarget] = []
+        
+        # Counters for verifying allocation churn
+        self.allocations = 0
+        self.reuses = 0
+        self.evictions = 0
+    
+    def _bucket(self, size: int) -> int:
+        """Round a dimension up to the bucket size."""
+        return max(self.bucket_size, -(-size // self.bucket_size) * self.bucket_size)
+    
+    def acquire(self, width: int, height: int) -> RenderTarget:
+        """
+        Get a target at least width x height, reusing a free one if possible.
+        
+        Args:
+            width: Required width in pixels
+            height: Required height in pixels
+        
+        Returns:
+            Render target marked in use; hand it back with release()
+        """
+        free = [t for t in self.targets if not t.in_use and t.fits(width, height)]
+        if free:
+            # Smallest fitting target wastes the least fill rate
+            target = min(free, key=lambda t: t.width * t.height)
+            self.reuses += 1
+        else:
+            self._evict_for_new_target()
+            target = RenderTarget(self.ctx, self._bucket(width), self._bucket(height))
+            self.targets.append(target)
+            self.allocations += 1
+            logger.debug(
+                f"Allocated render target {target.width}x{target.height} for {width}x{height} "
+                f"({self.allocations} allocations)"
+            )
+        
+        target.in_use = True
+        return target
+    
+    def release(self, target: RenderTarget):
+        """
+        Return a target to the pool for reuse.
+        
+        Args:
+            target: Target obtained from acquire()
+        """
+        target.in_use = False
+    
+    def _evict_for_new_target(self):
+        """Free the largest idle target if the pool is full."""
+        if len(self.targets) < self.max_targets:
+            return
+        idle = [t for t in self.targets if not t.in_use]
+        if not idle:
+            return
+        victim = max(idle, key=lambda t: t.width * t.height)
+        self.targets.remove(victim)
+        victim.release()
+        self.evictions += 1
+    
+    def clear(self):
+        """Release all targets."""
+        for target in self.targets:
+            target.release()
+        self.evictions += len(self.targets)
+        self.targets.clear()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get allocation counters.
+        
+        Returns:
+            Dict with allocations, reuses, evictions, live target count and bytes
+        """
+        return {
+            'allocations': self.allocations,
+            'reuses': self.reuses,
+            'evictions': self.evictions,
+            'live_targets': len(self.targets),
+            'live_bytes': sum(t.nbytes for t in self.targets),
+        }
@@ -0,0 +1,271 @@
+"""GLSL program loading, variant caching and shader cache configuration."""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import moderngl
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from ..utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# (vertex file, fragment file, sorted define items)
+ProgramKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+def enable_driver_shader_cache(cache_dir: Optional[Path] = None):
+    """
+    Point the OpenGL driver's on-disk shader cache at the project cache.
+    
+    ModernGL does not expose glGetProgramBinary/glProgramBinary, so linked
+    binaries are cached by the driver instead: Mesa and NVIDIA both keep a
+    disk cache keyed by driver build and shader source, and reuse it across
+    launches when enabled. macOS caches compiled shaders itself. The driver
+    reads these variables when it is loaded, so call this before the first
+    context is created. Values already set in the environment win.
+    
+    Args:
+        cache_dir: Cache directory (default: Config.CACHE_DIR / "shaders")
+    """
+    cache_dir = Path(cache_dir or Config.CACHE_DIR / "shaders")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Mesa (Linux, including llvmpipe)
+    os.environ.setdefault('MESA_SHADER_CACHE_DIR', str(cache_dir))
+    # NVIDIA proprietary driver
+    os.environ.setdefault('__GL_SHADER_DISK_CACHE', '1')
+    os.environ.setdefault('__GL_SHADER_DISK_CACHE_PATH', str(cache_dir))
+    os.environ.setdefault('__GL_SHADER_DISK_CACHE_SKIP_CLEANUP', '1')
+
+
+class ShaderManager:
+    """
+    Loads shader sources from Config.SHADERS_DIR and caches linked programs.
+    
+    Variants are the same source files compiled with different #define
+    lines (e.g. LIT) and are linked at most once per context, so switching
+    between them after the first use is a dictionary lookup. Variants that
+    are not needed for the first frame can be queued with preload() and
+    compiled a few at a time between frames with compile_pending().
+    
+    Renderers sharing a manager share its programs, so the last value
+    written to each uniform is tracked here per program (write_uniform()),
+    along with the renderer whose GL state is current (state_owner):
+    a renderer only skips an upload nobody else has overwritten since.
+    
+    Link times are recorded in a manifest under Config.CACHE_DIR, keyed by
+    driver vendor/renderer/version and source hash, so cold and warm
+    (driver-cached) startups can be told apart in the logs. The manifest is
+    written once the preload queue has drained, not after every link.
+    """
+    
+    def __init__(self, ctx: moderngl.Context, shaders_dir: Optional[Path] = None):
+        """
+        Initialize shader manager.
+        
+        Args:
+            ctx: ModernGL context programs are created on
+            shaders_dir: Directory containing .vert/.frag files (default from config)
+        """
+        self.ctx = ctx
+        self.shaders_dir = Path(shaders_dir or Config.SHADERS_DIR)
+        
+        self._sources: Dict[str, str] = {}
+        self._programs: Dict[ProgramKey, moderngl.Program] = {}
+        self._pending: "OrderedDict[ProgramKey, None]" = OrderedDict()
+        self._uploaded: Dict[int, Dict[str, object]] = {}  # Program glo -> uniform name -> last value written
+        self.state_owner: Optional[object] = None  # Renderer that last applied GL state on ctx
+        
+        info = ctx.info
+        self.driver_key = hashlib.sha1(
+            f"{info.get('GL_VENDOR')}|{info.get('GL_RENDERER')}|{info.get('GL_VERSION')}".encode()
+        ).hexdigest()[:16]
+        self.manifest_path = Config.CACHE_DIR / "shaders" / "manifest.json"
+        self._manifest: Optional[dict] = None
+        self._manifest_dirty = False
+    
+    @staticmethod
+    def make_key(vertex: str, fragment: str, defines: Optional[Dict[str, object]] = None) -> ProgramKey:
+        """Build the cache key for a program variant."""
+        items = tuple(sorted((name, str(value)) for name, value in (defines or {}).items()))
+        return (vertex, fragment, items)
+    
+    def load_source(self, name: str) -> str:
+        """
+        Read a shader source file (cached).
+        
+        Args:
+            name: File name relative to the shaders directory
+        
+        Returns:
+            GLSL source
+        """
+        source = self._sources.get(name)
+        if source is None:
+            source = (self.shaders_dir / name).read_text()
+            self._sources[name] = source
+        return source
+    
+    @staticmethod
+    def _apply_defines(source: str, defines: Tuple[Tuple[str, str], ...]) -> str:
+        """Insert #define lines after the #version directive."""
+        if not defines:
+            return source
+        lines = source.splitlines()
+        insert_at = next((i + 1 for i, line in enumerate(lines) if line.strip().startswith('#version')), 0)
+        lines[insert_at:insert_at] = [f"#define {name} {value}" for name, value in defines]
+        return '\n'.join(lines) + '\n'
+    
+    def get_program(
+        self,
+        vertex: str,
+        fragment: str,
+        defines: Optional[Dict[str, object]] = None
+    ) -> moderngl.Program:
+        """
+        Get a linked program, compiling it on first use.
+        
+        Args:
+            vertex: Vertex shader file name
+            fragment: Fragment shader file name
+            defines: Preprocessor defines selecting the variant
+        
+        Returns:
+            Linked program (shared by all callers of this manager)
+        """
+        key = self.make_key(vertex, fragment, defines)
+        program = self._programs.get(key)
+        if program is None:
+            program = self._compile(key)
+        return program
+    
+    def write_uniform(self, program: moderngl.Program, name: str, value) -> bool:
+        """
+        Upload a uniform unless the program already holds this value.
+        
+        Args:
+            program: Program from this manager
+            name: Uniform name
+            value: bytes (written raw, e.g. a matrix) or a value for .value
+        
+        Returns:
+            True if the uniform was uploaded
+        """
+        uploaded = self._uploaded.setdefault(program.glo, {})
+        if name in uploaded and uploaded[name] == value:
+            return False
+        if isinstance(value, bytes):
+            program[name].write(value)
+        else:
+            program[name].value = value
+        uploaded[name] = value
+        return True
+    
+    def preload(self, variants: Iterable[Tuple[str, str, Optional[Dict[str, object]]]]):
+        """
+        Queue program variants for compile_pending().
+        
+        Args:
+            variants: (vertex, fragment, defines) tuples
+        """
+        for vertex, fragment, defines in variants:
+            key = self.make_key(vertex, fragment, defines)
+            if key not in self._programs:
+                self._pending[key] = None
+    
+    def compile_pending(self, time_budget: float = 0.004) -> int:
+        """
+        Compile queued variants until the time budget is used up.
+        
+        GL objects can only be created on the thread that owns the context,
+        so this is meant to be called between frames (at least one program is
+        compiled per call).
+        
+        Args:
+            time_budget: Seconds to spend per call
+        
+        Returns:
+            Number of programs still queued
+        """
+        deadline = time.perf_counter() + time_budget
+        while self._pending:
+            key, _ = self._pending.popitem(last=False)
+            if key not in self._programs:
+                try:
+                    self._compile(key)
+                except Exception as e:
+                    logger.error(f"Error precompiling shader variant {key}: {e}")
+            if time.perf_counter() >= deadline:
+                break
+        if not self._pending:
+            self._save_manifest()
+        return len(self._pending)
+    
+    def _compile(self, key: ProgramKey) -> moderngl.Program:
+        """Compile and link one variant and record it in the manifest."""
+        vertex, fragment, defines = key
+        vertex_source = self._apply_defines(self.load_source(vertex), defines)
+        fragment_source = self._apply_defines(self.load_source(fragment), defines)
+        source_hash = hashlib.sha1((vertex_source + '\0' + fragment_source).encode()).hexdigest()[:16]
+        
+        start = time.perf_counter()
+        program = self.ctx.program(vertex_shader=vertex_source, fragment_shader=fragment_source)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        
+        self._programs[key] = program
+        self._pending.pop(key, None)
+        
+        variant = ','.join(f"{name}={value}" for name, value in defines) or 'default'
+        seen = self._record(source_hash, elapsed_ms)
+        logger.info(
+            f"Linked {vertex}+{fragment} [{variant}] in {elapsed_ms:.1f} ms "
+            f"({'previously linked on this driver' if seen else 'first link on this driver'})"
+        )
+        return program
+    
+    def _record(self, source_hash: str, elapsed_ms: float) -> bool:
+        """
+        Record a link time in the manifest (saved now unless variants are queued).
+        
+        Returns:
+            True if this source was linked on this driver before
+        """
+        if self._manifest is None:
+            try:
+                self._manifest = json.loads(self.manifest_path.read_text())
+            except (OSError, ValueError):
+                self._manifest = {}
+        
+        driver_entries = self._manifest.setdefault(self.driver_key, {})
+        seen = source_hash in driver_entries
+        driver_entries[source_hash] = round(elapsed_ms, 2)
+        self._manifest_dirty = True
+        # compile_pending() saves once the queue drains
+        if not self._pending:
+            self._save_manifest()
+        return seen
+    
+    def _save_manifest(self):
+        """Write the manifest if links were recorded since the last write."""
+        if not self._manifest_dirty:
+            return
+        self._manifest_dirty = False
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            self.manifest_path.write_text(json.dumps(self._manifest, indent=2))
+        except OSError as e:
+            logger.debug(f"Could not write shader manifest: {e}")
+    
+    def release(self):
+        """Release all cached programs."""
+        self._save_manifest()
+        for program in self._programs.values():
+            program.release()
+        self._programs.clear()
+        self._pending.clear()
+        self._uploaded.clear()
+        self.state_owner = None
@@ -1,161 +1,157 @@
 """Main application window."""
 
-from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QPushButton, QLabel, QComboBox, QHBoxLayout, QApplication, QGraphicsDropShadowEffect
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, QSize, QEvent
-from PyQt6.QtGui import QImage, QPixmap, QFont, QFontMetrics, QColor
+from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QHBoxLayout, QApplication
+from PyQt6.QtCore import Qt, QTimer, QObject, pyqtSignal, QSize, QEvent
+from PyQt6.QtGui import QFont, QFontMetrics, QColor
 from PyQt6.QtMultimedia import QMediaDevices, QCameraDevice
 import cv2
 import numpy as np
 import asyncio
 import logging
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 # Set up logging
 logger = logging.getLogger(__name__)
 from .opengl_widget import OpenGLWidget
+from .video_view import VideoView
+from .overlay_widgets import GlowLabel, CachedPushButton, CachedComboBox
+from ..rendering.overlay_engine import OverlayEngine
 from ..video.camera import Camera  # Legacy - kept for compatibility
 from ..video.qt_camera import QtCamera  # New device-identity based camera
 from ..video.frame_processor import FrameProcessor
 from ..pose.mediapipe_tracker import MediaPipeTracker
 from ..pose.chest_tracker import ChestTracker
-from ..heartrate.polar_h10 import PolarH10
+from ..heartrate.device_scanner import DeviceScanner, DeviceTableDiff
+from ..heartrate.session_manager import BLESessionManager, LINK_DISCONNECTED, LINK_DROPPED
+from ..heartrate.simulated_ble import SimulatedBLE
 from ..heartrate.hr_parser import HeartRateParser
 from ..heartrate.animation_controller import AnimationController
+from ..heartrate.rppg import RPPGEstimator
+from ..utils import clock
+from ..utils.async_bridge import AsyncBridge
 from ..utils.config import Config
+from ..utils.latency_histogram import LatencyHistogram
+from ..utils.session_recorder import SessionRecorder
 
 
-class BLEThread(QThread):
-    """Thread for running async BLE operations."""
+class BLEThread(QObject):
+    """
+    BLE scanning and connections on an asyncio event loop in a background thread.
     
-    heart_rate_received = pyqtSignal(int)
-    devices_discovered = pyqtSignal(list)  # Emit list of discovered devices
-    connection_status = pyqtSignal(bool, str)  # Emit (connected, address) when connection status changes
+    Methods are called from the UI thread and never block it: they submit
+    coroutines to the loop through an AsyncBridge, and results come back as
+    signals.
+    """
+    
+    samples_available = pyqtSignal()  # Coalesced: emitted once until the UI drains the sessions
+    devices_changed = pyqtSignal(object)  # Emit DeviceTableDiff when the discovered devices change
+    # Emit (connected, address, reason) when connection status changes; reason is
+    # a session_manager LINK_* constant while disconnected, "" while connected
+    connection_status = pyqtSignal(bool, str, str)
     
     def __init__(self, parent=None):
-        """Initialize BLE thread."""
+        """Initialize BLE thread (the loop thread starts with the first command)."""
         super().__init__(parent)
-        self.polar_h10: Optional[PolarH10] = None
-        self.loop: Optional[asyncio.AbstractEventLoop] = None
-        self.should_connect = False
+        self.bridge = AsyncBridge(name="ble")
         self.should_scan = False
-        self.target_address: Optional[str] = None
-    
-    def run(self):
-        """Run async event loop."""
-        self.loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.loop)
-        
-        # Create Polar H10 client
-        self.polar_h10 = PolarH10(on_heart_rate=self._on_heart_rate)
-        
-        # Start scanning by default
-        if self.should_scan:
-            # Start continuous scanning in background
-            self.loop.create_task(self._continuous_scan())
         
-        # Connect immediately if requested
-        if self.should_connect and self.target_address:
-            self.loop.create_task(self._connect_to_device(self.target_address))
-        
-        # Keep event loop running to handle all async operations
-        self.loop.run_forever()
+        # Simulated straps stand in for the Bluetooth adapter when configured
+        scanner_factory = client_factory = None
+        if Config.BLE_SIMULATED_STRAPS > 0:
+            simulation = SimulatedBLE.create(
+                Config.BLE_SIMULATED_STRAPS, jitter=Config.BLE_SIMULATED_JITTER,
+                dropout=Config.BLE_SIMULATED_DROPOUT
+            )
+            scanner_factory, client_factory = simulation.scanner_factory, simulation.client_factory
+        self.scanner = DeviceScanner(self.devices_changed.emit, scanner_factory=scanner_factory)
+        
+        # One session per connected strap; notifications are buffered per
+        # session and drained by the UI, instead of queuing one signal each.
+        # Dropped links are reconnected by the session's supervisor.
+        self.sessions = BLESessionManager(
+            on_samples_available=self.samples_available.emit,
+            client_factory=client_factory,
+            on_status=lambda address, connected, reason: self.connection_status.emit(connected, address, reason)
+        )
     
-    def _on_heart_rate(self, heart_rate: int):
-        """Handle heart rate callback."""
-        self.heart_rate_received.emit(heart_rate)
+    def isRunning(self) -> bool:
+        """Whether the event loop thread is running."""
+        return self.bridge.is_running
     
-    async def _continuous_scan(self):
-        """Continuously scan for Polar H10 devices."""
-        while self.should_scan and not self.should_connect:
-            try:
-                devices = await self.polar_h10.scan_for_all_devices(timeout=2.0)
-                if devices:
-                    self.devices_discovered.emit(devices)
-                await asyncio.sleep(3.0)  # Wait 3 seconds between scans
-            except Exception as e:
-                print(f"Error in continuous scan: {e}")
-                await asyncio.sleep(3.0)
+    def drain_samples(self) -> dict:
+        """
+        Take buffered heart rate samples of every strap (UI thread only).
+        
+        Returns:
+            HeartRateSample lists in arrival order, keyed by device address
+        """
+        return self.sessions.drain()
     
-    async def _connect_to_device(self, address: str):
-        """Connect to a specific device."""
-        if await self.polar_h10.connect(address):
-            # Emit connection status
-            self.connection_status.emit(True, address)
-            # Keep running while connected
-            while self.polar_h10.is_connected:
-                await asyncio.sleep(1)
-            # Emit disconnection status
-            self.connection_status.emit(False, address)
+    async def _connect_to_device(self, address: str) -> bool:
+        """Connect to a specific device; later link changes come from the session manager."""
+        # Many adapters connect slowly or fail while a scan is running
+        await self.scanner.stop()
+        try:
+            # The scanned BLEDevice lets bleak connect without looking the address up again
+            connected = await self.sessions.connect(address, self.scanner.ble_devices.get(address))
+        finally:
+            # Keep discovering while there is room for more straps
+            if self.should_scan and len(self.sessions) < self.sessions.max_sessions:
+                await self.scanner.start()
+        self.connection_status.emit(connected, address, "" if connected else LINK_DISCONNECTED)
+        return connected
     
     def start_scanning(self):
         """Start continuous scanning for devices."""
         self.should_scan = True
-        if not self.isRunning():
-            self.start()
-        else:
-            # If already running, restart with scanning
-            if self.loop:
-                self.should_scan = True
-                asyncio.run_coroutine_threadsafe(self._continuous_scan(), self.loop)
+        self.bridge.submit(self.scanner.start())
     
     def stop_scanning(self):
         """Stop continuous scanning."""
         self.should_scan = False
+        if self.bridge.is_running:
+            self.bridge.submit(self.scanner.stop())
     
     def connect_to_device(self, address: str):
-        """Connect to a specific device by address."""
-        self.should_connect = True
-        self.should_scan = False
-        self.target_address = address
-        
-        # Ensure thread is running
-        if not self.isRunning():
-            self.start()
-            # Wait a moment for thread to start and event loop to initialize
-            import time
-            time.sleep(0.2)
-        
-        # Schedule connection in the event loop
-        if self.loop and self.loop.is_running():
-            asyncio.run_coroutine_threadsafe(self._connect_to_device(address), self.loop)
-        else:
-            # If loop isn't running yet, wait a bit more and try again
-            import time
-            time.sleep(0.1)
-            if self.loop and self.loop.is_running():
-                asyncio.run_coroutine_threadsafe(self._connect_to_device(address), self.loop)
+        """Connect to a specific device by address (adds a session; other straps stay connected)."""
+        def on_done(future):
+            # A failed attempt resets the device's button like a disconnect
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                print(f"Error connecting to {address}: {future.exception()!r}")
+                self.connection_status.emit(False, address, LINK_DISCONNECTED)
+        
+        self.bridge.submit(self._connect_to_device(address), on_done)
     
     def stop_connection(self):
-        """Stop BLE connection."""
-        if self.polar_h10 and self.loop and self.polar_h10.is_connected:
+        """Disconnect every strap."""
+        if self.bridge.is_running and len(self.sessions):
             # Emit disconnection status before disconnecting
-            if self.polar_h10.device_address:
-                self.connection_status.emit(False, self.polar_h10.device_address)
-            asyncio.run_coroutine_threadsafe(self.polar_h10.disconnect(), self.loop)
+            for session in self.sessions.sessions:
+                self.connection_status.emit(False, session.address, LINK_DISCONNECTED)
+            self.bridge.submit(self.sessions.disconnect_all())
     
-    def stop(self):
-        """Stop thread."""
-        try:
-            # Stop scanning first
-            self.should_scan = False
-            # Stop connection
-            self.stop_connection()
-            # Stop the event loop
-            if self.loop and self.loop.is_running():
-                # Cancel all pending tasks
-                try:
-                    pending = asyncio.all_tasks(self.loop)
-                    for task in pending:
-                        task.cancel()
-                except Exception:
-                    pass
-                # Schedule loop stop
-                self.loop.call_soon_threadsafe(self.loop.stop)
-        except Exception as e:
-            print(f"Error stopping BLE thread: {e}")
-        finally:
-            self.wait(2000)  # Wait up to 2 seconds for thread to finish
+    async def _shutdown(self):
+        """Stop scanning and drop every strap's link (event loop thread)."""
+        # Within the exit budget only the disconnect itself fits; a strap left
+        # connected stops advertising and is not found on the next launch
+        await asyncio.gather(self.scanner.stop(), self.sessions.disconnect_all(link_only=True), return_exceptions=True)
+    
+    def stop(self) -> bool:
+        """
+        Stop scanning, disconnect and stop the event loop thread.
+        
+        Disconnects get BLE_SHUTDOWN_BUDGET; whatever is still pending is
+        cancelled (straps drop the link on their own once the process exits).
+        
+        Returns:
+            True if the thread finished within BLE_SHUTDOWN_TIMEOUT
+        """
+        self.should_scan = False
+        return self.bridge.stop(self._shutdown, Config.BLE_SHUTDOWN_BUDGET, Config.BLE_SHUTDOWN_TIMEOUT)
 
 
 class MainWindow(QMainWindow):
@@ -178,43 +174,57 @@ class MainWindow(QMainWindow):
         self.pose_tracker = MediaPipeTracker()
         self.chest_tracker = ChestTracker()
         
-        # Heart rate components
+        # Heart rate components; the animated heart follows the primary
+        # strap, whose session parser becomes hr_parser while it is connected
         self.hr_parser = HeartRateParser()
+        self.primary_address: Optional[str] = None
+        self.strap_parsers: Dict[str, HeartRateParser] = {}  # Connected straps by address
         self.animation_controller = AnimationController()
+        # Camera pulse estimate drives the heart while no strap is connected
+        self.rppg: Optional[RPPGEstimator] = RPPGEstimator() if Config.RPPG_ENABLED else None
+        # Frames, landmarks, chest transforms and heart rate go to disk on a background thread
+        self.recorder: Optional[SessionRecorder] = None
+        if Config.RECORDING_ENABLED:
+            self._start_recording()
         
         # BLE thread for Polar H10
         self.ble_thread = BLEThread()
-        self.ble_thread.heart_rate_received.connect(self.on_heart_rate_received)
-        self.ble_thread.devices_discovered.connect(self.on_devices_discovered)
+        self.ble_thread.samples_available.connect(self.on_heart_rate_samples_available)
+        
+        # Notification-arrival to frame-presentation latency of heart rate updates
+        self.hr_latency = LatencyHistogram()
+        # Camera-capture to frame-presentation latency of video frames
+        self.frame_latency = LatencyHistogram()
+        self.ble_thread.devices_changed.connect(self.on_devices_changed)
         self.ble_thread.connection_status.connect(self.on_connection_status)
         
         # Track discovered devices
         self.discovered_devices = {}  # address -> device info
         
-        # Video display label - will fill height, center horizontally
-        self.video_label = QLabel()
-        self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.video_label.setStyleSheet("background-color: transparent;")
-        self.video_label.setScaledContents(False)  # We'll handle scaling manually
-        # Set size policy to allow proper sizing
-        from PyQt6.QtWidgets import QSizePolicy
-        self.video_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        # Make video label transparent so overlays show through
-        self.video_label.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
-        self.video_label.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
+        # Video display - fills height, centered horizontally
+        # Paints the frame buffer directly (no QPixmap conversion or relayout per frame)
+        self.video_view = VideoView()
+        
+        # Overlay engine composites the heart into video frames; it only needs
+        # an OpenGL context (and allocates GL resources) in the 3D render mode
+        self.overlay_engine = OverlayEngine(None, Config.VIDEO_WIDTH, Config.VIDEO_HEIGHT)
         
         # OpenGL widget for 3D rendering overlay (will be positioned over video)
-        # Create as separate widget, not child of video_label, so it can be properly sized
-        self.opengl_widget = OpenGLWidget()
-        self.opengl_widget.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
-        # Make widget match video label size
-        self.opengl_widget.setMinimumSize(640, 480)
-        # Widget will be shown after OpenGL initializes
+        # Only created when a GL-based render mode is active
+        # Create as separate widget, not child of video_view, so it can be properly sized
+        self.opengl_widget: Optional[OpenGLWidget] = None
+        if Config.RENDER_MODE == "3d":
+            self.opengl_widget = OpenGLWidget(overlay_engine=self.overlay_engine)
+            self.opengl_widget.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+            # Make widget match video label size
+            self.opengl_widget.setMinimumSize(640, 480)
+            # Widget will be shown after OpenGL initializes
         
         # 3D heart model loading disabled - using 2D overlay instead
         self.heart_model_path = None
         
         # Controls - styled as web buttons with bevel
+        # Cached* widgets render each style sheet state once and blit it afterwards
         # Define button_style first so it can be used by refresh_button
         button_style = """
             QPushButton {
@@ -250,23 +260,23 @@ class MainWindow(QMainWindow):
             }
         """
         
-        self.start_button = QPushButton("Start Camera")
+        self.start_button = CachedPushButton("Start Camera")
         self.start_button.clicked.connect(self.toggle_camera)
         self.start_button.setStyleSheet(button_style)
         
-        self.stop_button = QPushButton("Stop Camera")
+        self.stop_button = CachedPushButton("Stop Camera")
         self.stop_button.clicked.connect(self.stop_camera)
         self.stop_button.setEnabled(False)
         self.stop_button.setStyleSheet(button_style)
         
         # Heart rate controls
-        self.disconnect_hr_button = QPushButton("Disconnect HR")
+        self.disconnect_hr_button = CachedPushButton("Disconnect HR")
         self.disconnect_hr_button.clicked.connect(self.disconnect_heart_rate)
         self.disconnect_hr_button.setEnabled(False)
         self.disconnect_hr_button.setStyleSheet(button_style)
         
         # Camera selection - overlay buttons
-        self.camera_combo = QComboBox()
+        self.camera_combo = CachedComboBox()
         self.camera_combo.setMinimumWidth(200)
         self.camera_combo.setStyleSheet("""
             QComboBox {
@@ -297,34 +307,21 @@ class MainWindow(QMainWindow):
         self.refresh_camera_list()
         self.camera_combo.currentIndexChanged.connect(self.on_camera_selected)
         
-        refresh_button = QPushButton("Refresh")
+        refresh_button = CachedPushButton("Refresh")
         refresh_button.clicked.connect(self.refresh_camera_list)
         refresh_button.setStyleSheet(button_style)
         
         # Heart rate display - overlay in upper left corner
         # Hospital monitor style: bright green with strong glow
-        self.hr_label = QLabel("--")
-        self.hr_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-        # Large font with hospital monitor styling
-        font = QFont("Arial", 72, QFont.Weight.Bold)
-        self.hr_label.setFont(font)
-        # Hospital monitor green: bright cyan-green (#00FF41)
-        self.hr_label.setStyleSheet("""
-            QLabel {
-                color: #00FF41;
-                background-color: transparent;
-                padding: 20px 20px 35px 20px;
-            }
-        """)
-        
-        # Create strong glow effect for hospital monitor look
-        # Multiple layered glows for maximum visibility
-        glow = QGraphicsDropShadowEffect()
-        glow.setColor(QColor(0, 255, 65, 255))  # Bright green glow
-        glow.setBlurRadius(30)  # Large blur radius for strong glow
-        glow.setXOffset(0)
-        glow.setYOffset(0)
-        self.hr_label.setGraphicsEffect(glow)
+        # The glowing digits are pre-rendered once, so repaints over the video are blits
+        self.hr_label = GlowLabel(
+            "--",
+            font=QFont("Arial", 72, QFont.Weight.Bold),  # Large font with hospital monitor styling
+            color=QColor(0, 255, 65),  # Hospital monitor green: bright cyan-green (#00FF41)
+            glow_color=QColor(0, 255, 65, 255),  # Bright green glow
+            blur_radius=30,  # Large blur radius for strong glow
+            padding=(20, 20, 35, 20)
+        )
         
         # Discovered devices list - overlay widget
         self.devices_label = QLabel("Scanning for Polar H10 devices...")
@@ -361,7 +358,7 @@ class MainWindow(QMainWindow):
         video_container.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
         video_container_layout = QVBoxLayout()
         video_container_layout.setContentsMargins(0, 0, 0, 0)
-        video_container_layout.addWidget(self.video_label)
+        video_container_layout.addWidget(self.video_view)
         video_container.setLayout(video_container_layout)
         layout.addWidget(video_container)
         
@@ -407,10 +404,10 @@ class MainWindow(QMainWindow):
         controls_container.setLayout(controls_layout)
         
         # CRITICAL: Set proper z-ordering - video must be behind overlays
-        # First, ensure video label is at the bottom
-        self.video_label.lower()
-        self.video_label.stackUnder(self.hr_label)
-        self.video_label.stackUnder(controls_container)
+        # First, ensure video view is at the bottom
+        self.video_view.lower()
+        self.video_view.stackUnder(self.hr_label)
+        self.video_view.stackUnder(controls_container)
         
         # Then raise overlays above video
         self.hr_label.raise_()
@@ -420,14 +417,14 @@ class MainWindow(QMainWindow):
         QApplication.processEvents()
         
         # Add OpenGL widget as overlay (stacked on top)
-        self.opengl_widget.setParent(video_container)
-        self.opengl_widget.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
-        self.opengl_widget.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
-        self.opengl_widget.setGeometry(0, 0, 640, 480)
-        self.opengl_widget.lower()  # Keep OpenGL widget behind overlays
-        self.opengl_widget.show()
-        QApplication.processEvents()
-        self.opengl_widget.hide()
+        # It stays hidden (no GL context yet) until the camera starts
+        if self.opengl_widget is not None:
+            self.opengl_widget.setParent(video_container)
+            self.opengl_widget.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
+            self.opengl_widget.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+            self.opengl_widget.setGeometry(0, 0, 640, 480)
+            self.opengl_widget.lower()  # Keep OpenGL widget behind overlays
+            self.opengl_widget.hide()
         
         central_widget.setLayout(layout)
         self.setCentralWidget(central_widget)
@@ -440,7 +437,7 @@ class MainWindow(QMainWindow):
         
         # Install event filters for resize handling
         self.video_container.installEventFilter(self)
-        self.video_label.installEventFilter(self)
+        self.video_view.installEventFilter(self)
         
         # Position overlay widgets initially
         QTimer.singleShot(100, self._update_overlay_positions)  # Delay to ensure geometry is set
@@ -641,9 +638,9 @@ class MainWindow(QMainWindow):
         self.update_timer.start(33)  # ~30 FPS
         print("DEBUG: Update timer started")
         
-        # Load heart model if available and OpenGL context is ready (non-blocking)
-        # Force OpenGL widget to initialize if not already done (needed for 2D overlay)
-        if self.opengl_widget.overlay_engine is None or not hasattr(self.opengl_widget, '_initialized') or not self.opengl_widget._initialized:
+        # Create the OpenGL context on demand, only in the 3D render mode
+        # (the 2D overlay composites on the CPU and never needs it)
+        if self.opengl_widget is not None and not self.opengl_widget._initialized:
             print("OpenGL overlay engine not initialized yet, forcing initialization...")
             # Make widget visible and force an update to trigger initializeGL
             self.opengl_widget.show()
@@ -655,11 +652,11 @@ class MainWindow(QMainWindow):
             QTimer.singleShot(100, lambda: None)
             QApplication.processEvents()
             
-            # Debug: check if overlay engine was created
-            if self.opengl_widget.overlay_engine is None:
-                print("ERROR: Overlay engine still not initialized after forcing initialization")
+            # Debug: check if the overlay engine got its context
+            if not self.opengl_widget._initialized:
+                print("ERROR: OpenGL context still not initialized after forcing initialization")
             else:
-                print("Overlay engine initialized successfully")
+                print("OpenGL overlay initialized successfully")
     
     def stop_camera(self):
         """Stop camera capture."""
@@ -668,8 +665,9 @@ class MainWindow(QMainWindow):
         self.camera.close()
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
-        self.video_label.clear()
-        self.opengl_widget.set_frame(None)
+        self.video_view.clear()
+        if self.opengl_widget is not None:
+            self.opengl_widget.set_frame(None)
     
     def update_frame(self):
         """Update video frame display."""
@@ -684,14 +682,23 @@ class MainWindow(QMainWindow):
         if frame.size == 0:
             return
         
+        # Capture time in the shared clock domain; pose results derive from this frame
+        frame_time = self.camera.frame_timestamp
+        
         # Debug: Print frame info occasionally (first frame only)
         if not hasattr(self, '_first_frame_logged'):
             print(f"DEBUG: First frame received: {frame.shape}, dtype: {frame.dtype}")
             self._first_frame_logged = True
         
         # Process pose estimation - get both normalized and world landmarks
-        normalized_landmarks = self.pose_tracker.process(frame)
-        world_landmarks = self.pose_tracker.get_world_landmarks(frame)
+        normalized_landmarks = self.pose_tracker.process(frame, frame_time)
+        world_landmarks = self.pose_tracker.get_world_landmarks(frame, frame_time)
+        
+        recording = self.recorder is not None and frame_time is not None
+        if recording:
+            self.recorder.record_frame(frame, frame_time)
+            if normalized_landmarks:
+                self.recorder.record_landmarks(normalized_landmarks, frame_time)
         
         # Track chest using simplified 2D tracking
         if normalized_landmarks:
@@ -701,19 +708,23 @@ class MainWindow(QMainWindow):
                 
                 # Get 2D chest position in screen coordinates
                 chest_pos_2d = self.chest_tracker.get_chest_position_2d(
-                    normalized_landmarks, width, height
+                    normalized_landmarks, width, height, frame_time
                 )
                 
                 if chest_pos_2d is not None:
                     # Set chest position for simple circle overlay
-                    if self.opengl_widget.overlay_engine is not None:
-                        self.opengl_widget.overlay_engine.set_chest_position_2d(
-                            int(chest_pos_2d[0]), int(chest_pos_2d[1])
-                        )
+                    self.overlay_engine.set_chest_position_2d(
+                        int(chest_pos_2d[0]), int(chest_pos_2d[1])
+                    )
+                    # Chest rotation selects the pre-rendered heart view
+                    chest_angles = self.chest_tracker.get_chest_rotation_2d(normalized_landmarks)
+                    if chest_angles is not None:
+                        self.overlay_engine.set_chest_rotation(*chest_angles)
+                    if recording:
+                        self.recorder.record_chest(frame_time, chest_pos_2d, chest_angles)
                 else:
                     # Clear chest position if tracking fails
-                    if self.opengl_widget.overlay_engine is not None:
-                        self.opengl_widget.overlay_engine.chest_position_2d = None
+                    self.overlay_engine.chest_position_2d = None
             except Exception as e:
                 print(f"Error tracking chest: {e}")
                 import traceback
@@ -721,115 +732,59 @@ class MainWindow(QMainWindow):
                 # Continue without heart overlay if tracking fails
         else:
             # No pose detected - clear heart position
-            if self.opengl_widget.overlay_engine is not None:
-                self.opengl_widget.overlay_engine.chest_position_2d = None
+            self.overlay_engine.chest_position_2d = None
+        
+        # Without a strap, estimate the pulse from the face instead
+        if self.rppg is not None and self.primary_address is None:
+            self._update_camera_pulse(frame, normalized_landmarks, frame_time)
+        
+        # Apply heart rate notifications that arrived since the last frame
+        hr_samples = self._process_heart_rate_samples()
         
         # Update heart beat animation (only if we have valid BPM data)
-        if not self.hr_parser.is_stale():
-            beat_scale = self.animation_controller.get_beat_scale()
-            # Update both 3D renderer (for future use) and 2D overlay
-            self.opengl_widget.set_heart_beat_scale(beat_scale)
-            if self.opengl_widget.overlay_engine is not None:
-                self.opengl_widget.overlay_engine.set_beat_scale(beat_scale)
+        now = clock.now()
+        if not self.hr_parser.is_stale(current_time=now):
+            beat_scale = self.animation_controller.get_beat_scale(now)
+            # Update both 3D renderer (GL mode only) and 2D overlay
+            self.overlay_engine.set_heart_beat_scale(beat_scale)
+            self.overlay_engine.set_beat_scale(beat_scale)
         else:
             # No heart rate data, use normal scale
-            self.opengl_widget.set_heart_beat_scale(1.0)
-            if self.opengl_widget.overlay_engine is not None:
-                self.opengl_widget.overlay_engine.set_beat_scale(1.0)
+            self.overlay_engine.set_heart_beat_scale(1.0)
+            self.overlay_engine.set_beat_scale(1.0)
         
         # Composite video with simple circle overlay
         frame_to_display = frame
-        if self.opengl_widget.overlay_engine is not None:
-            try:
-                # Composite the video frame with the simple circle overlay
-                composited = self.opengl_widget.overlay_engine.composite_frame(frame)
-                if composited is not None:
-                    frame_to_display = composited
-                else:
-                    # Debug: overlay returned None
-                    if not hasattr(self, '_overlay_none_warned'):
-                        print("WARNING: overlay_engine.composite_frame() returned None")
-                        self._overlay_none_warned = True
-            except Exception as e:
-                print(f"Error compositing frame: {e}")
-                import traceback
-                traceback.print_exc()
-                # Fall back to raw video if compositing fails
-                frame_to_display = frame
-        else:
-            # Debug: overlay engine not initialized
-            if not hasattr(self, '_overlay_missing_warned'):
-                print("WARNING: overlay_engine is None - overlay not initialized")
-                self._overlay_missing_warned = True
+        try:
+            # Composite the video frame with the simple circle overlay
+            composited = self.overlay_engine.composite_frame(frame)
+            if composited is not None:
+                frame_to_display = composited
+            else:
+                # Debug: overlay returned None
+                if not hasattr(self, '_overlay_none_warned'):
+                    print("WARNING: overlay_engine.composite_frame() returned None")
+                    self._overlay_none_warned = True
+        except Exception as e:
+            print(f"Error compositing frame: {e}")
+            import traceback
+            traceback.print_exc()
+            # Fall back to raw video if compositing fails
+            frame_to_display = frame
         
-        # Display video frame in label
+        # Display video frame
         try:
             height, width = frame_to_display.shape[:2]
             if width == 0 or height == 0:
                 print(f"Warning: Invalid frame dimensions: {width}x{height}")
                 return
             
-            rgb_frame = cv2.cvtColor(frame_to_display, cv2.COLOR_BGR2RGB)
-            q_image = QImage(
-                rgb_frame.data,
-                width,
-                height,
-                rgb_frame.strides[0],
-                QImage.Format.Format_RGB888
-            )
-            
-            if q_image.isNull():
-                print("Warning: Failed to create QImage from frame")
-                return
-            
-            pixmap = QPixmap.fromImage(q_image)
-            
-            if pixmap.isNull():
-                print("Warning: Failed to create QPixmap from QImage")
-                return
+            # Scaled to fill height and centered in paintEvent (left/right edges cropped)
+            self.video_view.set_frame(frame_to_display)
             
-            # Scale video to fill height, center horizontally (crop left/right edges)
-            label_size = self.video_label.size()
-            if label_size.width() > 0 and label_size.height() > 0:
-                # Calculate scaling to fill height exactly
-                pixmap_height = pixmap.height()
-                pixmap_width = pixmap.width()
-                
-                if pixmap_height > 0 and pixmap_width > 0:
-                    # Scale to fill height exactly (maintaining aspect ratio)
-                    # This will make the width wider if needed, and QLabel will center it
-                    scaled_pixmap = pixmap.scaledToHeight(
-                        label_size.height(),
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    
-                    # Set pixmap - QLabel with AlignCenter will center it horizontally
-                    # If scaled width > label width, left/right edges will be cropped
-                    self.video_label.setPixmap(scaled_pixmap)
-                    # Ensure alignment is center (already set, but make sure)
-                    self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignTop)
-                else:
-                    # Fallback to normal scaling
-                    scaled_pixmap = pixmap.scaled(
-                        label_size,
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    self.video_label.setPixmap(scaled_pixmap)
-                
-                # CRITICAL: Keep video behind overlays on every frame update
-                self._ensure_video_behind_overlays()
-                
-                # Update OpenGL widget position to match video label (only if visible and ready)
-                # But keep it hidden - we're compositing in the video label instead
-                if self.opengl_widget.isVisible() and self.opengl_widget.overlay_engine is not None:
-                    # Hide the OpenGL widget - we're compositing directly into the video
-                    self.opengl_widget.hide()
-            else:
-                # Label not sized yet, just set the pixmap directly
-                self.video_label.setPixmap(pixmap)
-                # Still ensure proper z-ordering
-                self._ensure_video_behind_overlays()
+            # Keep the OpenGL widget hidden - we're compositing directly into the video
+            if self.opengl_widget is not None and self.opengl_widget.isVisible() and self.opengl_widget._initialized:
+                self.opengl_widget.hide()
         except Exception as e:
             print(f"Error displaying video frame: {e}")
             import traceback
@@ -837,94 +792,249 @@ class MainWindow(QMainWindow):
         
         # Update OpenGL overlay with the same frame (for 3D heart rendering)
         # The overlay engine will render the 3D heart, then we composite it
-        self.opengl_widget.set_frame(frame)
+        if self.opengl_widget is not None:
+            self.opengl_widget.set_frame(frame)
+        
+        if frame_time is not None:
+            self.frame_latency.record(clock.now() - frame_time)
+        self._record_heart_rate_latency(hr_samples)
     
-    def on_heart_rate_received(self, heart_rate: int):
+    def on_heart_rate_samples_available(self):
         """
-        Handle heart rate data received from BLE.
-        Each notification represents a heartbeat, so trigger a pulse animation.
+        Handle the BLE thread's wake-up signal.
         
-        Args:
-            heart_rate: Heart rate in BPM
+        While the camera runs, the frame loop drains samples once per frame;
+        otherwise they are applied here so the heart rate label still updates.
         """
-        try:
-            # Validate heart rate (reasonable range: 30-220 BPM)
-            if heart_rate < 30 or heart_rate > 220:
-                return
-            
-            # Parse and smooth heart rate
-            bpm = self.hr_parser.update(heart_rate)
-            
-            # Update animation controller with BPM
-            self.animation_controller.update_bpm(bpm)
-            
-            # Trigger a heartbeat pulse animation on each notification
-            # Each notification from H10 represents an actual heartbeat
-            self.animation_controller.trigger_heartbeat()
-            
-            # Update UI - just show the number
+        if self.is_running:
+            return
+        samples = self._process_heart_rate_samples()
+        self._record_heart_rate_latency(samples)
+    
+    def _process_heart_rate_samples(self) -> list:
+        """
+        Drain heart rate samples of every strap and apply the primary strap's.
+        
+        The session manager has already validated the samples and applied
+        them to each strap's parser. The H10 notifies about once a second
+        regardless of the beats, so pulses are scheduled from the RR
+        intervals; only samples without RR intervals fall back to a pulse per
+        notification. Other straps only update their device button.
+        
+        Labels are updated at most once per call, however many samples arrived.
+        
+        Returns:
+            Drained HeartRateSample list of all straps
+        """
+        drained = self.ble_thread.drain_samples()
+        all_samples = []
+        for address, samples in drained.items():
+            all_samples.extend(samples)
+            if self.recorder is not None:
+                for sample in samples:
+                    self.recorder.record_heart_rate(address, sample.timestamp, sample.bpm, sample.rr_intervals)
+            parser = self.strap_parsers.get(address)
+            if parser is not None:
+                self._update_strap_button(address, parser.get_bpm())
+        
+        samples = drained.get(self.primary_address, [])
+        bpm = self.hr_parser.get_bpm()
+        for sample in samples:
+            try:
+                # Update animation controller with the smoothed BPM
+                self.animation_controller.update_bpm(bpm, sample.timestamp)
+                
+                if sample.rr_intervals:
+                    # Pulses fire at the reconstructed beat times
+                    self.animation_controller.add_rr_intervals(sample.timestamp, sample.rr_intervals)
+                elif not self.animation_controller.has_beat_timing():
+                    # No RR data: pulse on the notification itself
+                    self.animation_controller.trigger_heartbeat()
+            except Exception as e:
+                print(f"Error processing heart rate: {e}")
+        
+        # Update UI - just show the number
+        if samples and bpm is not None:
             self.hr_label.setText(f"{bpm}")
+        return all_samples
+    
+    def _update_camera_pulse(self, frame: np.ndarray, landmarks, frame_time: float):
+        """
+        Sample the face's skin color and apply a new camera pulse estimate, if any.
+        
+        Estimates arrive about once a second and feed hr_parser like strap
+        notifications without RR intervals, so the heart follows the BPM rhythm.
+        """
+        try:
+            estimate = self.rppg.process_frame(frame, landmarks, frame_time)
         except Exception as e:
-            print(f"Error processing heart rate: {e}")
+            print(f"Error estimating camera pulse: {e}")
+            return
+        if estimate is None:
+            return
+        if self.recorder is not None:
+            self.recorder.record_heart_rate("camera", estimate.timestamp, estimate.bpm)
+        bpm = self.hr_parser.update(int(round(estimate.bpm)), estimate.timestamp)
+        self.animation_controller.update_bpm(bpm, estimate.timestamp)
+        self.hr_label.setText(f"{bpm}")
     
-    def on_devices_discovered(self, devices: list):
-        """Handle discovered devices."""
-        # Update discovered devices
-        for device in devices:
-            address = device['address']
-            if address not in self.discovered_devices:
-                self.discovered_devices[address] = device
-                # Add button for this device
-                device_button = QPushButton(f"Connect: {device['name']}")
-                device_button.device_address = address  # Store address for later reference
-                device_button.clicked.connect(lambda checked, addr=address: self.connect_to_device(addr))
-                # Style device buttons using stored style
-                if hasattr(self, 'device_button_style'):
-                    device_button.setStyleSheet(self.device_button_style)
-                self.devices_layout.addWidget(device_button)
+    def _start_recording(self):
+        """Start recording this session to a new file in Config.RECORDINGS_DIR."""
+        path = Config.RECORDINGS_DIR / time.strftime("session-%Y%m%d-%H%M%S.hrsession")
+        try:
+            recorder = SessionRecorder(path)
+            recorder.start({'render_mode': Config.RENDER_MODE, 'video_fps': Config.VIDEO_FPS})
+        except Exception as e:
+            print(f"Error starting session recording: {e}")
+            return
+        self.recorder = recorder
+        logger.info(f"Recording session to {path}")
+    
+    def _update_strap_button(self, address: str, bpm: Optional[int]):
+        """Show a connected strap's heart rate on its device button."""
+        device_button = self._device_button(address)
+        if device_button is None:
+            return
+        device_name = self.discovered_devices.get(address, {}).get('name', 'Polar H10')
+        suffix = f": {bpm} BPM" if bpm is not None else ""
+        device_button.setText(f"✓ {device_name}{suffix}")
+    
+    def _record_heart_rate_latency(self, samples: list):
+        """Record notification-to-render latency for samples shown this frame."""
+        if not samples:
+            return
+        now = clock.now()
+        for sample in samples:
+            self.hr_latency.record(now - sample.timestamp)
+    
+    def on_devices_changed(self, diff: DeviceTableDiff):
+        """Apply a device table diff to the device buttons."""
+        for device in diff.added:
+            self.discovered_devices[device.address] = {'name': device.name, 'address': device.address, 'rssi': device.rssi}
+            device_button = self._device_button(device.address)
+            if device_button is not None:
+                # A connected strap kept its button when it expired and advertises again after a disconnect
+                device_button.setToolTip(f"{device.address} ({device.rssi} dBm)")
+                if device_button.isEnabled():
+                    device_button.setText(f"Connect: {device.name}")
+                continue
+            # Add button for this device
+            device_button = CachedPushButton(f"Connect: {device.name}")
+            device_button.device_address = device.address  # Store address for later reference
+            device_button.setToolTip(f"{device.address} ({device.rssi} dBm)")
+            device_button.clicked.connect(lambda checked, addr=device.address: self.connect_to_device(addr))
+            # Style device buttons using stored style
+            if hasattr(self, 'device_button_style'):
+                device_button.setStyleSheet(self.device_button_style)
+            self.devices_layout.addWidget(device_button)
+        
+        for device in diff.updated:
+            self.discovered_devices[device.address] = {'name': device.name, 'address': device.address, 'rssi': device.rssi}
+            device_button = self._device_button(device.address)
+            if device_button is not None:
+                device_button.setToolTip(f"{device.address} ({device.rssi} dBm)")
+                if device_button.isEnabled():
+                    device_button.setText(f"Connect: {device.name}")
+        
+        for address in diff.removed:
+            device_button = self._device_button(address)
+            # The connected device stops advertising; keep its button
+            if device_button is not None and device_button.isEnabled():
+                self.discovered_devices.pop(address, None)
+                self.devices_layout.removeWidget(device_button)
+                device_button.deleteLater()
         
         # Update label
-        if devices:
+        if self.discovered_devices:
             self.devices_label.setText(f"Found {len(self.discovered_devices)} Polar H10 device(s)")
         else:
             self.devices_label.setText("Scanning for Polar H10 devices...")
     
+    def _device_button(self, address: str) -> Optional[CachedPushButton]:
+        """Find the connect button of a discovered device."""
+        for i in range(self.devices_layout.count()):
+            widget = self.devices_layout.itemAt(i).widget()
+            if widget and getattr(widget, 'device_address', None) == address:
+                return widget
+        return None
+    
     def connect_to_device(self, address: str):
         """Connect to a specific Polar H10 device."""
         self.ble_thread.connect_to_device(address)
         self.devices_label.setText(f"Connecting to device...")
     
-    def on_connection_status(self, connected: bool, address: str):
-        """Handle connection status changes."""
+    def on_connection_status(self, connected: bool, address: str, reason: str):
+        """
+        Handle connection status changes of one strap.
+        
+        The reason travels with the signal: by the time the queued signal is
+        handled the session may already have reconnected or ended.
+        """
+        device_name = self.discovered_devices.get(address, {}).get('name', 'Polar H10')
+        device_button = self._device_button(address)
         if connected:
+            session = self.ble_thread.sessions.get(address)
+            if session is None:
+                return
+            self.strap_parsers[address] = session.parser
+            if self.primary_address is None:
+                self._set_primary_strap(address)
             self.disconnect_hr_button.setEnabled(True)
-            device_name = self.discovered_devices.get(address, {}).get('name', 'Polar H10')
-            self.devices_label.setText(f"Connected to {device_name}")
-            # Hide/disable connect buttons for this device
-            for i in range(self.devices_layout.count()):
-                widget = self.devices_layout.itemAt(i).widget()
-                if widget and hasattr(widget, 'device_address') and widget.device_address == address:
-                    widget.setEnabled(False)
-                    widget.setText(f"✓ Connected: {device_name}")
-        else:
+            if len(self.strap_parsers) == 1:
+                self.devices_label.setText(f"Connected to {device_name}")
+            else:
+                self.devices_label.setText(f"Connected to {len(self.strap_parsers)} straps")
+            # Disable the connect button for this device
+            if device_button is not None:
+                device_button.setEnabled(False)
+                device_button.setText(f"✓ Connected: {device_name}")
+            return
+        
+        if reason == LINK_DROPPED:
+            # Parser and primary role are kept for when the link returns
+            if device_button is not None:
+                device_button.setText(f"… Reconnecting: {device_name}")
+            return
+        
+        parser = self.strap_parsers.pop(address, None)
+        if parser is not None and parser.hrv.accepted > 0:
+            logger.info(f"HRV of {device_name} ({parser.hrv.rejected} beats rejected): {parser.get_hrv()}")
+        if address == self.primary_address:
+            self._set_primary_strap(next(iter(self.strap_parsers), None))
+        if not self.strap_parsers:
             self.disconnect_hr_button.setEnabled(False)
             self.devices_label.setText("Scanning for Polar H10 devices...")
-            # Re-enable connect buttons
-            for i in range(self.devices_layout.count()):
-                widget = self.devices_layout.itemAt(i).widget()
-                if widget and hasattr(widget, 'device_address') and widget.device_address == address:
-                    device_name = self.discovered_devices.get(address, {}).get('name', 'Polar H10')
-                    widget.setEnabled(True)
-                    widget.setText(f"Connect: {device_name}")
+        # Re-enable the connect button
+        if device_button is not None:
+            device_button.setEnabled(True)
+            device_button.setText(f"Connect: {device_name}")
+    
+    def _set_primary_strap(self, address: Optional[str]):
+        """
+        Choose the strap that drives the heart rate label and the animated heart.
+        
+        Args:
+            address: Connected strap address, or None when no strap is connected
+        """
+        self.primary_address = address
+        self.hr_parser = self.strap_parsers[address] if address is not None else HeartRateParser()
+        self.animation_controller.reset()
+        bpm = self.hr_parser.get_bpm()
+        self.hr_label.setText(f"{bpm}" if bpm is not None else "--")
     
     def _ensure_video_behind_overlays(self):
-        """Ensure video label stays behind overlay widgets."""
-        if hasattr(self, 'video_label') and hasattr(self, 'hr_label') and hasattr(self, 'controls_container'):
+        """
+        Ensure video view stays behind overlay widgets.
+        
+        Stacking only changes with geometry, so this runs from
+        _update_overlay_positions() rather than on every frame.
+        """
+        if hasattr(self, 'video_view') and hasattr(self, 'hr_label') and hasattr(self, 'controls_container'):
             # Use stackUnder to explicitly set video behind overlays
-            self.video_label.stackUnder(self.hr_label)
-            self.video_label.stackUnder(self.controls_container)
+            self.video_view.stackUnder(self.hr_label)
+            self.video_view.stackUnder(self.controls_container)
             # Also lower it to be safe
-            self.video_label.lower()
+            self.video_view.lower()
             # Raise overlays
             self.hr_label.raise_()
             self.controls_container.raise_()
@@ -951,13 +1061,13 @@ class MainWindow(QMainWindow):
             controls_height
         )
         
-        # Position video label to fill remaining space (above controls)
-        video_label_height = container_rect.height() - controls_height
-        self.video_label.setGeometry(
+        # Position video view to fill remaining space (above controls)
+        video_view_height = container_rect.height() - controls_height
+        self.video_view.setGeometry(
             0,
             0,
             container_rect.width(),
-            video_label_height
+            video_view_height
         )
         
         # Position heart rate label in upper left (over video)
@@ -968,26 +1078,29 @@ class MainWindow(QMainWindow):
         self._ensure_video_behind_overlays()
         
         # Position OpenGL widget to match video label
-        self.opengl_widget.setGeometry(self.video_label.geometry())
+        if self.opengl_widget is not None:
+            self.opengl_widget.setGeometry(self.video_view.geometry())
     
     def eventFilter(self, obj, event):
         """Handle resize events for video container."""
         if obj == self.video_container and event.type() == QEvent.Type.Resize:
             # Update overlay positions
             self._update_overlay_positions()
-        elif obj == self.video_label and event.type() == QEvent.Type.Resize:
+        elif obj == self.video_view and event.type() == QEvent.Type.Resize:
             # Update OpenGL widget geometry to match video label
-            if self.opengl_widget.isVisible():
-                self.opengl_widget.setGeometry(self.video_label.geometry())
+            if self.opengl_widget is not None and self.opengl_widget.isVisible():
+                self.opengl_widget.setGeometry(self.video_view.geometry())
         return super().eventFilter(obj, event)
     
     def disconnect_heart_rate(self):
         """Stop heart rate monitoring."""
+        for session in self.ble_thread.sessions.sessions:
+            if session.supervisor.link_losses:
+                logger.info(f"Reconnections of {session.address}: {session.supervisor.summary()}")
+        # Emits a disconnection status per strap, which logs its HRV
         self.ble_thread.stop_connection()
         self.disconnect_hr_button.setEnabled(False)
-        self.hr_parser.reset()
-        self.animation_controller.reset()
-        self.hr_label.setText("--")
+        self._set_primary_strap(None)
         self.devices_label.setText("Scanning for Polar H10 devices...")
     
     def closeEvent(self, event):
@@ -1010,28 +1123,33 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 print(f"Error disconnecting heart rate: {e}")
             
-            # Stop BLE thread gracefully
+            # Stop BLE thread: disconnects get a bounded budget, then pending tasks are cancelled
             if self.ble_thread.isRunning():
                 try:
-                    # Stop scanning
-                    self.ble_thread.stop_scanning()
-                    # Disconnect if connected
-                    self.ble_thread.stop_connection()
-                    # Stop the event loop
-                    if self.ble_thread.loop and self.ble_thread.loop.is_running():
-                        self.ble_thread.loop.call_soon_threadsafe(self.ble_thread.loop.stop)
-                    # Quit the thread
-                    self.ble_thread.quit()
-                    # Wait for thread to finish (with timeout)
-                    if not self.ble_thread.wait(2000):  # 2 second timeout
+                    if not self.ble_thread.stop():
                         print("Warning: BLE thread did not finish in time")
-                        self.ble_thread.terminate()  # Force terminate if needed
-                        self.ble_thread.wait(1000)
                 except Exception as e:
                     print(f"Error stopping BLE thread: {e}")
                     import traceback
                     traceback.print_exc()
             
+            if self.hr_latency.total > 0:
+                logger.info(f"Heart rate notification-to-render latency (ms): {self.hr_latency.summary()}")
+                if self.ble_thread.sessions.dropped():
+                    logger.warning(f"Dropped {self.ble_thread.sessions.dropped()} heart rate samples (ring buffer full)")
+            if self.frame_latency.total > 0:
+                logger.info(f"Video capture-to-display latency (ms): {self.frame_latency.summary()}")
+            
+            # Queued records, the index and the trailer are written before the file closes
+            if self.recorder is not None:
+                try:
+                    if not self.recorder.stop():
+                        print("Warning: session recorder did not finish in time")
+                    logger.info(f"Session recorded to {self.recorder.path} "
+                                f"({self.recorder.bytes_written / 1e6:.1f} MB, dropped {self.recorder.dropped()})")
+                except Exception as e:
+                    print(f"Error stopping session recorder: {e}")
+            
             # Close pose tracker
             try:
                 if hasattr(self.pose_tracker, 'close'):
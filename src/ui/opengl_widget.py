@@ -3,26 +3,37 @@
 from PyQt6.QtOpenGLWidgets import QOpenGLWidget
 from PyQt6.QtOpenGL import QOpenGLVersionProfile
 from PyQt6.QtGui import QImage, QPainter, QSurfaceFormat
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 import numpy as np
 import cv2
 import moderngl
 from typing import Optional
 from ..rendering.overlay_engine import OverlayEngine
+from ..utils.config import Config
 
 
 class OpenGLWidget(QOpenGLWidget):
     """OpenGL widget for rendering video and 3D overlays."""
     
-    def __init__(self, parent=None):
-        """Initialize OpenGL widget."""
+    def __init__(self, parent=None, overlay_engine: Optional[OverlayEngine] = None):
+        """
+        Initialize OpenGL widget.
+        
+        The GL context is only created when the widget is first shown, so
+        constructing it is cheap; keep it hidden unless GL rendering is needed.
+        
+        Args:
+            parent: Parent widget
+            overlay_engine: Existing overlay engine to attach the context to
+                (a new one is created in initializeGL if None)
+        """
         # Set OpenGL format to request 4.1 Core profile
         format = QSurfaceFormat()
         format.setVersion(4, 1)  # Request OpenGL 4.1
         format.setProfile(QSurfaceFormat.OpenGLContextProfile.CoreProfile)
-        format.setSamples(4)  # 4x MSAA for smoother rendering
+        format.setSamples(Config.GL_MSAA_SAMPLES)  # MSAA for smoother rendering (0 = off)
         format.setSwapBehavior(QSurfaceFormat.SwapBehavior.DoubleBuffer)
-        format.setDepthBufferSize(24)  # 24-bit depth buffer
+        format.setDepthBufferSize(Config.GL_DEPTH_BUFFER_SIZE)
         
         # Must call super().__init__() first, then set format
         super().__init__(parent)
@@ -33,14 +44,12 @@ class OpenGLWidget(QOpenGLWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
         
         self.current_frame: Optional[np.ndarray] = None
-        self.overlay_engine: Optional[OverlayEngine] = None
+        self.overlay_engine: Optional[OverlayEngine] = overlay_engine
         self.ctx: Optional[moderngl.Context] = None
         self._initialized = False
         
-        # Setup update timer
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update)
-        self.timer.start(33)  # ~30 FPS
+        # Repaints are event-driven: set_frame() schedules one per new video
+        # frame, so an idle widget never wakes the GPU
     
     def initializeGL(self):
         """Initialize OpenGL context."""
@@ -95,8 +104,12 @@ class OpenGLWidget(QOpenGLWidget):
             width = self.width()
             height = self.height()
             if width > 0 and height > 0:
-                # Initialize overlay engine
-                self.overlay_engine = OverlayEngine(self.ctx, width, height)
+                # Initialize overlay engine, or give the existing one its context
+                if self.overlay_engine is None:
+                    self.overlay_engine = OverlayEngine(self.ctx, width, height)
+                else:
+                    self.overlay_engine.attach_context(self.ctx)
+                    self.overlay_engine.resize(width, height, immediate=True)
                 self._initialized = True
                 print("3D rendering initialized successfully!")
             else:
@@ -106,16 +119,21 @@ class OpenGLWidget(QOpenGLWidget):
             import traceback
             traceback.print_exc()
             self.ctx = None
-            self.overlay_engine = None
+            # The overlay engine is kept: it still composites the 2D heart without GL
             self._initialized = False
     
     def resizeGL(self, width: int, height: int):
         """Handle widget resize."""
-        if self.overlay_engine is not None:
+        if self.overlay_engine is not None and self._initialized:
             self.overlay_engine.resize(width, height)
     
     def paintGL(self):
         """Paint OpenGL scene."""
+        # Pick up a debounced resize once the window has stopped changing size
+        if self.overlay_engine is not None and self._initialized:
+            self.overlay_engine.apply_pending_resize()
+            self.overlay_engine.compile_pending_shaders()
+        
         # Only render 3D heart overlay - video is displayed in QLabel
         if self.ctx is not None and self.overlay_engine is not None and self.current_frame is not None:
             # Render the 3D heart overlay
@@ -136,7 +154,9 @@ class OpenGLWidget(QOpenGLWidget):
             frame: Video frame (BGR format)
         """
         self.current_frame = frame
-        self.update()
+        # Hidden widgets (2D overlay mode) have nothing to repaint
+        if self.isVisible():
+            self.update()
     
     def set_heart_transform(self, transform_matrix: np.ndarray):
         """Set heart transformation matrix."""
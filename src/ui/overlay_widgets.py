@@ -0,0 +1,293 @@
+"""Overlay widgets that paint from cached pixmaps instead of re-rendering every frame."""
+
+from PyQt6.QtWidgets import QWidget, QPushButton, QComboBox, QStyle, QStyleOptionButton, QStyleOptionComboBox
+from PyQt6.QtGui import QImage, QPixmap, QPainter, QFont, QFontMetrics, QColor
+from PyQt6.QtCore import Qt, QEvent, QPoint
+import numpy as np
+import cv2
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+
+def render_glow_text(text: str, font: QFont, color: QColor, glow_color: QColor,
+                     blur_radius: int, device_pixel_ratio: float = 1.0) -> QPixmap:
+    """
+    Render text with a glow around it (same look as a zero-offset
+    QGraphicsDropShadowEffect) into a pixmap.
+    
+    The pixmap is padded by blur_radius on every side so the glow is not
+    clipped; the text baseline origin is at (blur_radius, blur_radius + ascent).
+    
+    Args:
+        text: Text to render
+        font: Font
+        color: Text color
+        glow_color: Glow color
+        blur_radius: Glow radius in logical pixels
+        device_pixel_ratio: Screen scale factor
+    
+    Returns:
+        Pixmap in logical size (advance + 2 * blur_radius) x (height + 2 * blur_radius)
+    """
+    metrics = QFontMetrics(font)
+    pad = blur_radius
+    width = int(np.ceil((metrics.horizontalAdvance(text) + 2 * pad) * device_pixel_ratio))
+    height = int(np.ceil((metrics.height() + 2 * pad) * device_pixel_ratio))
+    
+    # Text mask
+    mask = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    mask.setDevicePixelRatio(device_pixel_ratio)
+    mask.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(mask)
+    painter.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
+    painter.setFont(font)
+    painter.setPen(color)
+    painter.drawText(QPoint(pad, pad + metrics.ascent()), text)
+    painter.end()
+    
+    # Blur the alpha channel and tint it (Format_ARGB32 is BGRA in memory)
+    ptr = mask.constBits()
+    ptr.setsize(mask.sizeInBytes())
+    pixels = np.frombuffer(ptr, dtype=np.uint8).reshape(height, mask.bytesPerLine())[:, :width * 4]
+    alpha = pixels.reshape(height, width, 4)[..., 3].astype(np.float32) / 255.0
+    sigma = blur_radius * device_pixel_ratio / 2.0
+    glow_alpha = cv2.GaussianBlur(alpha, (0, 0), sigma) * glow_color.alphaF()
+    
+    glow = np.empty((height, width, 4), dtype=np.uint8)
+    glow[..., 0] = np.clip(glow_alpha * glow_color.blue(), 0, 255)
+    glow[..., 1] = np.clip(glow_alpha * glow_color.green(), 0, 255)
+    glow[..., 2] = np.clip(glow_alpha * glow_color.red(), 0, 255)
+    glow[..., 3] = np.clip(glow_alpha * 255.0, 0, 255)
+    
+    result = QImage(glow.data, width, height, width * 4, QImage.Format.Format_ARGB32_Premultiplied).copy()
+    result.setDevicePixelRatio(device_pixel_ratio)
+    
+    # Text on top of its glow
+    painter = QPainter(result)
+    painter.drawImage(0, 0, mask)
+    painter.end()
+    
+    return QPixmap.fromImage(result)
+
+
+class GlowLabel(QWidget):
+    """
+    Glowing numeric label (heart rate display).
+    
+    Each glyph ('0'-'9', '-') is rendered with its glow once, when the label
+    is created or its screen scale changes, so every BPM from 30 to 220 is
+    composed from cached glyphs. Painting is a few pixmap blits instead of
+    the Gaussian blur a QGraphicsDropShadowEffect redoes on every repaint of
+    the video underneath.
+    """
+    
+    GLYPHS = "0123456789-"
+    
+    def __init__(self, text: str = "", font: QFont = None, color: QColor = None,
+                 glow_color: QColor = None, blur_radius: int = 30,
+                 padding: Tuple[int, int, int, int] = (20, 20, 35, 20), parent=None):
+        """
+        Initialize glow label.
+        
+        Args:
+            text: Initial text
+            font: Font (default: Arial 72 bold)
+            color: Text color
+            glow_color: Glow color (default: text color)
+            blur_radius: Glow radius in pixels
+            padding: (top, right, bottom, left) padding in pixels
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
+        
+        self._text = text
+        self._glyph_font = font or QFont("Arial", 72, QFont.Weight.Bold)
+        self._color = color or QColor(0, 255, 65)
+        self._glow_color = glow_color or QColor(self._color)
+        self._blur_radius = blur_radius
+        self._padding = padding
+        
+        # Glyph pixmaps and advances for the current device pixel ratio
+        self._glyphs: Dict[str, QPixmap] = {}
+        self._advances: Dict[str, int] = {}
+        self._glyph_dpr = 0.0
+        self._prepare_glyphs()
+    
+    def _prepare_glyphs(self):
+        """Render every glyph with its glow at the current device pixel ratio."""
+        dpr = self.devicePixelRatioF()
+        if dpr == self._glyph_dpr and self._glyphs:
+            return
+        
+        metrics = QFontMetrics(self._glyph_font)
+        self._glyphs = {
+            glyph: render_glow_text(glyph, self._glyph_font, self._color, self._glow_color,
+                                    self._blur_radius, dpr)
+            for glyph in self.GLYPHS
+        }
+        self._advances = {glyph: metrics.horizontalAdvance(glyph) for glyph in self.GLYPHS}
+        self._glyph_dpr = dpr
+    
+    def text(self) -> str:
+        """Get the displayed text."""
+        return self._text
+    
+    def setText(self, text: str):
+        """
+        Set the displayed text; repaints only if it changed.
+        
+        Args:
+            text: Digits and '-' (other characters are skipped)
+        """
+        if text == self._text:
+            return
+        self._text = text
+        self.update()
+    
+    def paintEvent(self, event):
+        """Blit the cached glyphs, left-aligned and vertically centered."""
+        if not self._text:
+            return
+        
+        # No-op unless the widget moved to a screen with a different scale
+        self._prepare_glyphs()
+        top, right, bottom, left = self._padding
+        metrics = QFontMetrics(self._glyph_font)
+        content_height = self.height() - top - bottom
+        text_top = top + (content_height - metrics.height()) // 2
+        
+        painter = QPainter(self)
+        x = left
+        for char in self._text:
+            glyph = self._glyphs.get(char)
+            if glyph is None:
+                continue
+            # Glyph pixmaps are padded by the glow radius on every side
+            painter.drawPixmap(x - self._blur_radius, text_top - self._blur_radius, glyph)
+            x += self._advances[char]
+        painter.end()
+
+
+# Rendered states kept per cached widget (normal, hovered, pressed, focused, disabled, ...)
+MAX_CACHED_STATES = 8
+
+
+class CachedPushButton(QPushButton):
+    """
+    QPushButton that paints its styled appearance from a pixmap cache.
+    
+    Style sheet gradients and borders are rendered once per visual state
+    (size, text, enabled, hovered, pressed) and re-blitted afterwards, so
+    the video repainting underneath does not re-run the style sheet engine.
+    At most MAX_CACHED_STATES are kept, and changing the text drops them,
+    so buttons with live text (a strap's BPM) do not accumulate pixmaps.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        """Initialize button (same arguments as QPushButton)."""
+        super().__init__(*args, **kwargs)
+        self._pixmap_cache: Dict[tuple, QPixmap] = OrderedDict()  # Least recently used first
+    
+    def _state_key(self) -> tuple:
+        """Everything the styled rendering depends on."""
+        return (
+            self.width(), self.height(), self.devicePixelRatioF(), self.text(),
+            self.isEnabled(), self.isDown(), self.isChecked(), self.underMouse(), self.hasFocus()
+        )
+    
+    def setText(self, text: str):
+        """Set the text, dropping cached states rendered with the old one."""
+        if text != self.text():
+            self._pixmap_cache.clear()
+        super().setText(text)
+    
+    def resizeEvent(self, event):
+        """Drop cached states rendered at the old size."""
+        self._pixmap_cache.clear()
+        super().resizeEvent(event)
+    
+    def changeEvent(self, event):
+        """Drop cached states when the style sheet or font changes."""
+        if event.type() in (QEvent.Type.StyleChange, QEvent.Type.FontChange, QEvent.Type.PaletteChange):
+            self._pixmap_cache.clear()
+        super().changeEvent(event)
+    
+    def paintEvent(self, event):
+        """Paint the cached pixmap for the current state, rendering it on first use."""
+        key = self._state_key()
+        pixmap = self._pixmap_cache.get(key)
+        if pixmap is not None:
+            self._pixmap_cache.move_to_end(key)
+        else:
+            dpr = self.devicePixelRatioF()
+            pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            
+            option = QStyleOptionButton()
+            self.initStyleOption(option)
+            painter = QPainter(pixmap)
+            self.style().drawControl(QStyle.ControlElement.CE_PushButton, option, painter, self)
+            painter.end()
+            self._pixmap_cache[key] = pixmap
+            if len(self._pixmap_cache) > MAX_CACHED_STATES:
+                self._pixmap_cache.popitem(last=False)
+        
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
+
+
+class CachedComboBox(QComboBox):
+    """QComboBox that paints its closed appearance from a pixmap cache (see CachedPushButton)."""
+    
+    def __init__(self, *args, **kwargs):
+        """Initialize combo box (same arguments as QComboBox)."""
+        super().__init__(*args, **kwargs)
+        self._pixmap_cache: Dict[tuple, QPixmap] = OrderedDict()  # Least recently used first
+    
+    def _state_key(self) -> tuple:
+        """Everything the styled rendering depends on."""
+        return (
+            self.width(), self.height(), self.devicePixelRatioF(), self.currentText(),
+            self.isEnabled(), self.underMouse(), self.hasFocus(), self.view().isVisible()
+        )
+    
+    def resizeEvent(self, event):
+        """Drop cached states rendered at the old size."""
+        self._pixmap_cache.clear()
+        super().resizeEvent(event)
+    
+    def changeEvent(self, event):
+        """Drop cached states when the style sheet or font changes."""
+        if event.type() in (QEvent.Type.StyleChange, QEvent.Type.FontChange, QEvent.Type.PaletteChange):
+            self._pixmap_cache.clear()
+        super().changeEvent(event)
+    
+    def paintEvent(self, event):
+        """Paint the cached pixmap for the current state, rendering it on first use."""
+        key = self._state_key()
+        pixmap = self._pixmap_cache.get(key)
+        if pixmap is not None:
+            self._pixmap_cache.move_to_end(key)
+        else:
+            dpr = self.devicePixelRatioF()
+            pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            
+            # Same two steps as QComboBox::paintEvent
+            option = QStyleOptionComboBox()
+            self.initStyleOption(option)
+            painter = QPainter(pixmap)
+            self.style().drawComplexControl(QStyle.ComplexControl.CC_ComboBox, option, painter, self)
+            self.style().drawControl(QStyle.ControlElement.CE_ComboBoxLabel, option, painter, self)
+            painter.end()
+            self._pixmap_cache[key] = pixmap
+            if len(self._pixmap_cache) > MAX_CACHED_STATES:
+                self._pixmap_cache.popitem(last=False)
+        
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
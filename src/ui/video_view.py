@@ -0,0 +1,98 @@
+"""Video frame view that paints numpy frames without intermediate copies."""
+
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtCore import Qt, QRect
+import numpy as np
+from typing import Optional
+
+
+class VideoView(QWidget):
+    """
+    Displays BGR video frames scaled to fill the widget height.
+    
+    The frame buffer is wrapped in a QImage (Format_BGR888, no color
+    conversion or copy) and drawn with a single scaled blit in paintEvent.
+    Setting a frame only schedules a repaint; unlike QLabel.setPixmap it never
+    triggers a relayout. The target rectangle is recomputed only when the
+    frame size or the widget size changes.
+    """
+    
+    def __init__(self, parent=None):
+        """
+        Initialize video view.
+        
+        Args:
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        # Transparent where the video does not cover the widget
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
+        
+        # The QImage borrows the array's memory, so the array must outlive it
+        self._frame: Optional[np.ndarray] = None
+        self._image: Optional[QImage] = None
+        self._target_rect: Optional[QRect] = None
+        self.smooth = True  # Bilinear filtering when scaling
+    
+    def set_frame(self, frame: Optional[np.ndarray]):
+        """
+        Show a video frame.
+        
+        The frame is referenced, not copied: callers must not modify it in
+        place after handing it over (pass a new array for each frame).
+        
+        Args:
+            frame: Video frame (BGR, uint8, HxWx3) or None to clear
+        """
+        if frame is None:
+            self.clear()
+            return
+        
+        if not frame.flags['C_CONTIGUOUS']:
+            frame = np.ascontiguousarray(frame)
+        
+        height, width = frame.shape[:2]
+        previous = self._image
+        self._frame = frame
+        self._image = QImage(frame.data, width, height, frame.strides[0], QImage.Format.Format_BGR888)
+        
+        if previous is None or previous.width() != width or previous.height() != height:
+            self._target_rect = None
+        self.update()
+    
+    def clear(self):
+        """Remove the current frame."""
+        self._frame = None
+        self._image = None
+        self._target_rect = None
+        self.update()
+    
+    def _compute_target_rect(self) -> QRect:
+        """Scale to fill the height, centered horizontally (sides are cropped)."""
+        view_width = self.width()
+        view_height = self.height()
+        image_width = self._image.width()
+        image_height = self._image.height()
+        
+        scaled_width = round(image_width * view_height / image_height)
+        return QRect((view_width - scaled_width) // 2, 0, scaled_width, view_height)
+    
+    def resizeEvent(self, event):
+        """Invalidate the cached target rectangle."""
+        self._target_rect = None
+        super().resizeEvent(event)
+    
+    def paintEvent(self, event):
+        """Draw the current frame with one scaled blit."""
+        if self._image is None or self.width() == 0 or self.height() == 0:
+            return
+        
+        if self._target_rect is None:
+            self._target_rect = self._compute_target_rect()
+        
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, self.smooth)
+        painter.drawImage(self._target_rect, self._image)
+        painter.end()
@@ -0,0 +1,154 @@
+"""Asyncio event loop on a background thread, driven from synchronous (UI) code."""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+
+class AsyncBridge:
+    """
+    Runs an asyncio event loop on its own thread.
+    
+    The loop is created by start() on the calling thread, so coroutines can
+    be submitted immediately: they are queued on the loop and run as soon
+    as the thread enters it. Nothing on the calling thread ever waits for
+    the loop to come up; code that needs to know can watch the ready
+    future.
+    
+    submit() returns a concurrent.futures.Future with the coroutine's
+    result; exceptions are logged unless a done callback handles them.
+    stop() runs an optional shutdown coroutine with a time budget, cancels
+    every remaining task, waits (again at most the budget) for the
+    cancellations to finish and only then stops the loop, so tasks unwind
+    cleanly and the join stays short.
+    """
+    
+    def __init__(self, name: str = "asyncio"):
+        """
+        Initialize bridge.
+        
+        Args:
+            name: Name of the loop thread
+        """
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.ready: concurrent.futures.Future = concurrent.futures.Future()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the loop thread has been started and not stopped."""
+        return self._thread is not None
+    
+    def start(self) -> concurrent.futures.Future:
+        """
+        Start the loop thread without waiting for it (no-op if running).
+        
+        Returns:
+            Future resolved with the loop once it runs
+        """
+        if self._thread is not None:
+            return self.ready
+        self.loop = asyncio.new_event_loop()
+        if self.ready.done():
+            self.ready = concurrent.futures.Future()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self.ready
+    
+    def _run(self):
+        """Loop thread body."""
+        loop = self.loop
+        asyncio.set_event_loop(loop)
+        loop.call_soon(self.ready.set_result, loop)
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+    
+    def submit(
+        self,
+        coroutine: Awaitable[Any],
+        on_done: Optional[Callable[[concurrent.futures.Future], None]] = None
+    ) -> concurrent.futures.Future:
+        """
+        Run a coroutine on the loop (any thread; starts the loop if needed).
+        
+        Args:
+            coroutine: Coroutine to run
+            on_done: Called with the future when it finishes, on the loop
+                thread (or at once if it already has); if given, it is
+                responsible for handling the coroutine's exception
+        
+        Returns:
+            Future with the coroutine's result
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        future.add_done_callback(on_done or self._log_failure)
+        return future
+    
+    def _log_failure(self, future: concurrent.futures.Future):
+        """Default done callback: report exceptions that nobody awaits."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"Error in {self.name} task: {error!r}")
+    
+    def stop(
+        self,
+        shutdown: Optional[Callable[[], Awaitable[Any]]] = None,
+        budget: float = 0.05,
+        timeout: float = 0.1
+    ) -> bool:
+        """
+        Shut the loop down and join its thread.
+        
+        Args:
+            shutdown: Coroutine function run first on the loop (e.g. disconnecting
+                devices); it is cancelled if it takes longer than budget
+            budget: Seconds the shutdown coroutine may take
+            timeout: Seconds to wait for the thread to finish
+        
+        Returns:
+            True if the thread finished within timeout (it is a daemon thread,
+            so one that does not never keeps the process alive)
+        """
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return True
+        try:
+            self.loop.call_soon_threadsafe(
+                lambda: self.loop.create_task(self._shutdown(shutdown, budget))
+            )
+        except RuntimeError:
+            # The loop has already closed
+            pass
+        thread.join(timeout)
+        return not thread.is_alive()
+    
+    async def _shutdown(self, shutdown: Optional[Callable[[], Awaitable[Any]]], budget: float):
+        """Run the shutdown coroutine, cancel the remaining tasks and stop the loop."""
+        try:
+            if shutdown is not None:
+                try:
+                    await asyncio.wait_for(shutdown(), budget)
+                except asyncio.TimeoutError:
+                    print(f"{self.name} shutdown exceeded {budget * 1000:.0f} ms; cancelled")
+                except Exception as e:
+                    print(f"Error during {self.name} shutdown: {e!r}")
+            current = asyncio.current_task()
+            tasks = [task for task in asyncio.all_tasks() if task is not current]
+            for task in tasks:
+                task.cancel()
+            # Let every task run its cancellation handlers before the loop stops;
+            # one that ignores cancellation gets the budget, not the whole timeout
+            if tasks:
+                await asyncio.wait(tasks, timeout=budget)
+        finally:
+            asyncio.get_running_loop().stop()
@@ -0,0 +1,96 @@
+"""Shared monotonic timebase for camera frames, pose results, heart rate samples and animation."""
+
+import threading
+import time
+
+
+class Clock:
+    """
+    Monotonic time source in seconds.
+    
+    Timestamps from one clock are comparable across threads and sources;
+    their origin is arbitrary, so only differences are meaningful.
+    """
+    
+    def now(self) -> float:
+        """Get the current time in seconds."""
+        return time.monotonic()
+    
+    def sleep(self, seconds: float):
+        """Block for the given number of seconds."""
+        time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """
+    Manually advanced clock for tests, benchmarks and replays.
+    
+    Time only moves through advance() or sleep(), which returns immediately,
+    so simulated sessions run as fast as the code under test allows.
+    """
+    
+    def __init__(self, start: float = 0.0):
+        """
+        Initialize virtual clock.
+        
+        Args:
+            start: Initial time in seconds
+        """
+        self._time = start
+        self._lock = threading.Lock()
+    
+    def now(self) -> float:
+        """Get the current virtual time in seconds."""
+        return self._time
+    
+    def advance(self, seconds: float) -> float:
+        """
+        Move time forward.
+        
+        Args:
+            seconds: Non-negative step
+        
+        Returns:
+            New time
+        """
+        if seconds < 0:
+            raise ValueError("Clock cannot go backwards")
+        with self._lock:
+            self._time += seconds
+            return self._time
+    
+    def sleep(self, seconds: float):
+        """Advance time instead of blocking."""
+        self.advance(max(0.0, seconds))
+
+
+_clock: Clock = Clock()
+
+
+def get_clock() -> Clock:
+    """Get the process-wide clock."""
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """
+    Replace the process-wide clock (e.g. with a VirtualClock in a benchmark).
+    
+    Set it before creating the objects that read it; timestamps from the
+    previous clock are not comparable with the new one.
+    
+    Args:
+        clock: New clock
+    
+    Returns:
+        The previous clock, so it can be restored
+    """
+    global _clock
+    previous = _clock
+    _clock = clock
+    return previous
+
+
+def now() -> float:
+    """Get the current time from the process-wide clock."""
+    return _clock.now()
@@ -12,6 +12,8 @@ class Config:
     ASSETS_DIR = PROJECT_ROOT / "assets"
     MODELS_DIR = ASSETS_DIR / "models"
     SHADERS_DIR = ASSETS_DIR / "shaders"
+    CACHE_DIR = PROJECT_ROOT / ".cache"  # Generated data (morph targets, etc.), safe to delete
+    RECORDINGS_DIR = PROJECT_ROOT / "recordings"  # Session recordings
     
     # Model files
     # Using midpoly as low-poly (better performance) and highpoly as high-poly (better detail)
@@ -39,22 +41,97 @@ class Config:
     MIRROR_HORIZONTAL = True  # Flip video horizontally for mirror effect
     
     # 3D rendering configuration
+    RENDER_MODE = "2d"  # "2d" (CPU-composited heart/impostor, no GL context) or "3d" (ModernGL in OpenGLWidget)
+    GL_MSAA_SAMPLES = 2  # Multisampling for the 3D overlay surface (0 disables)
+    GL_DEPTH_BUFFER_SIZE = 24  # Depth bits for the 3D overlay surface
+    RENDER_TARGET_BUCKET = 256  # Off-screen targets are allocated in multiples of this (pixels)
+    RENDER_TARGET_POOL_SIZE = 2  # Render targets kept alive for reuse
+    RESIZE_DEBOUNCE_S = 0.15  # Apply a resize only after this long without another one
+    HEART_LIT_SHADING = False  # Diffuse-lit heart shader variant instead of flat red
+    RENDER_INSTRUMENTATION = False  # Periodic clip-space/transform diagnostics in HeartRenderer (debug only)
     HEART_SCALE = 0.15  # Scale factor for heart model (meters) - reasonable size for overlay
     HEART_OFFSET_Z = 0.05  # Offset forward from chest (meters)
     RENDER_FPS_TARGET = 60
+    HEART_MAX_INSTANCES = 8  # Hearts drawn per instanced call (one per tracked person)
+    
+    # Pre-rendered 3D heart impostor atlas (used by the 2D overlay path)
+    HEART_IMPOSTOR_ENABLED = True  # Bake on first run if missing, fall back to drawn heart on failure
+    HEART_IMPOSTOR_ATLAS = CACHE_DIR / "heart_impostor_atlas.png"
+    HEART_IMPOSTOR_CELL_SIZE = 128  # Pixels per atlas cell
+    HEART_IMPOSTOR_BEAT_STEPS = 6  # Beat phases from rest to peak systole
+    HEART_IMPOSTOR_YAW_RANGE = 60.0  # Degrees either side of facing the camera
+    HEART_IMPOSTOR_YAW_STEPS = 9
+    HEART_IMPOSTOR_PITCH_RANGE = 30.0  # Degrees of forward/backward lean
+    HEART_IMPOSTOR_PITCH_STEPS = 5
     
     # Heart rate configuration
     POLAR_H10_SERVICE_UUID = "0000180d-0000-1000-8000-00805f9b34fb"  # Heart Rate Service
     POLAR_H10_CHARACTERISTIC_UUID = "00002a37-0000-1000-8000-00805f9b34fb"  # Heart Rate Measurement
     HEART_RATE_SCAN_TIMEOUT = 10.0  # seconds
+    BLE_SCAN_EMIT_INTERVAL = 0.5  # Seconds between device table updates sent to the UI
+    BLE_DEVICE_TIMEOUT = 10.0  # Seconds without advertisements before a device is dropped
+    BLE_RSSI_CHANGE_THRESHOLD = 6  # dB of RSSI change worth reporting
+    POLAR_PMD_SERVICE_UUID = "fb005c80-02e7-f387-1cad-8acd2d8df0c8"  # Polar Measurement Data
+    POLAR_PMD_CONTROL_UUID = "fb005c81-02e7-f387-1cad-8acd2d8df0c8"
+    POLAR_PMD_DATA_UUID = "fb005c82-02e7-f387-1cad-8acd2d8df0c8"
+    POLAR_PMD_CONTROL_TIMEOUT = 5.0  # Seconds to wait for a control point response
+    POLAR_ECG_SAMPLE_RATE = 130  # Hz (the only rate the H10 supports)
+    POLAR_ECG_RESOLUTION = 14  # bits
+    POLAR_ACC_SAMPLE_RATE = 200  # Hz (25, 50, 100 or 200)
+    POLAR_ACC_RESOLUTION = 16  # bits
+    POLAR_ACC_RANGE = 8  # G (2, 4 or 8)
+    HEART_RATE_RING_CAPACITY = 256  # Unread notifications buffered per strap between the BLE thread and the UI
+    BLE_MAX_SESSIONS = 8  # Straps connected at once
+    BLE_DRAIN_BATCH = 32  # Samples taken from each strap per drain, so one backlog cannot starve the others
+    BLE_RECONNECT_INITIAL_DELAY = 0.25  # Seconds before the second reconnection attempt (the first is immediate)
+    BLE_RECONNECT_MAX_DELAY = 8.0  # Cap of the exponential backoff between attempts
+    BLE_RECONNECT_TIMEOUT = 5.0  # Seconds one reconnection attempt may take
+    BLE_RECONNECT_GIVE_UP = 300.0  # Seconds a link may stay down before its session ends
+    BLE_SHUTDOWN_BUDGET = 0.04  # Seconds disconnects may take on exit before they are cancelled
+    BLE_SHUTDOWN_TIMEOUT = 0.08  # Seconds the UI waits for the BLE thread to finish on exit
+    BLE_SIMULATED_STRAPS = 0  # Simulated Polar H10s instead of the Bluetooth adapter (0: real hardware)
+    BLE_SIMULATED_JITTER = 0.02  # Mean extra delay of a simulated notification in seconds
+    BLE_SIMULATED_DROPOUT = 0.0  # Probability that a simulated notification is lost
+    HEART_BEAT_PLAYOUT_DELAY = 1.2  # Seconds beats are shown after they happened (H10 notifies ~1 Hz, plus radio latency)
+    HEART_BEAT_MAX_GAP = 3.0  # Seconds without RR intervals before beat timing is re-anchored
+    HEART_BEAT_PREDICTION = True  # Pulse on predicted beats (no playout delay) once the predictor is locked
+    HEART_BEAT_PLL_PHASE_GAIN = 0.2  # Fraction of each beat's timing error applied to the phase
+    HEART_BEAT_PLL_PERIOD_GAIN = 0.05  # Fraction of each beat's timing error applied to the period
+    HEART_BEAT_PLL_LOCK_BEATS = 4  # Observed beats before predictions drive the animation
+    HEART_BEAT_PLL_TIMEOUT = 4.0  # Seconds since the last observed beat before predictions stop
+    HRV_WINDOWS = (60.0, 300.0, 900.0)  # HRV statistics windows in seconds (1, 5 and 15 minutes)
+    HRV_ARTIFACT_THRESHOLD = 0.2  # Reject beats deviating more than 20% from the recent median RR
+    HR_HISTORY_SIZE = 1800  # Heart rate values kept per strap for analysis (30 minutes at the H10's 1 Hz)
+    CHEST_HISTORY_SIZE = 300  # Chest positions kept for analysis (10 seconds of frames)
+    RPPG_ENABLED = True  # Estimate the pulse from the face in the camera image while no strap is connected
+    RPPG_WINDOW = 10.0  # Seconds of skin color per estimate
+    RPPG_MIN_WINDOW = 6.0  # Seconds of skin color before the first estimate
+    RPPG_UPDATE_INTERVAL = 1.0  # Seconds between estimates
+    RPPG_MIN_BPM = 45  # Pulse rate search band
+    RPPG_MAX_BPM = 180
+    RPPG_MIN_SNR = 0.0  # dB; weaker estimates are withheld
+    RPPG_MAX_GAP = 0.5  # Seconds without a visible face before the window restarts
+    RPPG_MIN_EYE_DISTANCE = 20  # Pixels between the eyes below which the face is too small to sample
+    
+    # Session recording (frames, landmarks, chest transforms and heart rate, for reproducing issues)
+    RECORDING_ENABLED = False  # Record every session to RECORDINGS_DIR
+    RECORDING_FRAME_FORMAT = "jpeg"  # "jpeg", "raw" or None (no frames)
+    RECORDING_FRAME_SCALE = 0.5  # Frames are downscaled by this factor before encoding
+    RECORDING_JPEG_QUALITY = 85
+    RECORDING_FRAME_QUEUE = 8  # Frames waiting for the writer thread before new ones are dropped
+    RECORDING_DATA_QUEUE = 4096  # Landmark, chest and heart rate records waiting before new ones are dropped
+    RECORDING_CHUNK_SIZE = 1 << 20  # Bytes of records per write
+    RECORDING_FLUSH_INTERVAL = 1.0  # Seconds before a partial chunk is written anyway
     
     # Animation configuration
     HEART_BEAT_SCALE_AMPLITUDE = 0.3  # 30% scale change for heartbeat (more pronounced)
-    ANIMATION_SMOOTHING = 0.1  # Smoothing factor for BPM changes
+    HEART_SYSTOLE_CONTRACTION = 0.12  # Peak inward displacement of the ventricle walls at systole (fraction of radius)
+    ANIMATION_BPM_TIME_CONSTANT = 0.3  # Seconds for the rhythm to cover 63% of a BPM change
     
     @classmethod
     def ensure_directories(cls):
         """Ensure all required directories exist."""
         cls.MODELS_DIR.mkdir(parents=True, exist_ok=True)
         cls.SHADERS_DIR.mkdir(parents=True, exist_ok=True)
+        cls.CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -0,0 +1,92 @@
+"""Fixed-bucket latency histogram."""
+
+import math
+import numpy as np
+from typing import Dict
+
+
+class LatencyHistogram:
+    """
+    Log-spaced latency histogram with constant-time recording.
+    
+    Buckets grow geometrically from min_latency to max_latency, so relative
+    resolution is the same for 2 ms and 200 ms; values outside the range are
+    clamped into the first or last bucket.
+    """
+    
+    def __init__(self, min_latency: float = 0.0005, max_latency: float = 5.0, buckets_per_decade: int = 20):
+        """
+        Initialize histogram.
+        
+        Args:
+            min_latency: Lower edge of the first bucket in seconds
+            max_latency: Upper edge of the last bucket in seconds
+            buckets_per_decade: Resolution (20 gives ~12% wide buckets)
+        """
+        self.min_latency = min_latency
+        self.buckets_per_decade = buckets_per_decade
+        decades = math.log10(max_latency / min_latency)
+        self.num_buckets = int(math.ceil(decades * buckets_per_decade))
+        self.counts = np.zeros(self.num_buckets, dtype=np.int64)
+        # Upper edge of each bucket
+        self.edges = min_latency * 10.0 ** (np.arange(1, self.num_buckets + 1) / buckets_per_decade)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def record(self, latency: float):
+        """
+        Add one measurement.
+        
+        Args:
+            latency: Latency in seconds
+        """
+        if latency <= self.min_latency:
+            index = 0
+        else:
+            index = min(self.num_buckets - 1, int(math.log10(latency / self.min_latency) * self.buckets_per_decade))
+        self.counts[index] += 1
+        self.total += 1
+        self.sum += latency
+        if latency > self.max:
+            self.max = latency
+    
+    def percentile(self, p: float) -> float:
+        """
+        Estimate a percentile (upper edge of the bucket containing it).
+        
+        Args:
+            p: Percentile in 0-100
+        
+        Returns:
+            Latency in seconds, 0.0 if nothing was recorded
+        """
+        if self.total == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(p / 100.0 * self.total)))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return float(min(self.edges[index], self.max))
+    
+    def summary(self) -> Dict[str, float]:
+        """
+        Get count and latency statistics in milliseconds.
+        
+        Returns:
+            Dict with count, mean, p50, p95, p99 and max
+        """
+        mean = self.sum / self.total if self.total else 0.0
+        return {
+            'count': self.total,
+            'mean': mean * 1000.0,
+            'p50': self.percentile(50) * 1000.0,
+            'p95': self.percentile(95) * 1000.0,
+            'p99': self.percentile(99) * 1000.0,
+            'max': self.max * 1000.0,
+        }
+    
+    def reset(self):
+        """Clear all measurements."""
+        self.counts[:] = 0
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
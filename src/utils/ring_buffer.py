@@ -0,0 +1,154 @@
+"""Ring buffers for handing data between threads and for continuous sample streams."""
+
+import numpy as np
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class SPSCRingBuffer(Generic[T]):
+    """
+    Fixed-capacity ring buffer for exactly one producer and one consumer thread.
+    
+    No locks are taken: the producer only writes the head index and the
+    consumer only writes the tail index, and each index is published after
+    the slot it guards has been written or read (attribute stores are atomic
+    in CPython). When the buffer is full new items are dropped and counted,
+    so a stalled consumer never blocks the producer (e.g. a BLE callback).
+    """
+    
+    def __init__(self, capacity: int):
+        """
+        Initialize ring buffer.
+        
+        Args:
+            capacity: Maximum number of unread items
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._slots: List[Optional[T]] = [None] * capacity
+        self._head = 0  # Total items written (producer only)
+        self._tail = 0  # Total items read (consumer only)
+        self.dropped = 0  # Items rejected because the buffer was full (producer only)
+    
+    def push(self, item: T) -> bool:
+        """
+        Append an item (producer thread only).
+        
+        Args:
+            item: Item to append
+        
+        Returns:
+            False if the buffer was full and the item was dropped
+        """
+        head = self._head
+        if head - self._tail >= self.capacity:
+            self.dropped += 1
+            return False
+        self._slots[head % self.capacity] = item
+        # Publish only after the slot is written
+        self._head = head + 1
+        return True
+    
+    def drain(self, max_items: Optional[int] = None) -> List[T]:
+        """
+        Remove and return unread items in arrival order (consumer thread only).
+        
+        Args:
+            max_items: Read at most this many items (default: all)
+        
+        Returns:
+            List of items, empty if none are available
+        """
+        tail = self._tail
+        available = self._head - tail
+        if max_items is not None:
+            available = min(available, max_items)
+        if available <= 0:
+            return []
+        
+        items = []
+        for index in range(tail, tail + available):
+            slot = index % self.capacity
+            items.append(self._slots[slot])
+            self._slots[slot] = None
+        # Release the slots to the producer only after they are read
+        self._tail = tail + available
+        return items
+    
+    def __len__(self) -> int:
+        """Number of unread items (approximate while the producer is writing)."""
+        return self._head - self._tail
+    
+    def clear(self):
+        """Discard unread items (consumer thread only)."""
+        self.drain()
+
+
+class SampleRingBuffer:
+    """
+    Fixed-capacity NumPy ring buffer for a continuous sample stream.
+    
+    Samples are addressed by their absolute index in the stream (0 for the
+    first sample ever written); the last capacity samples stay readable.
+    Single-threaded: producer and consumer must be the same thread.
+    """
+    
+    def __init__(self, capacity: int, dtype=np.float64):
+        """
+        Initialize sample ring buffer.
+        
+        Args:
+            capacity: Number of most recent samples kept
+            dtype: Sample dtype
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.total = 0  # Samples written so far (absolute index of the next one)
+    
+    @property
+    def first_index(self) -> int:
+        """Absolute index of the oldest sample still held."""
+        return max(0, self.total - self.capacity)
+    
+    def extend(self, values: np.ndarray):
+        """
+        Append samples.
+        
+        Args:
+            values: 1D array; only its last capacity samples are kept if longer
+        """
+        values = np.asarray(values, dtype=self.data.dtype).reshape(-1)
+        skipped = max(0, len(values) - self.capacity)
+        values = values[skipped:]
+        self.total += skipped
+        
+        start = self.total % self.capacity
+        first = min(len(values), self.capacity - start)
+        self.data[start:start + first] = values[:first]
+        self.data[:len(values) - first] = values[first:]
+        self.total += len(values)
+    
+    def get(self, start: int, stop: int) -> np.ndarray:
+        """
+        Copy samples by absolute index.
+        
+        Args:
+            start: First absolute index (clamped to first_index)
+            stop: One past the last absolute index (clamped to total)
+        
+        Returns:
+            Samples in stream order
+        """
+        start = max(start, self.first_index)
+        stop = min(stop, self.total)
+        if stop <= start:
+            return self.data[:0].copy()
+        begin = start % self.capacity
+        end = begin + (stop - start)
+        if end <= self.capacity:
+            return self.data[begin:end].copy()
+        return np.concatenate((self.data[begin:], self.data[:end - self.capacity]))
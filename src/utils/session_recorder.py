@@ -0,0 +1,498 @@
+"""
+Session recordings: camera frames, pose landmarks, chest transforms and heart rate on disk.
+
+File layout (little-endian, every payload 8-byte aligned so it can be
+viewed in place through a memory map):
+
+    file header   FILE_HEADER: magic, format version
+    chunk*        CHUNK_HEADER: b"CHNK", record count, byte length,
+                  then records: RECORD_DTYPE header + payload, padded to 8 bytes
+    index         INDEX_DTYPE entry per record (header fields + payload offset)
+    trailer       TRAILER: b"INDX", entry count, index offset
+
+The file is only ever appended to, one chunk per write. The index and
+trailer are written on stop(); a recording cut short (crash, power loss)
+has none, and SessionReader rebuilds the index by walking the chunk
+headers, losing at most the partial chunk at the end.
+"""
+
+import json
+import struct
+import threading
+import time
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from . import clock
+from .config import Config
+from .ring_buffer import SPSCRingBuffer
+
+FILE_MAGIC = b"HRSESS\x00\x01"
+FORMAT_VERSION = 1
+FILE_HEADER = struct.Struct("<8sII")  # Magic, format version, reserved
+CHUNK_MAGIC = b"CHNK"
+CHUNK_HEADER = struct.Struct("<4sIQ")  # Magic, record count, bytes of records that follow
+INDEX_MAGIC = b"INDX"
+TRAILER = struct.Struct("<4sIQ")  # Magic, index entry count, index offset
+ALIGNMENT = 8
+
+# Record kinds
+META = 0  # UTF-8 JSON: session info, and the source of each heart rate stream
+FRAME = 1  # Raw BGR uint8 image
+JPEG = 2  # JPEG-encoded BGR image (shape is the decoded shape)
+LANDMARKS = 3  # float16 (33, 4): normalized x, y, z and visibility of each pose landmark
+CHEST = 4  # float32 (4,): chest x, y in frame pixels, yaw, pitch in degrees (NaN if untracked)
+HEART_RATE = 5  # float32 (1 + n,): BPM, then n RR intervals in seconds
+FRAME_KINDS = (FRAME, JPEG)
+
+PAYLOAD_DTYPES = (np.uint8, np.float16, np.float32)  # Indexed by the record's dtype field
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),  # Shared clock time of the sample
+    ('length', '<u4'),  # Payload bytes, without padding
+    ('kind', 'u1'),
+    ('stream', 'u1'),  # Heart rate source (see META records), 0 otherwise
+    ('dtype', 'u1'),  # Index into PAYLOAD_DTYPES
+    ('ndim', 'u1'),
+    ('shape', '<u2', (4,)),
+])
+INDEX_DTYPE = np.dtype(RECORD_DTYPE.descr + [('offset', '<u8')])  # Offset of the payload
+
+
+def _padding(length: int) -> int:
+    """Bytes that align a payload of this length to ALIGNMENT."""
+    return -length % ALIGNMENT
+
+
+class SessionRecorder:
+    """
+    Records a session to an append-only file from a background thread.
+    
+    The record_* methods are called from one thread (the UI thread): they
+    only pack small arrays and push onto bounded SPSCRingBuffers, one for
+    frames and one for everything else, and never touch the disk. Frames
+    are pushed by reference and must not be modified afterwards. The writer
+    thread downscales and encodes frames, batches records into chunks of
+    about chunk_size bytes and writes a chunk when it is full or
+    flush_interval seconds old. When the writer falls behind, new records
+    are dropped and counted in dropped(); the live pipeline never waits.
+    """
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        frame_format: Optional[str] = Config.RECORDING_FRAME_FORMAT,
+        frame_scale: float = Config.RECORDING_FRAME_SCALE,
+        jpeg_quality: int = Config.RECORDING_JPEG_QUALITY,
+        frame_queue: int = Config.RECORDING_FRAME_QUEUE,
+        data_queue: int = Config.RECORDING_DATA_QUEUE,
+        chunk_size: int = Config.RECORDING_CHUNK_SIZE,
+        flush_interval: float = Config.RECORDING_FLUSH_INTERVAL
+    ):
+        """
+        Initialize session recorder.
+        
+        Args:
+            path: Recording file (created, or overwritten)
+            frame_format: "jpeg", "raw", or None to record no frames
+            frame_scale: Factor frames are resized by before encoding
+            jpeg_quality: JPEG quality (0-100)
+            frame_queue: Frames waiting for the writer before new ones are dropped
+            data_queue: Other records waiting for the writer before new ones are dropped
+            chunk_size: Bytes of records per write
+            flush_interval: Seconds before a partial chunk is written anyway
+        
+        Raises:
+            ValueError: If frame_format is not supported
+        """
+        if frame_format not in ("jpeg", "raw", None):
+            raise ValueError(f"Unsupported frame format: {frame_format}")
+        self.path = Path(path)
+        self.frame_format = frame_format
+        self.frame_scale = frame_scale
+        self.jpeg_quality = jpeg_quality
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        
+        self.frames: SPSCRingBuffer[tuple] = SPSCRingBuffer(frame_queue)
+        self.data: SPSCRingBuffer[tuple] = SPSCRingBuffer(data_queue)
+        self.streams: Dict[str, int] = {}  # Heart rate source -> stream id (producer only)
+        self.written: Dict[int, int] = {}  # Records written by kind (writer only)
+        self.bytes_written = 0  # File size so far (writer only)
+        self.error: Optional[Exception] = None
+        
+        self._file = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stopping = False
+        self._index: List[tuple] = []
+        self._parts: List[Any] = []  # Buffers of the chunk being filled
+        self._chunk_records = 0
+        self._chunk_length = 0
+        self._chunk_started: Optional[float] = None
+    
+    @property
+    def is_recording(self) -> bool:
+        """Whether the writer thread is accepting records."""
+        return self._thread is not None and not self._stopping and self.error is None
+    
+    def start(self, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Create the file and start the writer thread.
+        
+        Args:
+            metadata: JSON-serializable session info stored in the first record
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'wb')
+        self._file.write(FILE_HEADER.pack(FILE_MAGIC, FORMAT_VERSION, 0))
+        self.bytes_written = FILE_HEADER.size
+        info = {
+            'started': time.time(),
+            'clock': clock.now(),
+            'frame_format': self.frame_format,
+            'frame_scale': self.frame_scale,
+        }
+        info.update(metadata or {})
+        self._push(self.data, (META, 0, info['clock'], info))
+        self._thread = threading.Thread(target=self._run, name="session-recorder", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> bool:
+        """
+        Write the queued records, the index and the trailer, and close the file.
+        
+        Args:
+            timeout: Seconds to wait for the writer thread
+        
+        Returns:
+            True if the writer thread finished within timeout
+        """
+        if self._thread is None:
+            return True
+        self._stopping = True
+        self._wake.set()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+    
+    def dropped(self) -> Dict[str, int]:
+        """Records dropped because the writer fell behind, by queue."""
+        return {'frames': self.frames.dropped, 'data': self.data.dropped}
+    
+    def record_frame(self, frame: np.ndarray, timestamp: float) -> bool:
+        """
+        Queue a camera frame.
+        
+        Args:
+            frame: BGR frame (not modified afterwards)
+            timestamp: Capture time of the frame
+        
+        Returns:
+            False if the frame was not queued (no frames recorded, or queue full)
+        """
+        if self.frame_format is None or not self.is_recording:
+            return False
+        return self._push(self.frames, (FRAME, 0, timestamp, frame))
+    
+    def record_landmarks(self, landmarks: Any, timestamp: float) -> bool:
+        """
+        Queue pose landmarks as a float16 (33, 4) array.
+        
+        Args:
+            landmarks: MediaPipe normalized pose landmarks
+            timestamp: Capture time of the frame they were detected in
+        
+        Returns:
+            False if the record was dropped
+        """
+        if not self.is_recording:
+            return False
+        packed = np.array(
+            [(point.x, point.y, point.z, point.visibility) for point in landmarks.landmark], dtype=np.float16
+        )
+        return self._push(self.data, (LANDMARKS, 0, timestamp, packed))
+    
+    def record_chest(
+        self,
+        timestamp: float,
+        position_2d: Optional[Sequence[float]],
+        angles: Optional[Tuple[float, float]] = None
+    ) -> bool:
+        """
+        Queue a chest transform.
+        
+        Args:
+            timestamp: Capture time of the frame
+            position_2d: Chest (x, y) in frame pixels, or None if untracked
+            angles: Chest (yaw, pitch) in degrees, or None if untracked
+        
+        Returns:
+            False if the record was dropped
+        """
+        if not self.is_recording:
+            return False
+        transform = np.full(4, np.nan, dtype=np.float32)
+        if position_2d is not None:
+            transform[:2] = position_2d
+        if angles is not None:
+            transform[2:] = angles
+        return self._push(self.data, (CHEST, 0, timestamp, transform))
+    
+    def record_heart_rate(
+        self,
+        source: str,
+        timestamp: float,
+        bpm: float,
+        rr_intervals: Sequence[float] = ()
+    ) -> bool:
+        """
+        Queue a heart rate sample.
+        
+        Args:
+            source: Where it came from (strap address, "camera", ...)
+            timestamp: When the sample arrived
+            bpm: Heart rate in beats per minute
+            rr_intervals: Beat-to-beat intervals in seconds
+        
+        Returns:
+            False if the record was dropped
+        """
+        if not self.is_recording:
+            return False
+        stream = self.streams.get(source)
+        if stream is None:
+            stream = len(self.streams) + 1
+            if stream > 255:
+                return False
+            if not self._push(self.data, (META, 0, timestamp, {'stream': stream, 'source': source})):
+                return False
+            self.streams[source] = stream
+        values = np.empty(1 + len(rr_intervals), dtype=np.float32)
+        values[0] = bpm
+        values[1:] = rr_intervals
+        return self._push(self.data, (HEART_RATE, stream, timestamp, values))
+    
+    def _push(self, queue: SPSCRingBuffer, item: tuple) -> bool:
+        """Queue a record and wake the writer."""
+        if not queue.push(item):
+            return False
+        self._wake.set()
+        return True
+    
+    def _run(self):
+        """Writer thread: drain the queues into chunks until stopped."""
+        try:
+            while True:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                # Read before draining, so records queued before stop() are written
+                stopping = self._stopping
+                self._write_queued()
+                if stopping:
+                    break
+                if self._parts and clock.now() - self._chunk_started >= self.flush_interval:
+                    self._flush_chunk()
+            self._flush_chunk()
+            self._write_index()
+        except Exception as e:
+            self.error = e
+            print(f"Error writing session recording {self.path}: {e}")
+        finally:
+            self._file.close()
+    
+    def _write_queued(self):
+        """Encode and append every queued record."""
+        while True:
+            items = self.data.drain() + self.frames.drain()
+            if not items:
+                return
+            for kind, stream, timestamp, payload in items:
+                if kind == META:
+                    self._append(META, stream, timestamp, np.frombuffer(json.dumps(payload).encode(), np.uint8))
+                elif kind == FRAME:
+                    self._append_frame(timestamp, payload)
+                else:
+                    self._append(kind, stream, timestamp, payload)
+    
+    def _append_frame(self, timestamp: float, frame: np.ndarray):
+        """Downscale and encode a frame, then append it."""
+        if self.frame_scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.frame_scale, fy=self.frame_scale, interpolation=cv2.INTER_AREA)
+        if self.frame_format == "jpeg":
+            success, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not success:
+                return
+            self._append(JPEG, 0, timestamp, encoded.reshape(-1), frame.shape)
+        else:
+            self._append(FRAME, 0, timestamp, np.ascontiguousarray(frame))
+    
+    def _append(self, kind: int, stream: int, timestamp: float, payload: np.ndarray,
+                shape: Optional[Tuple[int, ...]] = None):
+        """Add a record to the current chunk, writing the chunk when it is full."""
+        shape = payload.shape if shape is None else shape
+        dims = tuple(shape) + (0,) * (4 - len(shape))
+        dtype = PAYLOAD_DTYPES.index(payload.dtype.type)
+        header = (timestamp, payload.nbytes, kind, stream, dtype, len(shape), dims)
+        # The chunk is written at bytes_written, after its header
+        offset = self.bytes_written + CHUNK_HEADER.size + self._chunk_length + RECORD_DTYPE.itemsize
+        self._index.append(header + (offset,))
+        
+        if not self._parts:
+            self._chunk_started = clock.now()
+        self._parts.append(np.array(header, dtype=RECORD_DTYPE).tobytes())
+        self._parts.append(payload)
+        padding = _padding(payload.nbytes)
+        if padding:
+            self._parts.append(bytes(padding))
+        self._chunk_records += 1
+        self._chunk_length += RECORD_DTYPE.itemsize + payload.nbytes + padding
+        self.written[kind] = self.written.get(kind, 0) + 1
+        if self._chunk_length >= self.chunk_size:
+            self._flush_chunk()
+    
+    def _flush_chunk(self):
+        """Write the current chunk (one append) and make it durable in the OS."""
+        if not self._parts:
+            return
+        self._file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, self._chunk_records, self._chunk_length))
+        for part in self._parts:
+            self._file.write(part)
+        self._file.flush()
+        self.bytes_written += CHUNK_HEADER.size + self._chunk_length
+        self._parts = []
+        self._chunk_records = 0
+        self._chunk_length = 0
+    
+    def _write_index(self):
+        """Append the index and the trailer that points to it."""
+        index = np.array(self._index, dtype=INDEX_DTYPE)
+        self._file.write(index.tobytes())
+        self._file.write(TRAILER.pack(INDEX_MAGIC, len(index), self.bytes_written))
+        self.bytes_written += index.nbytes + TRAILER.size
+
+
+class SessionReader:
+    """
+    Random access to a session recording through a read-only memory map.
+    
+    Payloads are returned as NumPy views into the map (no copies), except
+    JPEG frames, which are decoded, and META records, which are parsed.
+    """
+    
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a recording.
+        
+        Args:
+            path: Recording file
+        
+        Raises:
+            ValueError: If the file is not a session recording
+        """
+        self.path = Path(path)
+        self.data = np.memmap(self.path, dtype=np.uint8, mode='r')
+        if len(self.data) < FILE_HEADER.size:
+            raise ValueError(f"Not a session recording: {self.path}")
+        magic, version, _ = FILE_HEADER.unpack_from(self.data, 0)
+        if magic != FILE_MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a session recording (version {FORMAT_VERSION}): {self.path}")
+        
+        self.recovered = False  # True if the index was rebuilt from the chunks
+        self.index = self._read_index()
+        self.metadata: Dict[str, Any] = {}
+        self.sources: Dict[int, str] = {}  # Heart rate stream id -> source
+        for i in np.flatnonzero(self.index['kind'] == META):
+            record = self.payload(i)
+            if 'stream' in record:
+                self.sources[record['stream']] = record['source']
+            elif not self.metadata:
+                self.metadata = record
+    
+    def __len__(self) -> int:
+        """Number of records."""
+        return len(self.index)
+    
+    def _read_index(self) -> np.ndarray:
+        """Index from the trailer, or rebuilt by walking the chunks."""
+        size = len(self.data)
+        if size >= FILE_HEADER.size + TRAILER.size:
+            magic, count, offset = TRAILER.unpack_from(self.data, size - TRAILER.size)
+            if magic == INDEX_MAGIC and offset + count * INDEX_DTYPE.itemsize == size - TRAILER.size:
+                return np.frombuffer(self.data, dtype=INDEX_DTYPE, count=count, offset=offset)
+        
+        self.recovered = True
+        entries = []
+        position = FILE_HEADER.size
+        while position + CHUNK_HEADER.size <= size:
+            magic, count, length = CHUNK_HEADER.unpack_from(self.data, position)
+            if magic != CHUNK_MAGIC or position + CHUNK_HEADER.size + length > size:
+                break
+            record = position + CHUNK_HEADER.size
+            for _ in range(count):
+                header = np.frombuffer(self.data, dtype=RECORD_DTYPE, count=1, offset=record)[0]
+                entries.append(header.item() + (record + RECORD_DTYPE.itemsize,))
+                record += RECORD_DTYPE.itemsize + int(header['length']) + _padding(int(header['length']))
+            position += CHUNK_HEADER.size + length
+        return np.array(entries, dtype=INDEX_DTYPE)
+    
+    def select(self, kinds: Union[int, Sequence[int]], stream: Optional[int] = None) -> np.ndarray:
+        """
+        Record numbers of some kinds, in timestamp order.
+        
+        Args:
+            kinds: Record kind or kinds (e.g. FRAME_KINDS)
+            stream: Only this heart rate stream
+        
+        Returns:
+            Indices into index
+        """
+        mask = np.isin(self.index['kind'], kinds)
+        if stream is not None:
+            mask &= self.index['stream'] == stream
+        selected = np.flatnonzero(mask)
+        return selected[np.argsort(self.index['timestamp'][selected], kind='stable')]
+    
+    def nearest(self, kinds: Union[int, Sequence[int]], timestamp: float,
+                stream: Optional[int] = None) -> Optional[int]:
+        """
+        Latest record of some kinds at or before a time.
+        
+        Returns:
+            Record number, or None if there is none
+        """
+        selected = self.select(kinds, stream)
+        position = int(np.searchsorted(self.index['timestamp'][selected], timestamp, side='right'))
+        return int(selected[position - 1]) if position else None
+    
+    def payload(self, i: int) -> Any:
+        """
+        Contents of a record.
+        
+        Args:
+            i: Record number
+        
+        Returns:
+            Array view into the file (JPEG frames decoded, META records as dicts)
+        """
+        entry = self.index[i]
+        offset, length, kind = int(entry['offset']), int(entry['length']), int(entry['kind'])
+        if kind == META:
+            return json.loads(bytes(self.data[offset:offset + length]).decode())
+        if kind == JPEG:
+            return cv2.imdecode(self.data[offset:offset + length], cv2.IMREAD_COLOR)
+        shape = tuple(int(n) for n in entry['shape'][:entry['ndim']])
+        dtype = PAYLOAD_DTYPES[entry['dtype']]
+        return np.frombuffer(self.data, dtype=dtype, count=length // np.dtype(dtype).itemsize,
+                             offset=offset).reshape(shape)
+    
+    def records(self, kinds: Union[int, Sequence[int]],
+                stream: Optional[int] = None) -> Iterator[Tuple[float, Any]]:
+        """Yield (timestamp, payload) of some kinds in timestamp order."""
+        for i in self.select(kinds, stream):
+            yield float(self.index['timestamp'][i]), self.payload(i)
+    
+    def close(self):
+        """Drop the memory map (it is unmapped once no payload views remain)."""
+        self.data = None
+        self.index = None
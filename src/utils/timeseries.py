@@ -0,0 +1,271 @@
+"""Bounded, time-aligned history of streaming signals with incremental window statistics."""
+
+import numpy as np
+from collections import deque
+from typing import Deque, List, Optional, Sequence, Tuple, Union
+
+
+class TimeSeries:
+    """
+    Preallocated history of (timestamp, values...) samples.
+    
+    Storage is a mirrored ring buffer: every sample is written to slot i and
+    slot i + capacity of arrays twice the capacity long, so the most recent
+    samples are always contiguous and latest() and since() return views
+    instead of copies. Appending is two array stores and never allocates.
+    Views stay valid until the samples they show are overwritten, capacity
+    appends later; copy them to keep them longer.
+    
+    Timestamps must not decrease. With one channel, values are 1D.
+    RollingWindows from add_window() are updated on every append.
+    """
+    
+    def __init__(self, capacity: int, channels: int = 1, dtype=np.float64):
+        """
+        Initialize time series.
+        
+        Args:
+            capacity: Number of most recent samples kept
+            channels: Values per sample
+            dtype: Value dtype (timestamps are float64)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.channels = channels
+        self._times = np.zeros(2 * capacity, dtype=np.float64)
+        shape = (2 * capacity,) if channels == 1 else (2 * capacity, channels)
+        self._values = np.zeros(shape, dtype=dtype)
+        self.total = 0  # Samples appended so far (sequence number of the next one)
+        self.windows: List['RollingWindow'] = []
+    
+    def __len__(self) -> int:
+        """Number of samples held."""
+        return min(self.total, self.capacity)
+    
+    def append(self, timestamp: float, values: Union[float, Sequence[float]]):
+        """
+        Append one sample.
+        
+        Args:
+            timestamp: Sample time
+            values: Scalar (one channel) or one value per channel
+        """
+        # Windows let go of the sample about to be overwritten while it can still be read
+        overwritten = self.total - self.capacity
+        for window in self.windows:
+            if window.count and window.tail <= overwritten:
+                window._evict()
+        slot = self.total % self.capacity
+        self._times[slot] = timestamp
+        self._times[slot + self.capacity] = timestamp
+        self._values[slot] = values
+        self._values[slot + self.capacity] = values
+        self.total += 1
+        for window in self.windows:
+            window._append(self.total - 1, timestamp)
+    
+    def extend(self, timestamps: Sequence[float], values):
+        """
+        Append several samples, oldest first.
+        
+        Args:
+            timestamps: Sample times
+            values: One row (or scalar, for one channel) per timestamp
+        """
+        for timestamp, row in zip(timestamps, values):
+            self.append(timestamp, row)
+    
+    def _end(self) -> int:
+        """Index one past the newest sample in the mirrored arrays."""
+        return self.total % self.capacity + self.capacity
+    
+    def latest(self, count: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Views of the most recent samples.
+        
+        Args:
+            count: Number of samples (default and at most: all held)
+        
+        Returns:
+            (timestamps, values), oldest first
+        """
+        held = len(self)
+        count = held if count is None else max(0, min(count, held))
+        end = self._end()
+        return self._times[end - count:end], self._values[end - count:end]
+    
+    def since(self, start_time: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Views of the samples with timestamp >= start_time.
+        
+        Returns:
+            (timestamps, values), oldest first
+        """
+        times, values = self.latest()
+        first = int(np.searchsorted(times, start_time, side='left'))
+        return times[first:], values[first:]
+    
+    def last(self) -> Optional[Tuple[float, np.ndarray]]:
+        """Newest sample as (timestamp, values), or None if empty."""
+        if self.total == 0:
+            return None
+        index = self._end() - 1
+        return float(self._times[index]), self._values[index]
+    
+    def time_at(self, seq: int) -> float:
+        """Timestamp of a held sample by sequence number."""
+        return float(self._times[seq % self.capacity])
+    
+    def value_at(self, seq: int, channel: int = 0) -> float:
+        """One value of a held sample by sequence number."""
+        if self.channels == 1:
+            return float(self._values[seq % self.capacity])
+        return float(self._values[seq % self.capacity, channel])
+    
+    def add_window(self, duration: Optional[float] = None, count: Optional[int] = None,
+                   channel: int = 0) -> 'RollingWindow':
+        """
+        Track statistics over the newest samples from now on.
+        
+        Args:
+            duration: Window length in seconds (samples newer than newest - duration)
+            count: Window length in samples (at most capacity)
+            channel: Value channel the statistics are taken of
+        
+        Returns:
+            Window, updated by every append
+        """
+        window = RollingWindow(self, duration, count, channel)
+        self.windows.append(window)
+        return window
+    
+    def clear(self):
+        """Drop all samples and reset the windows."""
+        self.total = 0
+        for window in self.windows:
+            window.reset()
+
+
+class RollingWindow:
+    """
+    Mean, variance, min and max of one channel over a sliding window.
+    
+    The window covers the newest count samples and/or the samples within
+    duration seconds of the newest, and never more than the series holds.
+    Sums are kept relative to the first value (so large offsets such as
+    timestamps do not cancel) and recomputed exactly from the history every
+    capacity evictions against rounding drift; min and max come from
+    monotonic queues. Each append is O(1) amortized.
+    """
+    
+    def __init__(self, series: TimeSeries, duration: Optional[float], count: Optional[int], channel: int):
+        """
+        Initialize rolling window (use TimeSeries.add_window()).
+        
+        Args:
+            series: Series the window is over
+            duration: Window length in seconds, or None
+            count: Window length in samples, or None (capacity)
+            channel: Value channel
+        """
+        self.series = series
+        self.duration = duration
+        self.max_count = min(count or series.capacity, series.capacity)
+        self.channel = channel
+        self.reset()
+    
+    def reset(self):
+        """Forget all samples."""
+        self.tail = self.series.total  # Sequence number of the oldest sample in the window
+        self.count = 0
+        self.offset: Optional[float] = None
+        self.sum = 0.0
+        self.sq_sum = 0.0
+        self._evictions = 0
+        # Sequence numbers with increasing / decreasing values (front is the min / max)
+        self._min_candidates: Deque[int] = deque()
+        self._max_candidates: Deque[int] = deque()
+    
+    def _append(self, seq: int, timestamp: float):
+        """Add the sample just appended to the series and expire old ones."""
+        value = self.series.value_at(seq, self.channel)
+        if self.offset is None:
+            self.offset = value
+        shifted = value - self.offset
+        self.count += 1
+        self.sum += shifted
+        self.sq_sum += shifted * shifted
+        values = self.series
+        while self._min_candidates and values.value_at(self._min_candidates[-1], self.channel) >= value:
+            self._min_candidates.pop()
+        self._min_candidates.append(seq)
+        while self._max_candidates and values.value_at(self._max_candidates[-1], self.channel) <= value:
+            self._max_candidates.pop()
+        self._max_candidates.append(seq)
+        
+        while self.count > self.max_count or (
+            self.duration is not None and self.series.time_at(self.tail) <= timestamp - self.duration
+        ):
+            self._evict()
+    
+    def _evict(self):
+        """Remove the oldest sample."""
+        seq = self.tail
+        shifted = self.series.value_at(seq, self.channel) - self.offset
+        self.count -= 1
+        self.sum -= shifted
+        self.sq_sum -= shifted * shifted
+        if self._min_candidates and self._min_candidates[0] == seq:
+            self._min_candidates.popleft()
+        if self._max_candidates and self._max_candidates[0] == seq:
+            self._max_candidates.popleft()
+        self.tail = seq + 1
+        self._evictions += 1
+        if self._evictions >= self.series.capacity:
+            self._resum()
+    
+    def _resum(self):
+        """Recompute the sums from the history (O(window), every capacity evictions)."""
+        self._evictions = 0
+        _, values = self.series.latest(self.count)
+        if values.ndim > 1:
+            values = values[:, self.channel]
+        self.offset = float(values[0]) if self.count else None
+        shifted = values - (self.offset or 0.0)
+        self.sum = float(shifted.sum())
+        self.sq_sum = float(np.dot(shifted, shifted))
+    
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean, or None if the window is empty."""
+        if self.count == 0:
+            return None
+        return self.offset + self.sum / self.count
+    
+    @property
+    def variance(self) -> Optional[float]:
+        """Sample variance (n - 1), or None with fewer than two samples."""
+        if self.count < 2:
+            return None
+        return max(0.0, (self.sq_sum - self.sum * self.sum / self.count) / (self.count - 1))
+    
+    @property
+    def std(self) -> Optional[float]:
+        """Sample standard deviation, or None with fewer than two samples."""
+        variance = self.variance
+        return None if variance is None else float(np.sqrt(variance))
+    
+    @property
+    def min(self) -> Optional[float]:
+        """Smallest value, or None if the window is empty."""
+        if self.count == 0:
+            return None
+        return self.series.value_at(self._min_candidates[0], self.channel)
+    
+    @property
+    def max(self) -> Optional[float]:
+        """Largest value, or None if the window is empty."""
+        if self.count == 0:
+            return None
+        return self.series.value_at(self._max_candidates[0], self.channel)
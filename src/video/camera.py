@@ -9,6 +9,7 @@ import json
 import os
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict
+from ..utils import clock
 from ..utils.config import Config
 
 # Set up logging
@@ -633,6 +634,7 @@ class Camera:
         
         self.cap: Optional[cv2.VideoCapture] = None
         self.is_open = False
+        self.frame_timestamp: Optional[float] = None  # clock.now() when the last read frame was captured
         logger.info(f"Camera initialized with index {self.camera_index}, resolution {self.width}x{self.height}, device: {device_name}")
         
     def open(self) -> bool:
@@ -683,6 +685,7 @@ class Camera:
     def read(self) -> Tuple[bool, Optional[np.ndarray]]:
         """
         Read a frame from the camera.
+        The frame's capture time is available as frame_timestamp afterwards.
         
         Returns:
             Tuple of (success, frame). Frame is None on failure.
@@ -694,6 +697,8 @@ class Camera:
         
         if not ret or frame is None:
             return False, None
+        # read() blocks until the frame is delivered, so this is its arrival time
+        self.frame_timestamp = clock.now()
         
         # Apply horizontal mirroring if enabled
         if self.mirror:
@@ -8,6 +8,7 @@ import cv2
 import numpy as np
 import logging
 from typing import Optional, Tuple
+from ..utils import clock
 from ..utils.config import Config
 
 # Set up logging
@@ -62,7 +63,9 @@ class QtCamera(QObject):
         
         # Frame storage (latest frame from video sink)
         self.latest_frame: Optional[np.ndarray] = None
+        self.latest_frame_time: Optional[float] = None
         self.frame_ready = False
+        self.frame_timestamp: Optional[float] = None  # clock.now() when the last read frame arrived
         
         # Device info for logging
         device_id = self.camera_device.id()
@@ -149,6 +152,9 @@ class QtCamera(QObject):
         Converts Qt QVideoFrame to OpenCV format (numpy array).
         """
         try:
+            # Stamp on arrival, before the conversion work
+            arrival_time = clock.now()
+            
             # Convert QVideoFrame to QImage
             image = frame.toImage()
             if image.isNull():
@@ -179,6 +185,7 @@ class QtCamera(QObject):
             
             # Store latest frame
             self.latest_frame = bgr_frame
+            self.latest_frame_time = arrival_time
             self.frame_ready = True
             
         except Exception as e:
@@ -189,7 +196,8 @@ class QtCamera(QObject):
     def read(self) -> Tuple[bool, Optional[np.ndarray]]:
         """
         Read a frame from the camera.
-        Returns the latest frame received from Qt's video sink.
+        Returns the latest frame received from Qt's video sink; its arrival
+        time is available as frame_timestamp afterwards.
         
         Returns:
             Tuple of (success, frame). Frame is None on failure.
@@ -202,6 +210,7 @@ class QtCamera(QObject):
         
         # Return latest frame and reset ready flag
         frame = self.latest_frame.copy()
+        self.frame_timestamp = self.latest_frame_time
         self.frame_ready = False
         
         return True, frame
@@ -219,6 +228,7 @@ class QtCamera(QObject):
             self.video_sink = None
         
         self.latest_frame = None
+        self.latest_frame_time = None
         self.frame_ready = False
         logger.info("Qt camera closed")
     